@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from .models import Usuario
+
+"""
+Backend de autenticación que carga el usuario junto con su perfil.
+
+AuthenticationMiddleware ya resuelve request.user de forma perezosa llamando a
+`get_user()` del backend con que se inició sesión, una vez por petición. Aquí esa
+llamada trae el Usuario, su Empresa y su Candidato en una sola consulta (LEFT JOIN de
+los OneToOne inversos); durante la petición `request.user.perfil_empresa` /
+`request.user.perfil_candidato` no vuelven a consultar la BD (si el usuario no tiene
+ese perfil lanzan DoesNotExist, también sin consultar).
+
+Entre peticiones no se guarda nada salvo que ACCOUNTS_PERFIL_CACHE_TTL sea mayor que
+cero. Eso exige que la caché por defecto sea compartida por todos los procesos (Redis,
+Memcached): con LocMemCache las señales de accounts/signals.py solo invalidarían la
+copia del proceso que atendió el cambio, y los demás seguirían aceptando una
+contraseña vieja o un usuario desactivado hasta que venza la entrada. Las
+actualizaciones con QuerySet.update() no pasan por las señales.
+"""
+
+# Por defecto sin caché entre peticiones (ver arriba)
+DURACION_CACHE = 0
+
+
+def _clave(usuario_id):
+    return f"accounts:usuario_perfil:{usuario_id}"
+
+
+def cargar_usuario(usuario_id):
+    """Usuario con perfil_empresa y perfil_candidato ya resueltos; desde caché si está activada."""
+    duracion = getattr(settings, 'ACCOUNTS_PERFIL_CACHE_TTL', DURACION_CACHE)
+    clave = _clave(usuario_id)
+    usuario = cache.get(clave) if duracion else None
+    if usuario is None:
+        usuario = Usuario._default_manager.select_related('perfil_empresa', 'perfil_candidato').filter(
+            pk=usuario_id
+        ).first()
+        if usuario is not None and duracion:
+            cache.set(clave, usuario, duracion)
+    return usuario
+
+
+def invalidar(usuario_id):
+    cache.delete(_clave(usuario_id))
+
+
+class PerfilBackend(ModelBackend):
+    """ModelBackend cuyo get_user() usa cargar_usuario()."""
+
+    def get_user(self, user_id):
+        try:
+            usuario_id = Usuario._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+        usuario = cargar_usuario(usuario_id)
+        return usuario if usuario is not None and self.user_can_authenticate(usuario) else None
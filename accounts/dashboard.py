@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+"""
+Contexto del dashboard del candidato, en caché por candidato.
+
+La entrada se invalida desde las señales de los modelos que muestra el dashboard
+(accounts/signals.py y jobs/signals.py), así una visita repetida no consulta la BD más
+allá de la sesión y el usuario. La clave es el id del Candidato, que ya traen todas las
+filas que la invalidan: borrar una oferta con cientos de postulaciones no consulta nada
+para saber de quién es cada una. Los cambios en ofertas de terceros (por ejemplo, el
+título de una oferta a la que se postuló) se reflejan al expirar la entrada.
+"""
+
+DURACION_CACHE = 60 * 10
+
+
+def _clave(candidato_id):
+    return f"accounts:dashboard_candidato:{candidato_id}"
+
+
+def _conteo(queryset):
+    """Subconsulta escalar con el COUNT(*) del queryset correlacionado."""
+    subconsulta = queryset.order_by().values('candidato').annotate(n=Count('id')).values('n')
+    return Coalesce(Subquery(subconsulta, output_field=IntegerField()), Value(0))
+
+
+def estadisticas(candidato_id):
+    """Postulaciones activas, entrevistas y ofertas guardadas en una sola consulta."""
+    from jobs.models import OfertasGuardadas, Postulacion
+    from .models import Candidato
+
+    postulaciones = Postulacion.objects.filter(candidato=OuterRef('pk'))
+    return Candidato.objects.filter(pk=candidato_id).annotate(
+        postulaciones_activas=_conteo(postulaciones.filter(~Q(estado='rechazado'))),
+        entrevistas=_conteo(postulaciones.filter(estado='entrevista')),
+        guardadas=_conteo(OfertasGuardadas.objects.filter(candidato=OuterRef('pk'))),
+    ).values('postulaciones_activas', 'entrevistas', 'guardadas').get()
+
+
+def construir_contexto(candidato):
+    """Evalúa todas las consultas del dashboard y devuelve un contexto serializable."""
+    return {
+        'candidato': candidato,
+        'experiencias': list(candidato.experiencia_laboral.all().order_by('-fecha_inicio')),
+        'educacion': list(candidato.educacion.all().order_by('-fecha_inicio')),
+        'postulaciones': list(candidato.postulaciones.select_related(
+            'oferta', 'oferta__empresa'
+        ).order_by('-fecha_postulacion')[:5]),
+        'ofertas_guardadas': list(candidato.ofertas_guardadas.select_related(
+            'oferta', 'oferta__empresa'
+        ).order_by('-created_at')[:5]),
+        'habilidades': list(candidato.habilidades.select_related('habilidad').all()),
+        'idiomas': list(candidato.idiomas.select_related('idioma').all()),
+        'documentos': list(candidato.documento.all()),
+        'stats': estadisticas(candidato.pk),
+    }
+
+
+def contexto_dashboard(usuario):
+    """Contexto del dashboard desde caché; lo construye y guarda si no existe."""
+    # perfil_candidato ya viene cargado con el usuario (accounts/backends.py)
+    candidato = usuario.perfil_candidato
+    contexto = cache.get(_clave(candidato.pk))
+    if contexto is None:
+        contexto = construir_contexto(candidato)
+        cache.set(_clave(candidato.pk), contexto, DURACION_CACHE)
+    return contexto
+
+
+def invalidar(candidato_id):
+    cache.delete(_clave(candidato_id))
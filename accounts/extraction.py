@@ -0,0 +1,268 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from . import extractors
+
+"""
+Extracción del texto de los CV fuera de la petición, en un pool de procesos.
+
+El trabajo de cada proceso (accounts/extractors.py) es puro: recibe una ruta y
+devuelve el texto. Este módulo decide qué extraer y guarda los resultados:
+
+- Una ExtraccionCV por contenido (SHA-256). Los Documento con el mismo hash la
+  comparten, así que un PDF subido por cien candidatos se lee una vez. Volver a
+  correr la extracción no repite los hashes ya extraídos con éxito (salvo forzar);
+  los errores sí se reintentan.
+- Al subir un CV (accounts.storage.registrar_cv) se encola en un pool de fondo
+  cuando la transacción se confirma. El resultado se guarda en el hilo del pool,
+  que cierra su conexión al terminar. CV_EXTRACCION_PROCESOS = 0 lo desactiva.
+- En bloque, sobre todo el corpus (comando extraer_cvs): los documentos se leen por
+  lotes de clave primaria y hay como máximo 2 × procesos archivos en curso, así que
+  la memoria no crece con la cantidad de CV.
+
+Los documentos subidos antes del almacenamiento por hash no tienen sha256: lo
+calcula el proceso y se completa al guardar (si el candidato ya tiene otro documento
+con ese contenido, la restricción candidato + sha256 lo impide y solo se enlaza). Si el
+archivo ya no existe no hay hash: el error queda en Documento.error_extraccion y el
+documento sigue pendiente.
+"""
+
+logger = logging.getLogger(__name__)
+
+PROCESOS = 2
+TAMANIO_LOTE = 200
+# Cada proceso se reemplaza tras este número de archivos: acota lo que pueda filtrar pypdf
+TAREAS_POR_PROCESO = 100
+
+
+@dataclass
+class Resumen:
+    total: int = 0
+    extraidos: int = 0
+    errores: int = 0
+    no_soportados: int = 0
+    reutilizados: int = 0
+    inicio: float = field(default_factory=time.perf_counter)
+
+    @property
+    def procesados(self):
+        return self.extraidos + self.errores + self.no_soportados + self.reutilizados
+
+    @property
+    def segundos(self):
+        return time.perf_counter() - self.inicio
+
+    def contar(self, estado):
+        if estado == extractors.OK:
+            self.extraidos += 1
+        elif estado == extractors.NO_SOPORTADO:
+            self.no_soportados += 1
+        else:
+            self.errores += 1
+
+
+class _EnLinea:
+    """Ejecutor sin procesos (procesos=0): pruebas y depuración."""
+
+    def submit(self, funcion, *args):
+        futuro = Future()
+        futuro.set_result(funcion(*args))
+        return futuro
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def crear_pool(procesos):
+    if not procesos:
+        return _EnLinea()
+    # 'spawn': los hijos no heredan las conexiones a la BD ni el estado de Django
+    return ProcessPoolExecutor(
+        max_workers=procesos, mp_context=multiprocessing.get_context('spawn'),
+        max_tasks_per_child=TAREAS_POR_PROCESO,
+    )
+
+
+def guardar(resultado, documento_id=None):
+    """
+    Guarda el resultado de un proceso y lo enlaza a todos los documentos con ese
+    contenido. `documento_id` es el documento sin sha256 que originó la extracción.
+    """
+    from .models import Candidato, Documento, ExtraccionCV
+    from .search import actualizar_vectores
+
+    if resultado['sha256'] is None:
+        # No se pudo leer el archivo ni para calcular el hash
+        if documento_id is not None:
+            Documento.objects.filter(pk=documento_id).update(error_extraccion=resultado['error'][:500])
+        return None
+
+    extraccion, _ = ExtraccionCV.objects.update_or_create(sha256=resultado['sha256'], defaults={
+        'estado': resultado['estado'], 'texto': resultado['texto'], 'paginas': resultado['paginas'],
+        'error': resultado['error'][:500], 'duracion_ms': resultado['duracion_ms'],
+    })
+    Documento.objects.filter(sha256=extraccion.sha256).update(extraccion=extraccion)
+    if documento_id is not None:
+        try:
+            with transaction.atomic():
+                Documento.objects.filter(pk=documento_id, sha256__isnull=True).update(
+                    sha256=extraccion.sha256, extraccion=extraccion, error_extraccion='',
+                )
+        except IntegrityError:
+            Documento.objects.filter(pk=documento_id).update(extraccion=extraccion, error_extraccion='')
+    # El texto del CV actual entra en la búsqueda de talento
+    actualizar_vectores(candidato_ids=Candidato.objects.filter(
+        cv_actual__extraccion=extraccion).values_list('pk', flat=True))
+    return extraccion
+
+
+def _enlazar_existentes(shas, desde=None):
+    """
+    Enlaza los documentos cuyos hashes ya tienen extracción correcta (o, con `desde`,
+    cualquier extracción guardada a partir de ese momento); devuelve esos hashes.
+    """
+    from .models import Documento, EstadoExtraccion, ExtraccionCV
+
+    extracciones = ExtraccionCV.objects.filter(sha256__in=shas)
+    if desde is None:
+        extracciones = extracciones.filter(estado=EstadoExtraccion.OK)
+    else:
+        extracciones = extracciones.filter(extraido_en__gte=desde)
+    hechas = dict(extracciones.values_list('sha256', 'pk'))
+    for sha256, extraccion_id in hechas.items():
+        Documento.objects.filter(sha256=sha256).exclude(extraccion_id=extraccion_id).update(extraccion_id=extraccion_id)
+    return set(hechas)
+
+
+def _fallido(sha256, error):
+    """Resultado de error para un archivo cuyo proceso no llegó a responder."""
+    return {'sha256': sha256, 'estado': extractors.ERROR, 'texto': '', 'paginas': None,
+            'error': f"{type(error).__name__}: {error}", 'duracion_ms': 0}
+
+
+def pendientes(forzar=False):
+    """CV sin extracción correcta (todos con `forzar`)."""
+    from .models import Documento, EstadoExtraccion
+
+    documentos = Documento.objects.filter(tipo_documento='CV').exclude(url_archivo='')
+    if not forzar:
+        documentos = documentos.exclude(extraccion__estado=EstadoExtraccion.OK)
+    return documentos
+
+
+def extraer_pendientes(procesos=PROCESOS, lote=TAMANIO_LOTE, forzar=False, al_progreso=None):
+    """Extrae el texto de los CV pendientes en un pool de `procesos`; devuelve un Resumen."""
+    documentos = pendientes(forzar).order_by('pk')
+    resumen = Resumen(total=documentos.count())
+    maximo_en_curso = 2 * max(procesos, 1)
+    en_curso = {}       # futuro -> (documento_id, sha256)
+    shas_en_curso = set()
+    # Con forzar se reextrae cada hash una vez por corrida: se saltan los guardados desde aquí
+    desde = timezone.now() if forzar else None
+    pool = crear_pool(procesos)
+
+    def recoger(hechos):
+        for futuro in hechos:
+            documento_id, sha256 = en_curso.pop(futuro)
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # BrokenProcessPool: un proceso murió y arrastró a los archivos en curso
+                logger.warning("Extracción del documento %s fallida: %r", documento_id, e)
+                resultado = _fallido(sha256, e)
+            shas_en_curso.discard(sha256)
+            guardar(resultado, None if sha256 else documento_id)
+            resumen.contar(resultado['estado'])
+            if al_progreso:
+                al_progreso(resumen)
+
+    try:
+        ultimo = 0
+        while True:
+            filas = list(documentos.filter(pk__gt=ultimo).values_list('pk', 'url_archivo', 'sha256')[:lote])
+            if not filas:
+                break
+            ultimo = filas[-1][0]
+            hechos = _enlazar_existentes({sha for _, _, sha in filas if sha}, desde)
+            for documento_id, nombre, sha256 in filas:
+                if sha256 in hechos or sha256 in shas_en_curso:
+                    # Ya extraído, o en curso: guardar() enlaza todos los documentos del hash
+                    resumen.reutilizados += 1
+                    continue
+                if len(en_curso) >= maximo_en_curso:
+                    recoger(wait(en_curso, return_when=FIRST_COMPLETED).done)
+                ruta = default_storage.path(nombre)
+                try:
+                    futuro = pool.submit(extractors.extraer, ruta, sha256)
+                except BrokenProcessPool:
+                    # Los archivos que estaban en curso se recogen como errores; se sigue con otro pool
+                    pool.shutdown(wait=False)
+                    pool = crear_pool(procesos)
+                    futuro = pool.submit(extractors.extraer, ruta, sha256)
+                en_curso[futuro] = (documento_id, sha256)
+                if sha256:
+                    shas_en_curso.add(sha256)
+                    hechos.add(sha256)
+                if futuro.done():
+                    recoger([futuro])
+        recoger(list(en_curso))
+    finally:
+        pool.shutdown(wait=True)
+    return resumen
+
+
+# --- Extracción en segundo plano de los CV recién subidos ---
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_fondo(procesos):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = crear_pool(procesos)
+        return _pool
+
+
+def _guardar_en_fondo(futuro):
+    try:
+        guardar(futuro.result())
+    except Exception:
+        logger.exception("No se pudo guardar la extracción de un CV")
+    finally:
+        connections.close_all()     # solo las conexiones de este hilo
+
+
+def encolar(documento):
+    """Programa la extracción del documento para cuando se confirme la transacción en curso."""
+    procesos = getattr(settings, 'CV_EXTRACCION_PROCESOS', PROCESOS)
+    if not procesos or not documento.sha256:
+        return
+    ruta, sha256 = default_storage.path(documento.url_archivo.name), documento.sha256
+
+    def enviar():
+        if _enlazar_existentes({sha256}):
+            return
+        global _pool
+        try:
+            futuro = _pool_fondo(procesos).submit(extractors.extraer, ruta, sha256)
+        except RuntimeError:
+            # Pool roto (un hijo murió) o cerrado: se crea otro en el próximo envío
+            logger.exception("Pool de extracción de CV no disponible")
+            with _pool_lock:
+                _pool = None
+            return
+        futuro.add_done_callback(_guardar_en_fondo)
+
+    transaction.on_commit(enviar)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+import zipfile
+from xml.etree import ElementTree
+
+"""
+Extracción de texto de CV (PDF, DOC, DOCX) para los procesos de accounts.extraction.
+
+Este módulo no importa Django: sus funciones se ejecutan en procesos hijos de un
+ProcessPoolExecutor (que pueden arrancar con 'spawn', sin settings ni apps cargadas).
+
+- PDF: pypdf, página por página.
+- DOCX: el XML del documento se recorre con iterparse, sin cargar el árbol entero.
+- DOC (Word 97-2003): con el programa `antiword` si está instalado.
+
+El texto de cada archivo se corta en MAX_CARACTERES, así la memoria de cada proceso
+no depende del tamaño del CV.
+"""
+
+MAX_CARACTERES = 200_000
+TAMANIO_BLOQUE = 1024 * 1024
+TIEMPO_MAXIMO_ANTIWORD = 60
+
+OK = 'ok'
+ERROR = 'error'
+NO_SOPORTADO = 'no_soportado'
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class NoSoportado(Exception):
+    pass
+
+
+class _Acumulador:
+    """Junta fragmentos de texto hasta MAX_CARACTERES."""
+
+    def __init__(self, limite=MAX_CARACTERES):
+        self.partes = []
+        self.restante = limite
+
+    @property
+    def lleno(self):
+        return self.restante <= 0
+
+    def agregar(self, texto):
+        if texto and not self.lleno:
+            texto = texto[:self.restante]
+            self.partes.append(texto)
+            self.restante -= len(texto)
+
+    def texto(self):
+        return ''.join(self.partes).strip()
+
+
+def hash_archivo(ruta):
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANIO_BLOQUE), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def texto_pdf(ruta):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise NoSoportado("Falta pypdf (pip install pypdf).")
+
+    lector = PdfReader(ruta)
+    acumulado = _Acumulador()
+    for pagina in lector.pages:
+        acumulado.agregar((pagina.extract_text() or '') + '\n')
+        if acumulado.lleno:
+            break
+    return acumulado.texto(), len(lector.pages)
+
+
+def texto_docx(ruta):
+    acumulado = _Acumulador()
+    with zipfile.ZipFile(ruta) as paquete, paquete.open('word/document.xml') as xml:
+        for evento, elemento in ElementTree.iterparse(xml, events=('end',)):
+            if elemento.tag == _W + 't':
+                acumulado.agregar(elemento.text)
+            elif elemento.tag == _W + 'tab':
+                acumulado.agregar('\t')
+            elif elemento.tag in (_W + 'br', _W + 'p'):
+                acumulado.agregar('\n')
+            if elemento.tag == _W + 'p':
+                elemento.clear()    # libera los párrafos ya leídos
+            if acumulado.lleno:
+                break
+    return acumulado.texto(), None
+
+
+def texto_doc(ruta):
+    programa = shutil.which('antiword')
+    if programa is None:
+        raise NoSoportado("Los .doc necesitan el programa antiword.")
+    salida = subprocess.run(
+        [programa, '-w', '0', ruta], capture_output=True, timeout=TIEMPO_MAXIMO_ANTIWORD, check=True,
+    ).stdout
+    acumulado = _Acumulador()
+    acumulado.agregar(salida[:MAX_CARACTERES * 4].decode('utf-8', errors='replace'))
+    return acumulado.texto(), None
+
+
+EXTRACTORES = {'pdf': texto_pdf, 'docx': texto_docx, 'doc': texto_doc}
+
+
+def tipo_de(ruta):
+    return os.path.splitext(ruta)[1].lower().lstrip('.')
+
+
+def extraer(ruta, sha256=None):
+    """
+    Trabajo de un proceso: {sha256, estado, texto, paginas, error, duracion_ms}.
+    Nunca lanza excepciones; los errores quedan en `estado` y `error`.
+    """
+    inicio = time.perf_counter()
+    resultado = {'sha256': sha256, 'estado': OK, 'texto': '', 'paginas': None, 'error': ''}
+    try:
+        if sha256 is None:
+            resultado['sha256'] = hash_archivo(ruta)
+        extractor = EXTRACTORES.get(tipo_de(ruta))
+        if extractor is None:
+            raise NoSoportado(f"Tipo de archivo no soportado: {tipo_de(ruta) or 'sin extensión'}.")
+        resultado['texto'], resultado['paginas'] = extractor(ruta)
+    except NoSoportado as e:
+        resultado.update(estado=NO_SOPORTADO, error=str(e))
+    except Exception as e:
+        resultado.update(estado=ERROR, error=f"{type(e).__name__}: {e}"[:500])
+    resultado['duracion_ms'] = (time.perf_counter() - inicio) * 1000
+    return resultado
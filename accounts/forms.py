@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.core.validators import FileExtensionValidator
+from locations.widgets import CiudadAutocomplete
 from .models import Usuario, Candidato, ExperienciaLaboral, Documento, CandidatoHabilidad
 
 class CustomUserCreationForm(UserCreationForm):
@@ -21,11 +22,12 @@ class CustomAuthenticationForm(AuthenticationForm):
 class CandidatoPerfilForm(forms.ModelForm):
     class Meta:
         model = Candidato
-        fields = ['titulo_profesional', 'resumen_perfil', 'telefono', 'salario_esperado']
+        fields = ['titulo_profesional', 'resumen_perfil', 'telefono', 'salario_esperado', 'ciudad']
         widgets = {
              'titulo_profesional': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ej: Desarrollador Backend'}),
              'telefono': forms.TextInput(attrs={'class': 'form-control', 'type': 'tel', 'maxlength': '10'}),
              'salario_esperado': forms.NumberInput(attrs={'class': 'form-control', 'min': '0', 'step': '0.01'}),
+             'ciudad': CiudadAutocomplete(),
         }
 
     def clean_titulo_profesional(self):
@@ -117,8 +119,18 @@ class HabilidadForm(forms.ModelForm):
             'contexto_uso': forms.Textarea(attrs={'class': 'form-control', 'rows': 2, 'placeholder': 'Ej: Proyecto eCommerce, Empresa ABC...'}),
         }
         
+class CampoCV(forms.FileField):
+    """FileField que muestra el motivo con que SubidaCVHandler rechazó el archivo."""
+
+    def to_python(self, data):
+        error = getattr(data, 'error', None)
+        if error:
+            raise forms.ValidationError(error, code='cv_rechazado')
+        return super().to_python(data)
+
+
 class DocumentoForm(forms.ModelForm):
-    url_archivo = forms.FileField(
+    url_archivo = CampoCV(
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])],
         widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.pdf,.doc,.docx'}),
         help_text="Solo archivos PDF o Word (.doc, .docx)"
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.extraction import PROCESOS, TAMANIO_LOTE, extraer_pendientes
+
+
+class Command(BaseCommand):
+    help = (
+        "Extrae el texto de los CV (PDF, DOCX y, con antiword, DOC) en un pool de procesos. "
+        "Se puede volver a correr: los contenidos ya extraídos con éxito no se repiten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--procesos', type=int, default=PROCESOS,
+                            help="Procesos de extracción (0 para extraer en este mismo proceso).")
+        parser.add_argument('--lote', type=int, default=TAMANIO_LOTE, help="Documentos leídos de la BD por consulta.")
+        parser.add_argument('--forzar', action='store_true', help="Vuelve a extraer también los ya extraídos.")
+
+    def handle(self, *args, **options):
+        if options['procesos'] < 0 or options['lote'] < 1:
+            raise CommandError("--procesos no puede ser negativo y --lote debe ser mayor que cero.")
+
+        ultimo = [0]
+
+        def progreso(resumen):
+            # Una línea cada ~10 lotes para no inundar la salida
+            if options['verbosity'] >= 2 or resumen.procesados - ultimo[0] >= 10 * options['lote']:
+                ultimo[0] = resumen.procesados
+                self.stdout.write(
+                    f"  {resumen.procesados}/{resumen.total} documentos ({resumen.segundos:.0f} s)"
+                )
+
+        resumen = extraer_pendientes(
+            procesos=options['procesos'], lote=options['lote'], forzar=options['forzar'], al_progreso=progreso,
+        )
+        for nombre in ('extraidos', 'reutilizados', 'no_soportados', 'errores'):
+            self.stdout.write(f"{nombre:16} {getattr(resumen, nombre):>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{resumen.procesados} documentos en {resumen.segundos:.1f} s "
+            f"({resumen.procesados / max(resumen.segundos, 1e-9):.1f} documentos/s)."
+        ))
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:05
+
+from django.db import migrations
+
+# Canal que escucha interfaz_empleo.py. Payload compacto "<op>:<usuario_id>", con op
+# I (insert), U (update) o D (delete); el cliente vuelve a leer solo esa fila.
+CANAL = 'candidatos_cambios'
+
+SQL_CREAR = """
+CREATE OR REPLACE FUNCTION accounts_notificar_candidato() RETURNS trigger AS $$
+DECLARE
+    uid bigint;
+BEGIN
+    IF TG_TABLE_NAME = 'accounts_usuario' THEN
+        uid := COALESCE(NEW.id, OLD.id);
+    ELSE
+        uid := COALESCE(NEW.usuario_id, OLD.usuario_id);
+    END IF;
+    PERFORM pg_notify('{canal}', left(TG_OP, 1) || ':' || uid);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS candidato_notificar_cambios ON accounts_candidato;
+CREATE TRIGGER candidato_notificar_cambios
+    AFTER INSERT OR DELETE OR UPDATE OF nombre_completo, numero_identificacion, titulo_profesional, usuario_id
+    ON accounts_candidato
+    FOR EACH ROW EXECUTE FUNCTION accounts_notificar_candidato();
+
+-- De accounts_usuario solo interesan el email (se muestra en la tabla) y el borrado;
+-- así last_login y demás cambios de sesión no generan avisos.
+DROP TRIGGER IF EXISTS usuario_notificar_email ON accounts_usuario;
+CREATE TRIGGER usuario_notificar_email
+    AFTER UPDATE OF email ON accounts_usuario
+    FOR EACH ROW WHEN (OLD.email IS DISTINCT FROM NEW.email)
+    EXECUTE FUNCTION accounts_notificar_candidato();
+
+DROP TRIGGER IF EXISTS usuario_notificar_borrado ON accounts_usuario;
+CREATE TRIGGER usuario_notificar_borrado
+    AFTER DELETE ON accounts_usuario
+    FOR EACH ROW EXECUTE FUNCTION accounts_notificar_candidato();
+""".format(canal=CANAL)
+
+SQL_ELIMINAR = """
+DROP TRIGGER IF EXISTS candidato_notificar_cambios ON accounts_candidato;
+DROP TRIGGER IF EXISTS usuario_notificar_email ON accounts_usuario;
+DROP TRIGGER IF EXISTS usuario_notificar_borrado ON accounts_usuario;
+DROP FUNCTION IF EXISTS accounts_notificar_candidato();
+"""
+
+
+def crear_triggers(apps, schema_editor):
+    # LISTEN/NOTIFY solo existe en PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(SQL_CREAR)
+
+
+def eliminar_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(SQL_ELIMINAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_usuario_tipo_usuario'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_triggers, eliminar_triggers),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:30
+
+from django.db import migrations
+
+# Índices de trigramas para la búsqueda aproximada de candidatos de interfaz_empleo.py
+# (nombre, identificación, título y email). Sirven tanto para el operador <% como
+# para ILIKE '%texto%'.
+INDICES = (
+    ('candidato_nombre_trgm', 'accounts_candidato', 'nombre_completo'),
+    ('candidato_identificacion_trgm', 'accounts_candidato', 'numero_identificacion'),
+    ('candidato_titulo_trgm', 'accounts_candidato', 'titulo_profesional'),
+    ('usuario_email_trgm', 'accounts_usuario', 'email'),
+)
+
+
+def crear_indices(apps, schema_editor):
+    # pg_trgm y los índices GIN solo existen en PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for nombre, tabla, columna in INDICES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} USING gin ({columna} gin_trgm_ops)"
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre, _, _ in INDICES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_candidato_notify_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def rellenar_cv_actual(apps, schema_editor):
+    # El CV vigente era el último subido: filter(tipo_documento="CV").last()
+    Candidato = apps.get_model('accounts', 'Candidato')
+    Documento = apps.get_model('accounts', 'Documento')
+    ultimo = Documento.objects.filter(candidato=models.OuterRef('pk'), tipo_documento='CV').order_by('-pk')
+    Candidato.objects.filter(
+        models.Exists(Documento.objects.filter(candidato=models.OuterRef('pk'), tipo_documento='CV'))
+    ).update(cv_actual=models.Subquery(ultimo.values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_candidato_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidato',
+            name='cv_actual',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.documento'),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='tamanio',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='tipo_contenido',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='documento',
+            constraint=models.UniqueConstraint(fields=('candidato', 'sha256'), name='documento_candidato_sha256_uniq'),
+        ),
+        migrations.RunPython(rellenar_cv_actual, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_documento_sha256_cv_actual'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtraccionCV',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('estado', models.CharField(choices=[('ok', 'Extraído'), ('error', 'Error'), ('no_soportado', 'No soportado')], max_length=20)),
+                ('texto', models.TextField(blank=True)),
+                ('paginas', models.PositiveIntegerField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, max_length=500)),
+                ('duracion_ms', models.FloatField(help_text='Tiempo de extracción en el proceso que la hizo')),
+                ('extraido_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Extracción de CV',
+                'verbose_name_plural': 'Extracciones de CV',
+            },
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='extraccion',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='documentos', to='accounts.extraccioncv'),
+        ),
+    ]
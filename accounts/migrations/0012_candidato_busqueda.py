@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:40
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    # El tsvector y su índice GIN solo existen en PostgreSQL; en SQLite la búsqueda
+    # de talento usa el backend simple y la columna queda vacía.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from accounts.search import SQL_ACTUALIZAR_VECTOR
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS candidato_search_vector_gin "
+        "ON accounts_candidato USING gin (search_vector)"
+    )
+    schema_editor.execute(SQL_ACTUALIZAR_VECTOR)
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS candidato_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_extraccioncv'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidato',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(fields=['ciudad', 'salario_esperado'], name='candidato_ciudad_salario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(fields=['salario_esperado'], name='candidato_salario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatohabilidad',
+            index=models.Index(fields=['habilidad', 'nivel', 'anios_experiencia', 'candidato'], name='cand_hab_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatoidioma',
+            index=models.Index(fields=['idioma', 'nivel', 'candidato'], name='cand_idioma_busqueda_idx'),
+        ),
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_candidato_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='error_extraccion',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django import forms
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 
 """
@@ -18,6 +19,7 @@ Modelos:
 5. CandidatoHabilidad / CandidatoIdioma: Tablas pivote con niveles.
 6. ExperienciaLaboral / Educacion: Historial profesional y académico.
 7. Documento: Archivos adjuntos del candidato (CV, cartas, etc).
+8. ExtraccionCV: Texto extraído de un archivo, uno por contenido (SHA-256).
 """
 
 class TipoUsuario(models.TextChoices):
@@ -84,6 +86,20 @@ class Candidato(models.Model):
     github_url = models.URLField(blank=True, null=True)
     portfolio_url = models.URLField(blank=True, null=True)
 
+    # CV vigente (accounts/storage.py); los anteriores siguen en `documento`
+    cv_actual = models.ForeignKey('Documento', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    # Documento de búsqueda de talento (título, resumen, experiencia y texto del CV). Lo
+    # mantiene accounts.search.actualizar_vectores; el índice GIN se crea en la migración 0012.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Búsqueda de talento: ciudad (o ciudades del radio) y rango de salario
+            models.Index(fields=['ciudad', 'salario_esperado'], name='candidato_ciudad_salario_idx'),
+            models.Index(fields=['salario_esperado'], name='candidato_salario_idx'),
+        ]
+
     def __str__(self):
         return self.nombre_completo
 
@@ -111,6 +127,11 @@ class CandidatoHabilidad(models.Model):
 
     class Meta:
         unique_together = ('candidato', 'habilidad')
+        indexes = [
+            # Búsqueda de talento: "habilidad X, nivel >= N, al menos A años"; incluye
+            # candidato para resolver la condición solo con el índice
+            models.Index(fields=['habilidad', 'nivel', 'anios_experiencia', 'candidato'], name='cand_hab_busqueda_idx'),
+        ]
 
 class CandidatoIdioma(models.Model):
     candidato = models.ForeignKey(Candidato, on_delete=models.CASCADE, related_name='idiomas')
@@ -119,6 +140,9 @@ class CandidatoIdioma(models.Model):
 
     class Meta:
         unique_together = ('candidato', 'idioma')
+        indexes = [
+            models.Index(fields=['idioma', 'nivel', 'candidato'], name='cand_idioma_busqueda_idx'),
+        ]
 
 class ExperienciaLaboral(models.Model):
     candidato = models.ForeignKey(Candidato, on_delete=models.CASCADE, related_name='experiencia_laboral')
@@ -169,6 +193,43 @@ class Documento(models.Model):
     url_archivo = models.FileField(upload_to='cvs/')
     tipo_documento = models.CharField(max_length=50, help_text="CV, Carta, Certificado")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Contenido del archivo (accounts/storage.py): vacío en los subidos antes del almacenamiento por hash
+    sha256 = models.CharField(max_length=64, null=True, blank=True, db_index=True, editable=False)
+    tamanio = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    tipo_contenido = models.CharField(max_length=100, blank=True, editable=False)
+    # Texto del archivo (accounts/extraction.py); compartido por los documentos con el mismo contenido
+    extraccion = models.ForeignKey('ExtraccionCV', on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='documentos', editable=False)
+    # Error de una extracción que no llegó a leer el archivo (sin hash no hay ExtraccionCV)
+    error_extraccion = models.CharField(max_length=500, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['candidato', 'sha256'], name='documento_candidato_sha256_uniq'),
+        ]
+
+    def __str__(self):
+        return f"CV de {self.candidato.nombre_completo}"
+
+
+class EstadoExtraccion(models.TextChoices):
+    OK = 'ok', _('Extraído')
+    ERROR = 'error', _('Error')
+    NO_SOPORTADO = 'no_soportado', _('No soportado')
+
+
+class ExtraccionCV(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    estado = models.CharField(max_length=20, choices=EstadoExtraccion.choices)
+    texto = models.TextField(blank=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
+    error = models.CharField(max_length=500, blank=True)
+    duracion_ms = models.FloatField(help_text="Tiempo de extracción en el proceso que la hizo")
+    extraido_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Extracción de CV"
+        verbose_name_plural = "Extracciones de CV"
 
     def __str__(self):
-        return f"CV de {self.candidato.nombre_completo}"
\ No newline at end of file
+        return f"{self.sha256[:12]} ({self.estado})"
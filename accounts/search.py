@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, connections
+from django.db.models import Exists, OuterRef, Q
+
+from .models import CandidatoHabilidad, CandidatoIdioma, ExperienciaLaboral, NivelHabilidad
+
+"""
+Búsqueda de talento: candidatos filtrados por habilidades, idioma, ubicación, salario
+y texto libre, para las empresas.
+
+Cada filtro de habilidad o idioma es un EXISTS sobre su tabla pivote, resuelto con
+los índices (habilidad, nivel, años, candidato) e (idioma, nivel, candidato); los
+niveles mínimos se traducen a la lista de niveles aceptados (nivel IN (...)).
+
+El texto libre usa, en PostgreSQL, `Candidato.search_vector`: tsvector en español con
+título, resumen, experiencia y el texto del CV actual (accounts/extraction.py), con
+índice GIN. Lo mantienen las señales de accounts/signals.py. Fuera de PostgreSQL se
+usa un backend simple con icontains, solo apto para pruebas.
+
+Los resultados se ordenan por id descendente (perfiles más nuevos primero) y se paginan
+por cursor: ordenar por relevancia obligaría a puntuar todas las coincidencias de un
+término común antes de devolver la primera página. El total se cuenta hasta
+LIMITE_CONTEO; por encima se muestra "más de".
+"""
+
+CONFIG_IDIOMA = 'spanish'
+LIMITE_CONTEO = 10_000
+NIVELES_IDIOMA = ('A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'Nativo')
+
+# Pesos: título > resumen y cargos > funciones y logros > CV
+SQL_ACTUALIZAR_VECTOR = """
+    UPDATE accounts_candidato AS c SET search_vector =
+        setweight(to_tsvector('{config}', coalesce(c.titulo_profesional, '')), 'A') ||
+        setweight(to_tsvector('{config}', coalesce(c.resumen_perfil, '')), 'B') ||
+        setweight(to_tsvector('{config}', coalesce((
+            SELECT string_agg(concat_ws(' ', e.cargo, e.tecnologias), ' ')
+            FROM accounts_experiencialaboral e
+            WHERE e.candidato_id = c.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('{config}', coalesce((
+            SELECT string_agg(concat_ws(' ', e.descripcion, e.logros), ' ')
+            FROM accounts_experiencialaboral e
+            WHERE e.candidato_id = c.id
+        ), '')), 'C') ||
+        setweight(to_tsvector('{config}', coalesce((
+            SELECT left(x.texto, 100000)
+            FROM accounts_documento d
+            JOIN accounts_extraccioncv x ON x.id = d.extraccion_id
+            WHERE d.id = c.cv_actual_id
+        ), '')), 'D')
+""".format(config=CONFIG_IDIOMA)
+
+
+def actualizar_vectores(candidato_ids=None, using=None):
+    """
+    Recalcula `search_vector` para los candidatos indicados (o todos si no se filtra).
+
+    No hace nada fuera de PostgreSQL.
+    """
+    conn = connections[using] if using else connection
+    if conn.vendor != 'postgresql':
+        return 0
+
+    sql = SQL_ACTUALIZAR_VECTOR
+    params = []
+    if candidato_ids is not None:
+        candidato_ids = list(candidato_ids)
+        if not candidato_ids:
+            return 0
+        sql += " WHERE c.id = ANY(%s)"
+        params.append(candidato_ids)
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def niveles_desde(niveles, minimo):
+    """Niveles iguales o superiores a `minimo` (todos si no hay mínimo)."""
+    if not minimo:
+        return list(niveles)
+    return list(niveles[list(niveles).index(minimo):])
+
+
+@dataclass
+class FiltrosTalento:
+    habilidades: list = field(default_factory=list)     # [(habilidad_id, nivel mínimo, años mínimos)]
+    idioma: tuple = None                                # (idioma_id, nivel mínimo)
+    distancias: dict = None                             # {ciudad_id: km} del radio; None = cualquier ciudad
+    salario_min: object = None
+    salario_max: object = None
+    texto: str = ''
+
+
+class BusquedaPostgres:
+    def buscar(self, queryset, texto):
+        return queryset.filter(search_vector=SearchQuery(texto, config=CONFIG_IDIOMA, search_type='websearch'))
+
+
+class BusquedaSimple:
+    """Backend portable para pruebas: cada término debe aparecer en algún campo."""
+
+    campos = ('titulo_profesional', 'resumen_perfil', 'cv_actual__extraccion__texto')
+    campos_experiencia = ('cargo', 'tecnologias', 'descripcion', 'logros')
+
+    def buscar(self, queryset, texto):
+        for termino in texto.split():
+            coincide = Q()
+            for campo in self.campos:
+                coincide |= Q(**{f'{campo}__icontains': termino})
+            experiencia = Q()
+            for campo in self.campos_experiencia:
+                experiencia |= Q(**{f'{campo}__icontains': termino})
+            coincide |= Exists(ExperienciaLaboral.objects.filter(experiencia, candidato=OuterRef('pk')))
+            queryset = queryset.filter(coincide)
+        return queryset
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return BusquedaPostgres()
+    return BusquedaSimple()
+
+
+def filtrar_candidatos(queryset, filtros):
+    """Aplica los FiltrosTalento al queryset de candidatos (sin ordenar)."""
+    for habilidad_id, nivel, anios in filtros.habilidades:
+        condicion = CandidatoHabilidad.objects.filter(candidato=OuterRef('pk'), habilidad_id=habilidad_id)
+        if nivel:
+            condicion = condicion.filter(nivel__in=niveles_desde(NivelHabilidad.values, nivel))
+        if anios:
+            condicion = condicion.filter(anios_experiencia__gte=anios)
+        queryset = queryset.filter(Exists(condicion))
+    if filtros.idioma:
+        idioma_id, nivel = filtros.idioma
+        condicion = CandidatoIdioma.objects.filter(candidato=OuterRef('pk'), idioma_id=idioma_id)
+        if nivel:
+            condicion = condicion.filter(nivel__in=niveles_desde(NIVELES_IDIOMA, nivel))
+        queryset = queryset.filter(Exists(condicion))
+    if filtros.distancias is not None:
+        queryset = queryset.filter(ciudad_id__in=list(filtros.distancias))
+    if filtros.salario_min is not None:
+        queryset = queryset.filter(salario_esperado__gte=filtros.salario_min)
+    if filtros.salario_max is not None:
+        queryset = queryset.filter(salario_esperado__lte=filtros.salario_max)
+    texto = (filtros.texto or '').strip()
+    if texto:
+        queryset = get_backend().buscar(queryset, texto)
+    return queryset
+
+
+def contar(queryset, limite=LIMITE_CONTEO):
+    """(total, exacto): cuenta hasta `limite` coincidencias y se detiene ahí."""
+    total = queryset.order_by()[:limite + 1].count()
+    return min(total, limite), total <= limite
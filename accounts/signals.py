@@ -0,0 +1,56 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Candidato, CandidatoHabilidad, CandidatoIdioma, Documento, Educacion, Empresa, ExperienciaLaboral, Usuario,
+)
+from . import backends, dashboard
+from .search import actualizar_vectores
+
+"""
+Señales del módulo ACCOUNTS.
+
+Invalidan la caché del dashboard del candidato cuando cambia cualquiera de los datos
+que muestra, y la del usuario con su perfil (accounts/backends.py), y mantienen el
+vector de la búsqueda de talento (accounts/search.py). Postulaciones y ofertas
+guardadas se atienden en jobs/signals.py.
+"""
+
+@receiver([post_save, post_delete], sender=Candidato)
+def candidato_cambiado_dashboard(sender, instance, **kwargs):
+    dashboard.invalidar(instance.pk)
+
+@receiver([post_save, post_delete], sender=ExperienciaLaboral)
+@receiver([post_save, post_delete], sender=Educacion)
+@receiver([post_save, post_delete], sender=CandidatoHabilidad)
+@receiver([post_save, post_delete], sender=CandidatoIdioma)
+@receiver([post_save, post_delete], sender=Documento)
+def dato_candidato_cambiado_dashboard(sender, instance, **kwargs):
+    dashboard.invalidar(instance.candidato_id)
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def usuario_cambiado_perfil(sender, instance, **kwargs):
+    backends.invalidar(instance.pk)
+
+@receiver([post_save, post_delete], sender=Empresa)
+@receiver([post_save, post_delete], sender=Candidato)
+def perfil_cambiado(sender, instance, **kwargs):
+    backends.invalidar(instance.usuario_id)
+
+
+# --- VECTOR DE BÚSQUEDA DE TALENTO ---
+
+CAMPOS_VECTOR = {'titulo_profesional', 'resumen_perfil', 'cv_actual'}
+
+@receiver(post_save, sender=Candidato)
+def candidato_guardado_busqueda(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and CAMPOS_VECTOR.isdisjoint(update_fields)):
+        return
+    actualizar_vectores(candidato_ids=[instance.pk])
+
+@receiver([post_save, post_delete], sender=ExperienciaLaboral)
+def experiencia_cambiada_busqueda(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    actualizar_vectores(candidato_ids=[instance.candidato_id])
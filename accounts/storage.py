@@ -0,0 +1,96 @@
+import os
+import uuid
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+
+from .extraction import encolar
+
+"""
+Almacenamiento de CV direccionado por contenido.
+
+Cada archivo se guarda una sola vez con su SHA-256 como nombre:
+cvs/sha256/<2 primeros>/<digest>.<extensión>. Si dos candidatos (o el mismo, dos
+veces) suben el mismo PDF, el segundo no escribe nada en disco. El hash lo calcula
+accounts.uploads.SubidaCVHandler mientras recibe el archivo.
+
+En la BD, un candidato tiene a lo sumo un Documento por contenido (restricción
+candidato + sha256): volver a subir el mismo CV solo lo marca otra vez como actual.
+Candidato.cv_actual apunta al CV vigente; lo que antes se buscaba con
+filter(tipo_documento="CV").last() es ahora una lectura por clave primaria.
+
+Los blobs no se borran al eliminar un Documento: pueden estar compartidos. El texto
+de cada contenido se extrae en segundo plano (accounts/extraction.py).
+"""
+
+DIRECTORIO = 'cvs/sha256'
+
+
+class AlmacenCV(FileSystemStorage):
+    """FileSystemStorage (MEDIA_ROOT) en el que un nombre ya existente no se vuelve a escribir."""
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        ruta = self.path(name)
+        if os.path.exists(ruta):
+            return name
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # Se escribe aparte y se renombra: os.replace es atómico y, si otra subida del
+        # mismo contenido llegó antes, reemplazarlo no cambia nada
+        temporal = f"{ruta}.{uuid.uuid4().hex}.tmp"
+        try:
+            if hasattr(content, 'temporary_file_path'):
+                file_move_safe(content.temporary_file_path(), temporal)
+            else:
+                with open(temporal, 'wb') as destino:
+                    for fragmento in content.chunks():
+                        destino.write(fragmento)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporal, self.file_permissions_mode)
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        return name
+
+
+def nombre_blob(sha256, tipo):
+    return f"{DIRECTORIO}/{sha256[:2]}/{sha256}.{tipo}"
+
+
+almacen = AlmacenCV()
+
+
+def registrar_cv(candidato, archivo, nombre=''):
+    """
+    Guarda el blob (si no existía) y deja su Documento como CV actual del candidato.
+    `archivo` es el que entrega SubidaCVHandler (con `sha256` y `tipo`).
+    """
+    from .models import Documento
+
+    nombre = nombre or archivo.name
+    ruta = almacen.save(nombre_blob(archivo.sha256, archivo.tipo), archivo)
+    datos = {
+        'nombre_archivo': nombre[:255], 'url_archivo': ruta, 'tipo_documento': 'CV',
+        'tamanio': archivo.size, 'tipo_contenido': archivo.content_type,
+    }
+    try:
+        with transaction.atomic():
+            documento, creado = Documento.objects.get_or_create(
+                candidato=candidato, sha256=archivo.sha256, defaults=datos,
+            )
+    except IntegrityError:
+        # Dos subidas simultáneas del mismo archivo: la otra ya creó la fila
+        documento, creado = Documento.objects.get(candidato=candidato, sha256=archivo.sha256), False
+    if not creado and documento.nombre_archivo != nombre[:255]:
+        documento.nombre_archivo = nombre[:255]
+        documento.save(update_fields=['nombre_archivo'])
+    if candidato.cv_actual_id != documento.pk:
+        candidato.cv_actual = documento
+        candidato.save(update_fields=['cv_actual'])
+    if documento.extraccion_id is None:
+        encolar(documento)
+    return documento, creado
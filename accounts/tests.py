@@ -1,3 +1,349 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import SESSION_KEY, get_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpRequest
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from config.testing import Caso, PresupuestoConsultasMixin, sembrar_datos
+
+from . import urls
+from . import extraction
+from .extraction import extraer_pendientes
+from .models import Candidato, CandidatoHabilidad, Documento, Empresa, EstadoExtraccion, ExperienciaLaboral, ExtraccionCV
+
+
+class PresupuestoVistasAccountsTests(PresupuestoConsultasMixin, TestCase):
+    URLCONF = urls
+
+    # Con una sesión iniciada, usuario y perfil se cargan en una sola consulta
+    # (accounts/backends.py), más la lectura de la sesión
+    CASOS = [
+        Caso('registro', 0),
+        Caso('login', 0),
+        Caso('logout', 4, usuario='candidato', metodo='post', estado=302),
+        Caso('subir_cv', 2, usuario='candidato'),
+        # Pasos 1 y editar_perfil: +1 por la etiqueta de la ciudad elegida (CiudadAutocomplete)
+        Caso('wizard_perfil', 3, usuario='candidato', kwargs=lambda d: {'paso': 1}, nombre='wizard_perfil (paso 1)'),
+        Caso('wizard_perfil', 2, usuario='candidato', kwargs=lambda d: {'paso': 2}, nombre='wizard_perfil (paso 2)'),
+        Caso('wizard_perfil', 2, usuario='candidato', kwargs=lambda d: {'paso': 3}, nombre='wizard_perfil (paso 3)'),
+        Caso('wizard_perfil', 2, usuario='candidato', kwargs=lambda d: {'paso': 4}, nombre='wizard_perfil (paso 4)'),
+        Caso('dashboard_candidato', 10, usuario='candidato'),
+        Caso('editar_perfil', 3, usuario='candidato'),
+        Caso('perfil_publico_candidato', 7, usuario='empresa', kwargs=lambda d: {'candidato_id': d.candidato.pk}),
+    ]
+
+
+class PerfilBackendTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        cache.clear()
+
+    def _usuario(self, usuario):
+        self.client.force_login(usuario)
+        request = HttpRequest()
+        request.session = self.client.session
+        request.session[SESSION_KEY]    # carga la sesión fuera de la medición
+        return lambda: get_user(request)
+
+    def test_usuario_y_perfil_en_una_consulta(self):
+        usuario = self._usuario(self.datos.usuario_empresa)
+        with self.assertNumQueries(1):
+            self.assertEqual(usuario().perfil_empresa.pk, self.datos.empresa.pk)
+
+        usuario = self._usuario(self.datos.usuario_candidato)
+        with self.assertNumQueries(1):
+            cargado = usuario()
+            self.assertEqual(cargado.perfil_candidato.pk, self.datos.candidato.pk)
+            with self.assertRaises(Empresa.DoesNotExist):
+                cargado.perfil_empresa
+
+    def test_sin_ttl_no_se_guarda_entre_peticiones(self):
+        usuario = self._usuario(self.datos.usuario_empresa)
+        usuario()
+        with self.assertNumQueries(1):
+            usuario()
+        with override_settings(ACCOUNTS_PERFIL_CACHE_TTL=60):
+            usuario()
+            with self.assertNumQueries(0):
+                self.assertEqual(usuario().perfil_empresa.nombre_empresa, 'ACME')
+
+    @override_settings(ACCOUNTS_PERFIL_CACHE_TTL=60)
+    def test_guardar_el_perfil_invalida(self):
+        usuario = self._usuario(self.datos.usuario_empresa)
+        usuario()
+        empresa = Empresa.objects.get(pk=self.datos.empresa.pk)
+        empresa.nombre_empresa = 'ACME 2'
+        empresa.save()
+        self.assertEqual(usuario().perfil_empresa.nombre_empresa, 'ACME 2')
+
+        self.datos.usuario_empresa.set_password('otra-clave')
+        self.datos.usuario_empresa.save()
+        # El hash de sesión ya no coincide: la sesión se cierra como con ModelBackend
+        self.assertFalse(usuario().is_authenticated)
+
+
+@override_settings(SQL_MUESTREO=0)
+class DashboardCandidatoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.datos.usuario_candidato)
+        self.url = reverse('dashboard_candidato')
+
+    def _contexto(self, consultas=None):
+        if consultas is None:
+            return self.client.get(self.url).context
+        with self.assertNumQueries(consultas):
+            return self.client.get(self.url).context
+
+    def test_visita_repetida_solo_lee_sesion_y_usuario(self):
+        self._contexto()
+        self._contexto(consultas=2)
+
+    def test_cambios_del_candidato_reconstruyen_el_contexto(self):
+        from jobs.models import OfertaEmpleo, Postulacion
+
+        candidato = self.datos.candidato
+        contexto = self._contexto()
+        activas = contexto['stats']['postulaciones_activas']
+
+        oferta = OfertaEmpleo.objects.create(empresa=self.datos.empresa, titulo='Recién publicada',
+                                             descripcion='-', estado='publicada')
+        Postulacion.objects.create(oferta=oferta, candidato=candidato)
+        contexto = self._contexto()
+        self.assertEqual(contexto['stats']['postulaciones_activas'], activas + 1)
+        self.assertEqual(contexto['postulaciones'][0].oferta, oferta)
+
+        ExperienciaLaboral.objects.create(candidato=candidato, empresa='ACME', cargo='Analista',
+                                          fecha_inicio=date(2020, 1, 1))
+        self.assertIn('Analista', [e.cargo for e in self._contexto()['experiencias']])
+
+        habilidad = CandidatoHabilidad.objects.filter(candidato=candidato).first()
+        habilidad.delete()
+        self.assertNotIn(habilidad.habilidad_id, [h.habilidad_id for h in self._contexto()['habilidades']])
+
+        # Borrar la oferta borra la postulación en cascada y también invalida
+        oferta.delete()
+        self.assertEqual(self._contexto()['stats']['postulaciones_activas'], activas)
+        self._contexto(consultas=2)
+
+
+class SubidaCVTests(TestCase):
+    PDF = b'%PDF-1.4\n' + b'contenido del cv ' * 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        cache.clear()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        configuracion = override_settings(MEDIA_ROOT=media)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+        self.media = media
+
+    def _subir(self, usuario, contenido, nombre='cv.pdf'):
+        self.client.force_login(usuario)
+        return self.client.post(reverse('subir_cv'), {
+            'nombre_archivo': 'Mi CV', 'url_archivo': SimpleUploadedFile(nombre, contenido),
+        })
+
+    def _blobs(self):
+        return [archivo for _, _, archivos in os.walk(self.media) for archivo in archivos]
+
+    def test_mismo_contenido_se_guarda_una_vez(self):
+        otro = self.datos.candidatos[1]
+        self.assertEqual(self._subir(self.datos.usuario_candidato, self.PDF).status_code, 302)
+        self.assertEqual(self._subir(self.datos.usuario_candidato, self.PDF, 'copia.pdf').status_code, 302)
+        self.assertEqual(self._subir(otro.usuario, self.PDF).status_code, 302)
+
+        documentos = Documento.objects.filter(sha256__isnull=False)
+        self.assertEqual(documentos.count(), 2)     # uno por candidato
+        self.assertEqual(len(self._blobs()), 1)
+        documento = documentos.get(candidato=self.datos.candidato)
+        self.assertEqual(documento.tamanio, len(self.PDF))
+        self.assertEqual(documento.tipo_contenido, 'application/pdf')
+        self.assertTrue(documento.url_archivo.name.endswith(f'{documento.sha256}.pdf'))
+        self.assertEqual(Candidato.objects.get(pk=self.datos.candidato.pk).cv_actual, documento)
+
+        # El paso 4 del asistente abre el CV actual
+        response = self.client.get(reverse('wizard_perfil', args=[4]))
+        self.assertEqual(response.context['form'].instance, documentos.get(candidato=otro))
+
+    def test_rechaza_tipo_y_tamanio_sin_guardar(self):
+        response = self._subir(self.datos.usuario_candidato, b'no soy un pdf')
+        self.assertFormError(response.context['form'], 'url_archivo', "El contenido del archivo no corresponde a su extensión.")
+        with override_settings(CV_TAMANIO_MAXIMO=1024):
+            response = self._subir(self.datos.usuario_candidato, self.PDF)
+        self.assertIn("supera el máximo", response.context['form'].errors['url_archivo'][0])
+        response = self._subir(self.datos.usuario_candidato, self.PDF, 'cv.exe')
+        self.assertIn('url_archivo', response.context['form'].errors)
+        self.assertFalse(Documento.objects.filter(sha256__isnull=False).exists())
+        self.assertEqual(self._blobs(), [])
+
+    def test_sigue_protegida_contra_csrf(self):
+        cliente = Client(enforce_csrf_checks=True)
+        cliente.force_login(self.datos.usuario_candidato)
+        response = cliente.post(reverse('subir_cv'), {'url_archivo': SimpleUploadedFile('cv.pdf', self.PDF)})
+        self.assertEqual(response.status_code, 403)
+
+
+def pdf_con_texto(texto):
+    """PDF mínimo de una página con `texto` en Helvetica."""
+    flujo = f"BT /F1 12 Tf 72 720 Td ({texto}) Tj ET".encode('latin-1')
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(flujo), flujo),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    salida, posiciones = bytearray(b"%PDF-1.4\n"), []
+    for numero, objeto in enumerate(objetos, 1):
+        posiciones.append(len(salida))
+        salida += b"%d 0 obj\n%s\nendobj\n" % (numero, objeto)
+    xref = len(salida)
+    salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    salida += b"".join(b"%010d 00000 n \n" % posicion for posicion in posiciones)
+    salida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return bytes(salida)
+
+
+def docx_con_texto(*parrafos):
+    w = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    cuerpo = ''.join(f'<w:p><w:r><w:t>{parrafo}</w:t></w:r></w:p>' for parrafo in parrafos)
+    contenido = tempfile.SpooledTemporaryFile()
+    with zipfile.ZipFile(contenido, 'w') as paquete:
+        paquete.writestr('word/document.xml', f'<w:document xmlns:w="{w}"><w:body>{cuerpo}</w:body></w:document>')
+    contenido.seek(0)
+    return contenido.read()
+
+
+class ExtraccionCVTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        cache.clear()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        configuracion = override_settings(MEDIA_ROOT=media)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+        Documento.objects.all().delete()
+
+    def _subir(self, candidato, contenido, nombre):
+        self.client.force_login(candidato.usuario)
+        response = self.client.post(reverse('subir_cv'), {
+            'nombre_archivo': nombre, 'url_archivo': SimpleUploadedFile(nombre, contenido),
+        })
+        self.assertEqual(response.status_code, 302)
+        return Candidato.objects.get(pk=candidato.pk).cv_actual
+
+    def test_extrae_pdf_y_docx_una_vez_por_contenido(self):
+        pdf = pdf_con_texto('Ingeniera de datos con Python')
+        candidatos = self.datos.candidatos
+        documentos = [
+            self._subir(candidatos[0], pdf, 'cv.pdf'),
+            self._subir(candidatos[1], pdf, 'mismo.pdf'),
+            self._subir(candidatos[2], docx_con_texto('Contadora', 'Diez años en auditoría'), 'cv.docx'),
+        ]
+
+        resumen = extraer_pendientes(procesos=0)
+        self.assertEqual((resumen.extraidos, resumen.reutilizados, resumen.errores), (2, 1, 0))
+        self.assertEqual(ExtraccionCV.objects.count(), 2)
+        pdf_1, pdf_2, docx = (Documento.objects.select_related('extraccion').get(pk=d.pk) for d in documentos)
+        self.assertEqual(pdf_1.extraccion, pdf_2.extraccion)
+        self.assertIn('Ingeniera de datos con Python', pdf_1.extraccion.texto)
+        self.assertEqual(pdf_1.extraccion.paginas, 1)
+        self.assertEqual(docx.extraccion.texto, 'Contadora\nDiez años en auditoría')
+        self.assertEqual(docx.extraccion.estado, EstadoExtraccion.OK)
+
+        # Idempotente: lo ya extraído no se vuelve a leer
+        self.assertEqual(extraer_pendientes(procesos=0).procesados, 0)
+        # Un contenido ya extraído que vuelve a subirse se enlaza sin abrir el archivo
+        otro = self._subir(candidatos[3], pdf, 'copia.pdf')
+        resumen = extraer_pendientes(procesos=0)
+        self.assertEqual((resumen.extraidos, resumen.reutilizados), (0, 1))
+        self.assertEqual(Documento.objects.get(pk=otro.pk).extraccion, pdf_1.extraccion)
+
+    def test_errores_y_documentos_sin_hash(self):
+        candidatos = self.datos.candidatos
+        roto = self._subir(candidatos[0], b'%PDF-1.4\nsin objetos', 'roto.pdf')
+        # Documento subido antes del almacenamiento por hash
+        self._subir(candidatos[1], docx_con_texto('CV antiguo'), 'antiguo.docx')
+        antiguo = Documento.objects.get(candidato=candidatos[1])
+        Documento.objects.filter(pk=antiguo.pk).update(sha256=None)
+
+        call_command('extraer_cvs', procesos=0, stdout=open(os.devnull, 'w'))
+        roto.refresh_from_db()
+        antiguo.refresh_from_db()
+        self.assertEqual(roto.extraccion.estado, EstadoExtraccion.ERROR)
+        self.assertTrue(roto.extraccion.error)
+        self.assertEqual(antiguo.extraccion.texto, 'CV antiguo')
+        self.assertEqual(antiguo.sha256, antiguo.extraccion.sha256)
+
+        # Los errores se reintentan; lo correcto no
+        self.assertEqual(extraer_pendientes(procesos=0).errores, 1)
+
+    def test_archivo_perdido_y_pool_roto_no_cortan_la_corrida(self):
+        candidatos = self.datos.candidatos
+        self._subir(candidatos[0], docx_con_texto('Archivo borrado'), 'perdido.docx')
+        perdido = Documento.objects.get(candidato=candidatos[0])
+        Documento.objects.filter(pk=perdido.pk).update(sha256=None)
+        os.remove(perdido.url_archivo.path)
+        caido = self._subir(candidatos[1], docx_con_texto('Proceso caído'), 'caido.docx')
+        sano = self._subir(candidatos[2], docx_con_texto('Sin problemas'), 'sano.docx')
+
+        class PoolRoto(extraction._EnLinea):
+            def submit(self, funcion, ruta, sha256):
+                if sha256 != caido.sha256:
+                    return super().submit(funcion, ruta, sha256)
+                futuro = Future()
+                futuro.set_exception(BrokenProcessPool("un proceso terminó de forma abrupta"))
+                return futuro
+
+        with mock.patch.object(extraction, 'crear_pool', lambda procesos: PoolRoto()), \
+                self.assertLogs('accounts.extraction', 'WARNING'):
+            resumen = extraer_pendientes(procesos=1)
+        self.assertEqual((resumen.extraidos, resumen.errores), (1, 2))
+
+        perdido.refresh_from_db()
+        self.assertIsNone(perdido.extraccion)
+        self.assertIn('FileNotFoundError', perdido.error_extraccion)
+        self.assertFalse(ExtraccionCV.objects.filter(error__contains='FileNotFoundError').exists())
+        caido.refresh_from_db()
+        self.assertEqual(caido.extraccion.estado, EstadoExtraccion.ERROR)
+        self.assertIn('BrokenProcessPool', caido.extraccion.error)
+        self.assertEqual(Documento.objects.get(pk=sano.pk).extraccion.texto, 'Sin problemas')
+
+        # Ambos siguen pendientes y se reintentan sin cortar la corrida
+        self.assertEqual(extraer_pendientes(procesos=0).procesados, 2)
+
+    def test_pool_de_procesos(self):
+        documento = self._subir(self.datos.candidato, docx_con_texto('Desde otro proceso'), 'cv.docx')
+        resumen = extraer_pendientes(procesos=1)
+        self.assertEqual(resumen.extraidos, 1)
+        self.assertEqual(Documento.objects.get(pk=documento.pk).extraccion.texto, 'Desde otro proceso')
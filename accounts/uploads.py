@@ -0,0 +1,130 @@
+import hashlib
+import os
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+"""
+Recepción de CV en streaming.
+
+SubidaCVHandler reemplaza a los handlers por defecto de Django (memoria hasta 2,5 MB,
+luego archivo temporal) en las vistas que reciben CV. Por cada fragmento del cuerpo
+de la petición:
+
+- comprueba la firma del archivo (los primeros bytes) contra la extensión declarada:
+  un .pdf tiene que empezar por %PDF-, un .docx ser un ZIP, un .doc un OLE2;
+- suma el tamaño y corta en cuanto pasa CV_TAMANIO_MAXIMO;
+- actualiza el SHA-256 y escribe el fragmento en un archivo temporal.
+
+Un archivo rechazado deja de escribirse en el mismo fragmento en que se detecta el
+problema: nunca se guarda entero en memoria ni en disco. La vista recibe un
+ArchivoRechazado con el motivo, que el formulario (accounts.forms.CampoCV) muestra
+como error del campo. Los aceptados llegan como TemporaryUploadedFile con `sha256` y
+`tipo` (extensión según la firma) para accounts.storage.
+"""
+
+TAMANIO_MAXIMO = 5 * 1024 * 1024
+FIRMAS = {
+    'pdf': (b'%PDF-',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',),
+}
+TIPOS_CONTENIDO = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+_LARGO_FIRMA = max(len(f) for firmas in FIRMAS.values() for f in firmas)
+
+
+def tamanio_maximo():
+    return getattr(settings, 'CV_TAMANIO_MAXIMO', TAMANIO_MAXIMO)
+
+
+class ArchivoRechazado(SimpleUploadedFile):
+    """Archivo vacío que lleva el motivo del rechazo en `error`."""
+
+    def __init__(self, nombre, error):
+        super().__init__(nombre, b'')
+        self.error = error
+
+
+class SubidaCVHandler(FileUploadHandler):
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.tipo = os.path.splitext(file_name)[1].lower().lstrip('.')
+        self.error = None
+        self.tamanio = 0
+        self.inicio = b''
+        self.hash = hashlib.sha256()
+        self.archivo = None
+        if self.tipo not in FIRMAS:
+            self.error = "Solo se admiten archivos PDF o Word (.doc, .docx)."
+        elif content_length is not None and content_length > tamanio_maximo():
+            self.error = self._mensaje_tamanio()
+        else:
+            self.archivo = TemporaryUploadedFile(file_name, TIPOS_CONTENIDO[self.tipo], 0, charset, content_type_extra)
+
+    def _mensaje_tamanio(self):
+        return f"El archivo supera el máximo de {filesizeformat(tamanio_maximo())}."
+
+    def _rechazar(self, error):
+        self.error = error
+        if self.archivo is not None:
+            self.archivo.close()    # borra el temporal
+            self.archivo = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None     # se descarta el resto del archivo
+        self.tamanio += len(raw_data)
+        if self.tamanio > tamanio_maximo():
+            self._rechazar(self._mensaje_tamanio())
+            return None
+        if len(self.inicio) < _LARGO_FIRMA:
+            self.inicio += raw_data[:_LARGO_FIRMA]
+            if len(self.inicio) >= _LARGO_FIRMA and not self.inicio.startswith(FIRMAS[self.tipo]):
+                self._rechazar("El contenido del archivo no corresponde a su extensión.")
+                return None
+        self.hash.update(raw_data)
+        self.archivo.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.error and (not self.tamanio or not self.inicio.startswith(FIRMAS[self.tipo])):
+            self._rechazar("El archivo está vacío o dañado.")
+        if self.error:
+            return ArchivoRechazado(self.file_name, self.error)
+        self.archivo.seek(0)
+        self.archivo.size = file_size
+        self.archivo.sha256 = self.hash.hexdigest()
+        self.archivo.tipo = self.tipo
+        return self.archivo
+
+    def upload_interrupted(self):
+        if self.archivo is not None:
+            self.archivo.close()
+
+
+def recibe_cv(vista):
+    """
+    Instala SubidaCVHandler antes de que se lea el cuerpo de la petición.
+
+    CsrfViewMiddleware lee request.POST antes de la vista, lo que procesaría la subida
+    con los handlers por defecto; por eso la vista se exime en el middleware y se
+    protege aquí, después de cambiar los handlers (patrón de la documentación de Django).
+    """
+    protegida = csrf_protect(vista)
+
+    @csrf_exempt
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if request.method == 'POST':
+            request.upload_handlers = [SubidaCVHandler(request)]
+        return protegida(request, *args, **kwargs)
+    return envoltura
@@ -3,6 +3,9 @@ from django.contrib.auth import login, authenticate
 from django.contrib import messages
 from .forms import CustomUserCreationForm, CustomAuthenticationForm, CandidatoPerfilForm, ExperienciaForm, DocumentoForm
 from .models import Empresa, Candidato
+from .dashboard import contexto_dashboard
+from .storage import registrar_cv
+from .uploads import recibe_cv
 from django.contrib.auth.decorators import login_required
 
 def registro_view(request):
@@ -64,48 +67,19 @@ def perfil_candidato_step(request):
 
 @login_required
 def dashboard_candidato(request):
-    candidato = request.user.perfil_candidato
-
-    experiencias = candidato.experiencia_laboral.all().order_by('-fecha_inicio')
-    educacion = candidato.educacion.all().order_by('-fecha_inicio')
-    
-    postulaciones = candidato.postulaciones.select_related(
-        'oferta', 'oferta__empresa'
-    ).order_by('-fecha_postulacion')[:5]
-
-    ofertas_guardadas = candidato.ofertas_guardadas.select_related(
-        'oferta', 'oferta__empresa'
-    ).order_by('-created_at')[:5]
-
-    habilidades = candidato.habilidades.select_related('habilidad').all()
-    idiomas = candidato.idiomas.select_related('idioma').all()
-    
-    stats = {
-        'postulaciones_activas': candidato.postulaciones.exclude(estado='rechazado').count(),
-        'entrevistas': candidato.postulaciones.filter(estado='entrevista').count(),
-        'guardadas': candidato.ofertas_guardadas.count()
-    }
-    
-    return render(request, 'candidatoPerfil/dashboard.html', {
-        'candidato': candidato,
-        'experiencias': experiencias,
-        'educacion': educacion,
-        'postulaciones': postulaciones,
-        'ofertas_guardadas': ofertas_guardadas,
-        'habilidades': habilidades,
-        'idiomas': idiomas,
-        'stats': stats
-    })
+    # Todo el contexto sale de caché por candidato (ver accounts/dashboard.py)
+    return render(request, 'candidatoPerfil/dashboard.html', contexto_dashboard(request.user))
 
 
 @login_required
+@recibe_cv
 def wizard_perfil(request, paso=1):
     from .models import Habilidad, CandidatoHabilidad, Documento
     from .forms import HabilidadForm # Import needed forms
 
     # 1. Obtener el candidato
     try:
-        candidato = Candidato.objects.get(usuario=request.user)
+        candidato = request.user.perfil_candidato
     except Candidato.DoesNotExist:
         candidato = Candidato.objects.create(
             usuario=request.user, 
@@ -129,8 +103,8 @@ def wizard_perfil(request, paso=1):
 
     elif paso == 4:
         # Archivos (Antes Paso 3)
-        # Buscamos el último CV para editarlo si existe
-        documento = candidato.documento.filter(tipo_documento="CV").last()
+        # CV vigente del candidato para editarlo si existe (accounts/storage.py)
+        documento = candidato.cv_actual
         form = DocumentoForm(instance=documento)
         template = 'candidatoPerfil/paso4_archivos.html' # Changed name
     else:
@@ -145,7 +119,6 @@ def wizard_perfil(request, paso=1):
         elif paso == 3:
             form = HabilidadForm(request.POST)
         elif paso == 4:
-            documento = candidato.documento.filter(tipo_documento="CV").last()
             form = DocumentoForm(request.POST, request.FILES, instance=documento)
 
         # VALIDACIONES ESPECIFICAS POR PASO
@@ -190,12 +163,15 @@ def wizard_perfil(request, paso=1):
 
             # GUARDADO PASO 4 (ARCHIVOS)
             if paso == 4:
-                obj = form.save(commit=False)
-                obj.candidato = candidato
-                obj.tipo_documento = "CV"
-                obj.save()
-                messages.success(request, "¡Perfil Completado!")
-                return redirect('dashboard_candidato')
+                if 'url_archivo' in request.FILES:
+                    registrar_cv(candidato, form.cleaned_data['url_archivo'], form.cleaned_data['nombre_archivo'])
+                elif documento is not None:
+                    form.save()     # solo cambia el nombre del CV actual
+                else:
+                    form.add_error('url_archivo', "Selecciona un archivo.")
+                if form.is_valid():
+                    messages.success(request, "¡Perfil Completado!")
+                    return redirect('dashboard_candidato')
 
             # GUARDADO PASOS 1 y 2
             obj = form.save(commit=False)
@@ -226,17 +202,18 @@ def wizard_perfil(request, paso=1):
 
 
 @login_required
+@recibe_cv
 def subir_cv_view(request):
     candidato = request.user.perfil_candidato
     
     if request.method == 'POST':
-        # ¡Importante! request.FILES es lo que recibe el archivo PDF
+        # ¡Importante! request.FILES es lo que recibe el archivo PDF (vía accounts.uploads)
         form = DocumentoForm(request.POST, request.FILES)
+        if form.is_valid() and not form.cleaned_data['url_archivo']:
+            form.add_error('url_archivo', "Selecciona un archivo.")
         if form.is_valid():
-            documento = form.save(commit=False)
-            documento.candidato = candidato
-            documento.tipo_documento = "CV" # Marcamos que es su hoja de vida
-            documento.save()
+            # Mismo contenido que uno ya subido: no se duplica, solo vuelve a ser el actual
+            registrar_cv(candidato, form.cleaned_data['url_archivo'], form.cleaned_data['nombre_archivo'])
             messages.success(request, "¡Tu CV se ha subido con éxito!")
             return redirect('dashboard_candidato')
     else:
@@ -247,7 +224,7 @@ def subir_cv_view(request):
 @login_required
 def perfil_publico_candidato(request, candidato_id):
     """Vista detallada del perfil de un candidato para que las empresas lo evalúen."""
-    candidato = get_object_or_404(Candidato, id=candidato_id)
+    candidato = get_object_or_404(Candidato.objects.select_related('usuario', 'ciudad__provincia'), id=candidato_id)
     
     # Obtenemos sus datos relacionados
     experiencias = candidato.experiencia_laboral.all().order_by('-fecha_inicio')
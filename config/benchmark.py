@@ -0,0 +1,369 @@
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+"""
+Benchmark de carga HTTP de extremo a extremo.
+
+Reproduce recorridos reales de usuarios con clientes asyncio concurrentes:
+- Candidato: lista_ofertas -> detallar_oferta -> postularse -> dashboard_candidato
+- Empresa: dashboard_empresa -> ver_postulantes -> cambiar_estado_postulacion
+
+Dos transportes:
+- TransporteASGI (por defecto): llama en el mismo proceso a `config.asgi.application`,
+  sin red ni servidor. Mide la pila completa de Django (middleware, vistas, plantillas,
+  BD) tal como corre bajo un servidor ASGI con un solo worker.
+- TransporteHTTP: contra un servidor ya levantado (runserver, uvicorn, gunicorn...).
+  Necesita httpx.
+
+Cada petición se agrupa por el nombre de la URL (no por la ruta), así las 500 ofertas
+distintas cuentan como un solo endpoint. El resultado (p50/p95/p99, media, máximo,
+peticiones por segundo y códigos de estado) se guarda en JSON junto con el commit
+para comparar corridas entre versiones.
+
+Los recorridos escriben en la BD (postulaciones y cambios de estado): usar sobre una
+base desechable, por ejemplo una generada con `python manage.py generar_datos`.
+"""
+
+PERCENTILES = (50, 95, 99)
+ESTADOS_CAMBIO = ['visto', 'entrevista', 'prueba_tecnica', 'rechazado']
+MAX_OFERTAS = 500
+MAX_POSTULACIONES_POR_OFERTA = 50
+
+
+class TransporteASGI:
+    """Cliente mínimo de ASGI sobre la aplicación del proyecto (config.asgi)."""
+
+    def __init__(self, application=None, host='localhost'):
+        if application is None:
+            from config.asgi import application
+        self.application = application
+        self.host = host
+
+    async def peticion(self, metodo, ruta, cookies, cuerpo=b'', cabeceras=()):
+        ruta, _, query = ruta.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': metodo,
+            'scheme': 'http',
+            'path': ruta,
+            'raw_path': ruta.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [
+                (b'host', self.host.encode()),
+                (b'cookie', '; '.join(f'{k}={v}' for k, v in cookies.items()).encode()),
+                *((k.lower().encode(), v.encode()) for k, v in cabeceras),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+        }
+        respondido = asyncio.Event()
+        pendiente = [{'type': 'http.request', 'body': cuerpo, 'more_body': False}]
+        respuesta = {'estado': None, 'set_cookie': [], 'bytes': 0}
+
+        async def receive():
+            if pendiente:
+                return pendiente.pop()
+            await respondido.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(mensaje):
+            if mensaje['type'] == 'http.response.start':
+                respuesta['estado'] = mensaje['status']
+                respuesta['set_cookie'] = [
+                    v.decode('latin-1') for k, v in mensaje.get('headers', []) if k.lower() == b'set-cookie'
+                ]
+            elif mensaje['type'] == 'http.response.body':
+                respuesta['bytes'] += len(mensaje.get('body', b''))
+
+        try:
+            await self.application(scope, receive, send)
+        finally:
+            respondido.set()
+        _actualizar_cookies(cookies, respuesta['set_cookie'])
+        return respuesta['estado'], respuesta['bytes']
+
+    async def cerrar(self):
+        pass
+
+
+class TransporteHTTP:
+    """Contra un servidor real. Un httpx.AsyncClient compartido (pool de conexiones)."""
+
+    def __init__(self, url_base, concurrencia=100):
+        import httpx
+
+        self.cliente = httpx.AsyncClient(
+            base_url=url_base, follow_redirects=False, timeout=60,
+            limits=httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia),
+        )
+
+    async def peticion(self, metodo, ruta, cookies, cuerpo=b'', cabeceras=()):
+        cabeceras = dict(cabeceras)
+        cabeceras['Cookie'] = '; '.join(f'{k}={v}' for k, v in cookies.items())
+        respuesta = await self.cliente.request(metodo, ruta, content=cuerpo or None, headers=cabeceras)
+        _actualizar_cookies(cookies, respuesta.headers.get_list('set-cookie'))
+        return respuesta.status_code, len(respuesta.content)
+
+    async def cerrar(self):
+        await self.cliente.aclose()
+
+
+def _actualizar_cookies(cookies, cabeceras_set_cookie):
+    for cabecera in cabeceras_set_cookie:
+        for nombre, morsel in SimpleCookie(cabecera).items():
+            if morsel['max-age'] == '0' or not morsel.value:
+                cookies.pop(nombre, None)
+            else:
+                cookies[nombre] = morsel.value
+
+
+class Metricas:
+    def __init__(self):
+        self.tiempos = defaultdict(list)     # endpoint -> [ms]
+        self.estados = defaultdict(Counter)  # endpoint -> {código: veces}
+        self.errores = Counter()
+        self.bytes = Counter()
+        self.activas = True                  # False durante el calentamiento
+
+    def registrar(self, endpoint, ms, estado, tamanio=0):
+        if not self.activas:
+            return
+        self.tiempos[endpoint].append(ms)
+        self.estados[endpoint][str(estado)] += 1
+        self.bytes[endpoint] += tamanio
+        if not isinstance(estado, int) or estado >= 400:
+            self.errores[endpoint] += 1
+
+    def resumen(self, segundos):
+        endpoints = {nombre: self._estadisticas(nombre, tiempos, segundos) for nombre, tiempos in sorted(self.tiempos.items())}
+        todos = [ms for tiempos in self.tiempos.values() for ms in tiempos]
+        total = self._estadisticas(None, todos, segundos) if todos else {}
+        return endpoints, total
+
+    def _estadisticas(self, nombre, tiempos, segundos):
+        arreglo = np.asarray(tiempos)
+        datos = {
+            'peticiones': len(arreglo),
+            'errores': sum(self.errores.values()) if nombre is None else self.errores[nombre],
+            'rps': round(len(arreglo) / segundos, 2) if segundos else None,
+            'media_ms': round(float(arreglo.mean()), 2),
+            'max_ms': round(float(arreglo.max()), 2),
+        }
+        for p, valor in zip(PERCENTILES, np.percentile(arreglo, PERCENTILES)):
+            datos[f'p{p}_ms'] = round(float(valor), 2)
+        if nombre is not None:
+            datos['estados'] = dict(self.estados[nombre])
+            datos['bytes_medios'] = round(self.bytes[nombre] / len(arreglo))
+        return datos
+
+
+class ClienteVirtual:
+    """Un usuario con su propia sesión y cookies; mide cada petición por nombre de URL."""
+
+    def __init__(self, transporte, metricas, sesion=None):
+        self.transporte = transporte
+        self.metricas = metricas
+        self.csrf = get_random_string(CSRF_SECRET_LENGTH, allowed_chars=CSRF_ALLOWED_CHARS)
+        self.cookies = {settings.CSRF_COOKIE_NAME: self.csrf}
+        if sesion:
+            self.cookies[settings.SESSION_COOKIE_NAME] = sesion
+
+    async def get(self, nombre, **kwargs):
+        return await self._medir('GET', nombre, kwargs)
+
+    async def post(self, nombre, datos=None, **kwargs):
+        cabeceras = [
+            ('Content-Type', 'application/x-www-form-urlencoded'),
+            ('X-CSRFToken', self.csrf),
+        ]
+        return await self._medir('POST', nombre, kwargs, urlencode(datos or {}).encode(), cabeceras)
+
+    async def _medir(self, metodo, nombre, kwargs, cuerpo=b'', cabeceras=()):
+        ruta = reverse(nombre, kwargs=kwargs)
+        inicio = time.perf_counter()
+        try:
+            estado, tamanio = await self.transporte.peticion(metodo, ruta, self.cookies, cuerpo, cabeceras)
+        except Exception as error:
+            estado, tamanio = type(error).__name__, 0
+        self.metricas.registrar(nombre, (time.perf_counter() - inicio) * 1000, estado, tamanio)
+        return estado
+
+
+@dataclass
+class DatosRecorrido:
+    ofertas: list = field(default_factory=list)            # ids de ofertas publicadas
+    candidatos: list = field(default_factory=list)         # sesiones de candidatos
+    empresas: list = field(default_factory=list)           # (sesión, {oferta_id: [postulacion_id]})
+
+
+def _sesion(usuario):
+    """Crea una sesión autenticada en la BD y devuelve el valor de la cookie."""
+    from django.test import Client
+
+    cliente = Client()
+    cliente.force_login(usuario)
+    return cliente.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def preparar_datos(num_candidatos, num_empresas, semilla=0):
+    """
+    Elige los usuarios y objetos que recorrerán los clientes virtuales. Es síncrono
+    (ORM): se llama antes de arrancar el bucle de asyncio.
+    """
+    from accounts.models import Candidato, Usuario
+    from jobs.models import EstadoOferta, OfertaEmpleo, Postulacion
+
+    rng = random.Random(semilla)
+    datos = DatosRecorrido()
+    # Las más populares primero: así las ofertas "calientes" reciben la carga que reciben en producción
+    datos.ofertas = list(
+        OfertaEmpleo.objects.filter(estado=EstadoOferta.PUBLICADA)
+        .order_by('-num_postulaciones', '-id').values_list('id', flat=True)[:MAX_OFERTAS]
+    )
+
+    usuarios_ids = list(Candidato.objects.order_by('pk').values_list('usuario_id', flat=True)[:num_candidatos * 20])
+    usuarios_ids = rng.sample(usuarios_ids, min(num_candidatos, len(usuarios_ids)))
+    datos.candidatos = [_sesion(usuario) for usuario in Usuario.objects.filter(pk__in=usuarios_ids)]
+
+    # Empresas con más postulaciones recibidas: son las que más usan ver_postulantes
+    ofertas_con_postulantes = (
+        OfertaEmpleo.objects.filter(num_postulaciones__gt=0)
+        .order_by('-num_postulaciones').values_list('id', 'empresa__usuario_id')[:num_empresas * 5]
+    )
+    por_empresa = defaultdict(dict)
+    for oferta_id, usuario_id in ofertas_con_postulantes:
+        if len(por_empresa) >= num_empresas and usuario_id not in por_empresa:
+            continue
+        por_empresa[usuario_id][oferta_id] = list(
+            Postulacion.objects.filter(oferta_id=oferta_id).order_by('-id')
+            .values_list('id', flat=True)[:MAX_POSTULACIONES_POR_OFERTA]
+        )
+    for usuario in Usuario.objects.filter(pk__in=list(por_empresa)):
+        datos.empresas.append((_sesion(usuario), por_empresa[usuario.pk]))
+    return datos
+
+
+async def recorrido_candidato(cliente, datos, rng):
+    await cliente.get('jobs:lista_ofertas')
+    oferta_id = rng.choice(datos.ofertas)
+    await cliente.get('jobs:detallar_oferta', oferta_id=oferta_id)
+    await cliente.post('jobs:postularse', oferta_id=oferta_id)
+    await cliente.get('dashboard_candidato')
+
+
+async def recorrido_empresa(cliente, ofertas, rng):
+    await cliente.get('jobs:dashboard_empresa')
+    oferta_id = rng.choice(list(ofertas))
+    await cliente.get('jobs:ver_postulantes', oferta_id=oferta_id)
+    if ofertas[oferta_id]:
+        await cliente.post(
+            'jobs:cambiar_estado_postulacion', {'estado': rng.choice(ESTADOS_CAMBIO)},
+            postulacion_id=rng.choice(ofertas[oferta_id]),
+        )
+
+
+async def _usuario_virtual(recorrido, cliente, argumento, rng, fin, iteraciones, pausa):
+    hechas = 0
+    while time.monotonic() < fin and (iteraciones is None or hechas < iteraciones):
+        await recorrido(cliente, argumento, rng)
+        hechas += 1
+        if pausa:
+            # Tiempo de "lectura" entre recorridos, con variación para no sincronizar a los clientes
+            await asyncio.sleep(rng.uniform(0, 2 * pausa))
+    return hechas
+
+
+async def ejecutar(transporte, datos, duracion=30.0, calentamiento=2.0, iteraciones=None, pausa=0.0, semilla=0):
+    """Lanza un cliente por sesión preparada. Devuelve (Metricas, segundos medidos, recorridos)."""
+    metricas = Metricas()
+    metricas.activas = calentamiento <= 0
+    inicio = time.monotonic()
+    fin = inicio + calentamiento + duracion
+
+    tareas = []
+    for i, sesion in enumerate(datos.candidatos):
+        if datos.ofertas:
+            cliente = ClienteVirtual(transporte, metricas, sesion)
+            tareas.append(_usuario_virtual(
+                recorrido_candidato, cliente, datos, random.Random(f'{semilla}-c{i}'), fin, iteraciones, pausa,
+            ))
+    for i, (sesion, ofertas) in enumerate(datos.empresas):
+        cliente = ClienteVirtual(transporte, metricas, sesion)
+        tareas.append(_usuario_virtual(
+            recorrido_empresa, cliente, ofertas, random.Random(f'{semilla}-e{i}'), fin, iteraciones, pausa,
+        ))
+
+    async def fin_calentamiento():
+        await asyncio.sleep(calentamiento)
+        metricas.activas = True
+        return time.monotonic()
+
+    medicion = asyncio.ensure_future(fin_calentamiento()) if calentamiento > 0 else None
+    try:
+        recorridos = await asyncio.gather(*tareas)
+    finally:
+        await transporte.cerrar()
+    desde = medicion.result() if medicion and medicion.done() else inicio
+    if medicion and not medicion.done():
+        medicion.cancel()
+    return metricas, time.monotonic() - desde, sum(recorridos)
+
+
+def commit_actual():
+    try:
+        salida = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5, cwd=settings.BASE_DIR,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def informe(metricas, segundos, recorridos, parametros):
+    endpoints, total = metricas.resumen(segundos)
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_actual(),
+        'base_de_datos': connection.vendor,
+        'parametros': parametros,
+        'segundos': round(segundos, 2),
+        'recorridos': recorridos,
+        'total': total,
+        'endpoints': endpoints,
+    }
+
+
+def guardar(resultado, ruta):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+
+
+def comparar(anterior, actual, metrica='p95_ms'):
+    """[(endpoint, antes, ahora, cambio %)] para los endpoints presentes en ambas corridas."""
+    filas = []
+    for nombre, datos in actual['endpoints'].items():
+        previo = anterior.get('endpoints', {}).get(nombre)
+        if not previo or metrica not in previo:
+            continue
+        antes, ahora = previo[metrica], datos[metrica]
+        cambio = (ahora - antes) / antes * 100 if antes else None
+        filas.append((nombre, antes, ahora, cambio))
+    return filas
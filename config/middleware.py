@@ -0,0 +1,170 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+"""
+Instrumentación de SQL por petición.
+
+InstrumentacionSQLMiddleware engancha un `execute_wrapper` en cada conexión mientras
+dura la petición y registra el número de consultas, el tiempo total en BD y las
+consultas repetidas. Dos consultas con la misma "huella" (el SQL sin valores) que se
+repiten muchas veces en una misma petición son el síntoma típico de N+1: un FK que se
+carga perezosamente dentro de un bucle.
+
+El resultado va en cabeceras X-SQL-* de la respuesta y en una línea JSON del logger
+"config.sql" (nivel WARNING si se detectó N+1). Solo se instrumenta una fracción de
+las peticiones (SQL_MUESTREO), así puede quedar activo en producción. Las pruebas
+corren sin muestreo (config.testing.EjecutorPruebas).
+
+Settings:
+- SQL_MUESTREO: fracción de peticiones instrumentadas (por defecto 1.0 con DEBUG, 0.01 sin él).
+- SQL_UMBRAL_N_MAS_1: repeticiones de una misma huella para marcarla como N+1 (por defecto 10).
+- SQL_CABECERAS: si se agregan las cabeceras X-SQL-* (por defecto igual a DEBUG).
+"""
+
+logger = logging.getLogger('config.sql')
+
+UMBRAL_N_MAS_1 = 10
+MAX_HUELLAS_REPORTADAS = 3
+
+_LISTA_IN = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r'\s+')
+_TABLA = re.compile(r'\b(?:INTO|UPDATE|FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def huella(sql):
+    """SQL normalizado: sin valores literales y con las listas IN (...) colapsadas."""
+    sql = _LISTA_IN.sub('IN (...)', sql)
+    sql = _LITERALES.sub('?', sql)
+    return _ESPACIOS.sub(' ', sql).strip()
+
+
+def tabla_principal(sql):
+    """Tabla de la que lee o en la que escribe la consulta ('?' si no se reconoce)."""
+    coincidencia = _TABLA.search(sql)
+    return coincidencia.group(1) if coincidencia else '?'
+
+
+class RegistroConsultas:
+    """
+    Wrapper para `connection.execute_wrapper` que acumula las consultas ejecutadas.
+
+    También se usa fuera del middleware (p. ej. en las pruebas de presupuesto de
+    consultas) para saber qué consultas hizo un bloque de código.
+    """
+
+    def __init__(self):
+        self.consultas = []   # (sql, duración en segundos)
+        self.exactas = Counter()
+        self.huellas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((sql, time.perf_counter() - inicio))
+            self.huellas[huella(sql)] += 1
+            if not many:
+                self.exactas[(sql, _hashable(params))] += 1
+
+    def capturar(self, aliases=None):
+        """Context manager que registra las consultas de todas las conexiones."""
+        pila = ExitStack()
+        for alias in aliases or connections:
+            pila.enter_context(connections[alias].execute_wrapper(self))
+        return pila
+
+    @property
+    def total(self):
+        return len(self.consultas)
+
+    @property
+    def tiempo_ms(self):
+        return sum(duracion for _, duracion in self.consultas) * 1000
+
+    @property
+    def duplicadas(self):
+        """Ejecuciones sobrantes de consultas idénticas (mismo SQL y mismos parámetros)."""
+        return sum(veces - 1 for veces in self.exactas.values())
+
+    def n_mas_1(self, umbral=UMBRAL_N_MAS_1):
+        """
+        [(huella, veces, tabla)] de las consultas repetidas al menos `umbral` veces.
+
+        Los INSERT no cuentan: un bulk_create se parte en varios INSERT iguales por el
+        límite de parámetros del motor (en SQLite, uno cada pocas decenas de filas).
+        """
+        return [
+            (sql, veces, tabla_principal(sql))
+            for sql, veces in self.huellas.most_common()
+            if veces >= umbral and not sql.upper().startswith('INSERT')
+        ]
+
+
+def _hashable(params):
+    if isinstance(params, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(_hashable(p) for p in params)
+    try:
+        hash(params)
+    except TypeError:
+        return repr(params)
+    return params
+
+
+class InstrumentacionSQLMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.muestreo = getattr(settings, 'SQL_MUESTREO', 1.0 if settings.DEBUG else 0.01)
+        self.umbral = getattr(settings, 'SQL_UMBRAL_N_MAS_1', UMBRAL_N_MAS_1)
+        self.cabeceras = getattr(settings, 'SQL_CABECERAS', settings.DEBUG)
+
+    def __call__(self, request):
+        # Sin muestreo el costo es una llamada a random()
+        if self.muestreo <= 0 or random.random() >= self.muestreo:
+            return self.get_response(request)
+
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        with registro.capturar():
+            response = self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        sospechosas = registro.n_mas_1(self.umbral)
+        if self.cabeceras:
+            response['X-SQL-Queries'] = str(registro.total)
+            response['X-SQL-Time-Ms'] = f"{registro.tiempo_ms:.1f}"
+            response['X-SQL-Duplicates'] = str(registro.duplicadas)
+            if sospechosas:
+                response['X-SQL-N-Plus-1'] = ', '.join(
+                    f"{tabla}x{veces}" for _, veces, tabla in sospechosas[:MAX_HUELLAS_REPORTADAS]
+                )
+
+        match = getattr(request, 'resolver_match', None)
+        linea = {
+            'vista': match.view_name if match else None,
+            'metodo': request.method,
+            'ruta': request.path,
+            'estado': response.status_code,
+            'consultas': registro.total,
+            'tiempo_bd_ms': round(registro.tiempo_ms, 1),
+            'tiempo_total_ms': round(duracion_ms, 1),
+            'duplicadas': registro.duplicadas,
+            'n_mas_1': [
+                {'tabla': tabla, 'veces': veces, 'sql': sql[:300]}
+                for sql, veces, tabla in sospechosas[:MAX_HUELLAS_REPORTADAS]
+            ],
+        }
+        nivel = logging.WARNING if sospechosas else logging.INFO
+        logger.log(nivel, json.dumps(linea, ensure_ascii=False))
+        return response
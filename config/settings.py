@@ -47,6 +47,7 @@ AUTH_USER_MODEL = 'accounts.Usuario'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'config.middleware.InstrumentacionSQLMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -136,4 +137,49 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Instrumentación de SQL por petición (config/middleware.py)
+SQL_MUESTREO = 1.0 if DEBUG else 0.01
+SQL_UMBRAL_N_MAS_1 = 10
+SQL_CABECERAS = DEBUG
+
+# Las pruebas corren sin ese muestreo (config/testing.py)
+TEST_RUNNER = 'config.testing.EjecutorPruebas'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'config.sql': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Caché de páginas públicas para visitantes anónimos (jobs/caching.py). Sin
+# JOBS_CACHE_PAGINAS_ALIAS se guarda en memoria del proceso con límite en bytes (LRU);
+# con un alias de CACHES (p. ej. uno FileBasedCache) se comparte entre procesos.
+JOBS_CACHE_PAGINAS = True
+JOBS_CACHE_PAGINAS_TTL = 300
+JOBS_CACHE_PAGINAS_BYTES = 64 * 1024 * 1024
+JOBS_CACHE_PAGINAS_ALIAS = None
+
+# Autenticación: el usuario se carga con su perfil en una consulta (accounts/backends.py).
+# ModelBackend queda para las sesiones iniciadas antes del cambio.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.PerfilBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Segundos que el usuario con su perfil se guarda en la caché por defecto entre peticiones.
+# Solo con una caché compartida por todos los procesos (Redis, Memcached): con la
+# LocMemCache por defecto un logout, un cambio de contraseña o una desactivación solo
+# llegarían al proceso que los atendió. Lo mismo vale para SESSION_ENGINE = cached_db.
+ACCOUNTS_PERFIL_CACHE_TTL = 0
+
+# CV: tamaño máximo por archivo, comprobado mientras se recibe (accounts/uploads.py)
+CV_TAMANIO_MAXIMO = 5 * 1024 * 1024
+# Procesos que extraen el texto de los CV recién subidos (accounts/extraction.py); 0 lo desactiva
+CV_EXTRACCION_PROCESOS = 2
@@ -0,0 +1,263 @@
+import difflib
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+
+from config.middleware import RegistroConsultas, huella
+from jobs import caching
+from locations import hierarchy
+
+"""
+Utilidades para las pruebas de presupuesto de consultas (jobs, accounts y locations).
+
+Cada URL tiene un Caso con el máximo de consultas y de milisegundos que puede gastar
+sobre el conjunto de datos de `sembrar_datos`. Si una vista vuelve a cargar un FK dentro
+de un bucle (N+1), la prueba falla mostrando un diff entre las consultas distintas
+que se esperaban y las que realmente se ejecutaron (las repetidas aparecen con "+").
+"""
+
+# Presupuesto de tiempo por defecto; holgado para no depender de la máquina de CI
+TIEMPO_MAXIMO_MS = 1000
+
+# Tamaño del conjunto de datos: suficiente para que un N+1 se note en el conteo
+NUM_OFERTAS = 25
+NUM_CANDIDATOS = 30
+NUM_HABILIDADES = 12
+
+
+class EjecutorPruebas(DiscoverRunner):
+    """
+    TEST_RUNNER del proyecto: sin muestreo de SQL (config/middleware.py), que con DEBUG
+    escribiría una línea JSON por petición. Las pruebas del middleware lo activan con
+    override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._sin_muestreo = override_settings(SQL_MUESTREO=0)
+        self._sin_muestreo.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._sin_muestreo.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+@dataclass
+class Caso:
+    """
+    Una URL a medir. `kwargs`, `datos` y `query` pueden ser funciones que reciben el
+    conjunto de datos (útil para vistas que borran o modifican: crean su propio objeto).
+    """
+    url: str
+    max_consultas: int
+    usuario: Optional[str] = None          # 'empresa', 'candidato' o None (anónimo)
+    kwargs: Callable = None
+    metodo: str = 'get'
+    datos: Callable = None
+    query: str = ''                        # o función; entonces conviene dar `nombre`
+    max_ms: int = TIEMPO_MAXIMO_MS
+    # Consultas adicionales que solo existen en PostgreSQL (p. ej. vectores de búsqueda)
+    extra_postgresql: int = 0
+    estado: int = 200
+    nombre: str = field(default='')
+
+    def __post_init__(self):
+        self.nombre = self.nombre or self.url + (f'?{self.query}' if self.query and not callable(self.query) else '')
+
+
+def sembrar_datos():
+    """Crea un conjunto de datos representativo y devuelve sus objetos principales."""
+    from accounts.models import (
+        Candidato, CandidatoHabilidad, CandidatoIdioma, Educacion, Empresa, ExperienciaLaboral,
+        Habilidad, Idioma, Usuario,
+    )
+    from jobs.models import Categoria, OfertaEmpleo, OfertaHabilidad, OfertasGuardadas, Postulacion
+    from locations.models import Ciudad, Pais, Provincia
+
+    pais = Pais.objects.create(nombre='Ecuador', codigo_iso='EC')
+    provincias = [Provincia.objects.create(pais=pais, nombre=n) for n in ('Pichincha', 'Guayas', 'Azuay')]
+    ciudades = [
+        Ciudad.objects.create(provincia=provincia, nombre=f'Ciudad {i}')
+        for i, provincia in enumerate(provincias * 2)
+    ]
+    categorias = [Categoria.objects.create(nombre=n) for n in ('Tecnología', 'Ventas', 'Salud')]
+    habilidades = Habilidad.objects.bulk_create([Habilidad(nombre=f'Habilidad {i}') for i in range(NUM_HABILIDADES)])
+    idiomas = Idioma.objects.bulk_create([Idioma(nombre=n) for n in ('Inglés', 'Francés')])
+
+    usuario_empresa = Usuario.objects.create_user(
+        'empresa', 'empresa@ejemplo.com', 'clave-segura', tipo_usuario='empresa'
+    )
+    empresa = Empresa.objects.create(usuario=usuario_empresa, nombre_empresa='ACME', ciudad=ciudades[0])
+
+    ahora = timezone.now()
+    ofertas = [
+        OfertaEmpleo.objects.create(
+            empresa=empresa,
+            categoria=categorias[i % len(categorias)],
+            ciudad=ciudades[i % len(ciudades)],
+            titulo=f'Oferta {i}',
+            descripcion='Descripción de la oferta',
+            modalidad=('Remoto', 'Presencial', 'Híbrido')[i % 3],
+            salario_min=500 + 100 * i,
+            salario_max=900 + 100 * i,
+            fecha_publicacion=ahora - timedelta(hours=i),
+            estado='publicada',
+        )
+        for i in range(NUM_OFERTAS)
+    ]
+    OfertaHabilidad.objects.bulk_create([
+        OfertaHabilidad(oferta=oferta, habilidad=habilidades[(i + j) % NUM_HABILIDADES],
+                        nivel_requerido=('basico', 'intermedio', 'avanzado')[j], es_obligatorio=j == 0)
+        for i, oferta in enumerate(ofertas)
+        for j in range(3)
+    ])
+
+    candidatos = []
+    for i in range(NUM_CANDIDATOS):
+        usuario = Usuario.objects.create_user(
+            f'candidato{i}', f'candidato{i}@ejemplo.com', 'clave-segura', tipo_usuario='candidato'
+        )
+        candidatos.append(Candidato.objects.create(
+            usuario=usuario,
+            nombre_completo=f'Candidato {i}',
+            fecha_nacimiento=date(1990, 1, 1),
+            ciudad=ciudades[i % len(ciudades)],
+            salario_esperado=800 + 50 * i,
+            titulo_profesional='Desarrollador',
+        ))
+    CandidatoHabilidad.objects.bulk_create([
+        CandidatoHabilidad(candidato=candidato, habilidad=habilidades[(i + j) % NUM_HABILIDADES],
+                           nivel=('basico', 'intermedio', 'avanzado', 'experto')[(i + j) % 4], anios_experiencia=j + 1)
+        for i, candidato in enumerate(candidatos)
+        for j in range(4)
+    ])
+    CandidatoIdioma.objects.bulk_create([
+        CandidatoIdioma(candidato=candidato, idioma=idiomas[i % 2], nivel='B2')
+        for i, candidato in enumerate(candidatos)
+    ])
+
+    candidato = candidatos[0]
+    for i in range(3):
+        ExperienciaLaboral.objects.create(
+            candidato=candidato, empresa=f'Empresa {i}', cargo='Desarrollador',
+            fecha_inicio=date(2015 + i, 1, 1), fecha_fin=date(2016 + i, 1, 1),
+        )
+        Educacion.objects.create(
+            candidato=candidato, institucion=f'Universidad {i}', titulo='Ingeniería', nivel='Tercer Nivel',
+            fecha_inicio=date(2008 + i, 1, 1), estado='Graduado',
+        )
+
+    # Postulaciones por la vía normal (señales) para que contadores y facetas cuadren
+    for i, oferta in enumerate(ofertas[:10]):
+        for otro in candidatos[i:i + 10]:
+            Postulacion.objects.create(oferta=oferta, candidato=otro)
+    for oferta in ofertas[10:15]:
+        OfertasGuardadas.objects.create(candidato=candidato, oferta=oferta)
+
+    return SimpleNamespace(
+        pais=pais, provincias=provincias, ciudades=ciudades, categorias=categorias, habilidades=habilidades,
+        empresa=empresa, usuario_empresa=usuario_empresa, ofertas=ofertas, oferta=ofertas[0],
+        candidatos=candidatos, candidato=candidato, usuario_candidato=candidato.usuario,
+    )
+
+
+def nombres_de_urls(urlconf_module, namespace=None):
+    """Nombres ('jobs:lista_ofertas') de todas las URLs con nombre de un módulo de urls."""
+    nombres = set()
+    for patron in urlconf_module.urlpatterns:
+        if isinstance(patron, URLResolver):
+            continue
+        if isinstance(patron, URLPattern) and patron.name:
+            nombres.add(f'{namespace}:{patron.name}' if namespace else patron.name)
+    return nombres
+
+
+def diff_consultas(registro):
+    """Diff entre cada consulta distinta una sola vez y la secuencia real ejecutada."""
+    ejecutadas = [huella(sql) for sql, _ in registro.consultas]
+    esperadas = list(dict.fromkeys(ejecutadas))
+    return '\n'.join(difflib.unified_diff(
+        esperadas, ejecutadas, fromfile='consultas distintas', tofile='consultas ejecutadas', lineterm='', n=1,
+    ))
+
+
+class PresupuestoConsultasMixin:
+    """
+    Mezclar con TestCase. Define CASOS (lista de Caso) y URLCONF/NAMESPACE para
+    comprobar además que ninguna URL del módulo se quede sin presupuesto.
+    """
+
+    CASOS = []
+    URLCONF = None
+    NAMESPACE = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        super().setUp()
+        # El middleware de instrumentación no suma consultas, pero llenaría la salida de logs
+        sin_muestreo = override_settings(SQL_MUESTREO=0)
+        sin_muestreo.enable()
+        self.addCleanup(sin_muestreo.disable)
+
+    def medir(self, caso):
+        # Las cachés (tablero, ajuste de postulantes, páginas públicas, jerarquía de
+        # ubicaciones) cambian el número de consultas: cada caso se mide en frío
+        cache.clear()
+        caching.limpiar()
+        hierarchy.invalidar()
+        if caso.usuario == 'empresa':
+            self.client.force_login(self.datos.usuario_empresa)
+        elif caso.usuario == 'candidato':
+            self.client.force_login(self.datos.usuario_candidato)
+        else:
+            self.client.logout()
+
+        kwargs = caso.kwargs(self.datos) if caso.kwargs else {}
+        query = caso.query(self.datos) if callable(caso.query) else caso.query
+        url = reverse(caso.url, kwargs=kwargs) + (f'?{query}' if query else '')
+        datos = caso.datos(self.datos) if caso.datos else {}
+
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        with registro.capturar():
+            response = getattr(self.client, caso.metodo)(url, datos)
+        return response, registro, (time.perf_counter() - inicio) * 1000
+
+    def assertPresupuesto(self, caso):
+        response, registro, duracion_ms = self.medir(caso)
+        self.assertEqual(response.status_code, caso.estado, f"{caso.nombre}: estado inesperado")
+
+        maximo = caso.max_consultas
+        if connection.vendor == 'postgresql':
+            maximo += caso.extra_postgresql
+        if registro.total > maximo:
+            self.fail(
+                f"{caso.nombre}: {registro.total} consultas, presupuesto {maximo} "
+                f"(+{registro.total - maximo}).\n{diff_consultas(registro)}"
+            )
+        self.assertLessEqual(
+            duracion_ms, caso.max_ms, f"{caso.nombre}: {duracion_ms:.0f} ms, presupuesto {caso.max_ms} ms"
+        )
+
+    def test_presupuesto_de_consultas(self):
+        for caso in self.CASOS:
+            with self.subTest(caso.nombre):
+                self.assertPresupuesto(caso)
+
+    def test_todas_las_urls_tienen_presupuesto(self):
+        if self.URLCONF is None:
+            return
+        sin_caso = nombres_de_urls(self.URLCONF, self.NAMESPACE) - {caso.url for caso in self.CASOS}
+        self.assertFalse(sin_caso, f"URLs sin presupuesto de consultas: {sorted(sin_caso)}")
@@ -0,0 +1,99 @@
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from jobs.models import Categoria
+
+from .middleware import InstrumentacionSQLMiddleware, RegistroConsultas, huella, tabla_principal
+
+
+def _sin_bd(sql, params, many, context):
+    return None
+
+
+class HuellaSQLTests(SimpleTestCase):
+
+    def test_quita_literales_y_colapsa_listas_in(self):
+        self.assertEqual(
+            huella("SELECT  *\n FROM \"t\" WHERE a = 'x''y' AND b = 3.5 AND id IN (%s, %s, %s) LIMIT 21"),
+            'SELECT * FROM "t" WHERE a = ? AND b = ? AND id IN (...) LIMIT ?',
+        )
+        self.assertEqual(huella('SELECT 1 FROM t WHERE id IN (%s)'), huella('SELECT 2 FROM t WHERE id IN (%s, %s)'))
+        # Los números dentro de un identificador no son literales
+        self.assertEqual(huella('SELECT "t2"."c1" FROM "t2"'), 'SELECT "t2"."c1" FROM "t2"')
+
+    def test_tabla_principal(self):
+        for sql, tabla in (
+            ('SELECT "a"."id" FROM "jobs_ofertaempleo" "a"', 'jobs_ofertaempleo'),
+            ('INSERT INTO "jobs_postulacion" ("oferta_id") VALUES (%s)', 'jobs_postulacion'),
+            ('UPDATE "jobs_ofertaempleo" SET "num_postulaciones" = %s', 'jobs_ofertaempleo'),
+            ('DELETE FROM "jobs_ofertahabilidad" WHERE id = %s', 'jobs_ofertahabilidad'),
+            ('SAVEPOINT "s1"', '?'),
+        ):
+            with self.subTest(sql=sql):
+                self.assertEqual(tabla_principal(sql), tabla)
+
+    def test_n_mas_1_ignora_los_insert_de_un_bulk_create(self):
+        registro = RegistroConsultas()
+        for i in range(12):
+            registro(_sin_bd, 'SELECT "c"."nombre" FROM "jobs_categoria" "c" WHERE "c"."id" = %s', (i,), False, {})
+            registro(_sin_bd, 'INSERT INTO "jobs_ofertaempleo" ("titulo") VALUES (%s), (%s)', ('a', 'b'), False, {})
+        registro(_sin_bd, 'SELECT 1 FROM "jobs_categoria"', (), False, {})
+        registro(_sin_bd, 'SELECT 1 FROM "jobs_categoria"', (), False, {})
+
+        self.assertEqual(registro.total, 26)
+        self.assertEqual(registro.duplicadas, 11 + 1)
+        self.assertEqual([(veces, tabla) for _, veces, tabla in registro.n_mas_1()], [(12, 'jobs_categoria')])
+        self.assertEqual(registro.n_mas_1(umbral=13), [])
+
+
+@override_settings(SQL_MUESTREO=1.0, SQL_UMBRAL_N_MAS_1=5, SQL_CABECERAS=True)
+class InstrumentacionSQLMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categorias = [Categoria.objects.create(nombre=f'Categoría {i}') for i in range(6)]
+
+    def _llamar(self, vista):
+        middleware = InstrumentacionSQLMiddleware(vista)
+        with self.assertLogs('config.sql', 'INFO') as logs:
+            response = middleware(RequestFactory().get('/prueba/'))
+        self.assertEqual(len(logs.records), 1)
+        return response, logs.records[0]
+
+    def test_cabeceras_y_linea_de_log_con_n_mas_1(self):
+        def vista(request):
+            # Un FK cargado dentro de un bucle: una consulta por categoría
+            for categoria in self.categorias:
+                Categoria.objects.filter(pk=categoria.pk).first()
+            Categoria.objects.filter(pk=self.categorias[0].pk).first()
+            return HttpResponse('ok')
+
+        response, registro = self._llamar(vista)
+        self.assertEqual(response['X-SQL-Queries'], '7')
+        self.assertEqual(response['X-SQL-Duplicates'], '1')
+        self.assertEqual(response['X-SQL-N-Plus-1'], 'jobs_categoriax7')
+        self.assertIn('X-SQL-Time-Ms', response)
+
+        self.assertEqual(registro.levelname, 'WARNING')
+        linea = json.loads(registro.getMessage())
+        self.assertEqual((linea['consultas'], linea['duplicadas'], linea['estado']), (7, 1, 200))
+        self.assertEqual([(n['tabla'], n['veces']) for n in linea['n_mas_1']], [('jobs_categoria', 7)])
+
+    def test_bulk_create_en_lotes_no_es_n_mas_1(self):
+        def vista(request):
+            Categoria.objects.bulk_create([Categoria(nombre=f'Lote {i}') for i in range(6)], batch_size=1)
+            return HttpResponse('ok')
+
+        response, registro = self._llamar(vista)
+        self.assertNotIn('X-SQL-N-Plus-1', response)
+        self.assertEqual(registro.levelname, 'INFO')
+        self.assertGreaterEqual(int(response['X-SQL-Queries']), 6)
+
+    @override_settings(SQL_MUESTREO=0)
+    def test_sin_muestreo_no_instrumenta(self):
+        middleware = InstrumentacionSQLMiddleware(lambda request: HttpResponse('ok'))
+        with self.assertNoLogs('config.sql'):
+            response = middleware(RequestFactory().get('/prueba/'))
+        self.assertNotIn('X-SQL-Queries', response)
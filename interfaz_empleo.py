@@ -1,12 +1,265 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import customtkinter as ctk
 import psycopg
-from psycopg import Error
+from psycopg import Error, errors
+from psycopg_pool import ConnectionPool, PoolTimeout
 from tkinter import messagebox, ttk
 
 # CONFIGURACIÓN DE APARIENCIA
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+# Errores de tareas de fondo (sincronización, escucha de cambios) que no abren un diálogo
+logger = logging.getLogger("interfaz_empleo")
+
+# Cada cuánto (ms) revisa el hilo de Tk si el trabajador de BD dejó resultados
+INTERVALO_RESULTADOS_MS = 30
+
+# Filas que se piden por página al hacer scroll en la tabla
+FILAS_POR_PAGINA = 200
+# Fracción visible de la tabla a partir de la cual se pide la página siguiente
+UMBRAL_SCROLL = 0.9
+
+# Canal de NOTIFY de los triggers de accounts (migración accounts 0008)
+CANAL_CAMBIOS = "candidatos_cambios"
+# Espera (ms) para agrupar avisos seguidos en una sola consulta
+ESPERA_CAMBIOS_MS = 100
+
+# Columnas de la tabla (Treeview); el iid de cada fila es el id del usuario
+SQL_FILAS_TABLA = """
+    SELECT u.id, c.nombre_completo, c.numero_identificacion, c.titulo_profesional, u.email 
+    FROM accounts_usuario u JOIN accounts_candidato c ON u.id = c.usuario_id
+"""
+
+# Búsqueda de candidatos: espera tras la última tecla, mínimo de caracteres y tope de filas
+ESPERA_TECLEO_MS = 250
+MIN_CARACTERES_BUSQUEDA = 3
+MAX_RESULTADOS_BUSQUEDA = 50
+
+# Cada rama usa su índice de trigramas (migración accounts 0009) y trae como mucho
+# MAX_RESULTADOS_BUSQUEDA filas; luego se unen, se quedan con el mejor puntaje por
+# usuario y se cruzan con los datos de la tabla. Separar las ramas evita un OR entre
+# dos tablas, que no puede usar los índices.
+SQL_BUSCAR_CANDIDATOS = """
+    SELECT u.id, c.nombre_completo, c.numero_identificacion, c.titulo_profesional, u.email
+    FROM (
+        SELECT id, max(puntaje) AS puntaje FROM (
+            (SELECT usuario_id AS id, word_similarity(%(texto)s, nombre_completo) AS puntaje
+             FROM accounts_candidato
+             WHERE %(texto)s <%% nombre_completo OR nombre_completo ILIKE %(patron)s
+             ORDER BY puntaje DESC LIMIT %(limite)s)
+            UNION ALL
+            (SELECT usuario_id, word_similarity(%(texto)s, numero_identificacion)
+             FROM accounts_candidato
+             WHERE numero_identificacion ILIKE %(patron)s
+             ORDER BY 2 DESC LIMIT %(limite)s)
+            UNION ALL
+            (SELECT usuario_id, word_similarity(%(texto)s, titulo_profesional)
+             FROM accounts_candidato
+             WHERE %(texto)s <%% titulo_profesional OR titulo_profesional ILIKE %(patron)s
+             ORDER BY 2 DESC LIMIT %(limite)s)
+            UNION ALL
+            (SELECT id, word_similarity(%(texto)s, email)
+             FROM accounts_usuario
+             WHERE tipo_usuario = 'candidato' AND (%(texto)s <%% email OR email ILIKE %(patron)s)
+             ORDER BY 2 DESC LIMIT %(limite)s)
+        ) coincidencias
+        GROUP BY id
+    ) m
+    JOIN accounts_usuario u ON u.id = m.id
+    JOIN accounts_candidato c ON c.usuario_id = u.id
+    ORDER BY m.puntaje DESC, u.id
+    LIMIT %(limite)s
+"""
+
+
+class TrabajadorBD:
+    """
+    Ejecuta las consultas fuera del hilo de Tk.
+
+    Las tareas corren en un único hilo en segundo plano (en orden de llegada) con
+    conexiones prestadas por un pool pequeño, en lugar de abrir una conexión por
+    acción. Los resultados vuelven al hilo de Tk por una cola que la ventana revisa
+    con after(): los widgets solo se tocan desde el hilo principal.
+    """
+
+    def __init__(self, ventana, db_params, max_conexiones=3):
+        self.ventana = ventana
+        self.resultados = queue.Queue()
+        self.pool = ConnectionPool(
+            kwargs=db_params,
+            min_size=1,
+            max_size=max_conexiones,
+            timeout=10,
+            open=False,
+            name="job-connect",
+        )
+        # open(wait=False): la ventana aparece aunque la BD tarde en responder
+        self.pool.open(wait=False)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bd")
+        self.ventana.after(INTERVALO_RESULTADOS_MS, self._entregar_resultados)
+
+    def ejecutar(self, tarea, al_terminar=None, al_fallar=None):
+        """
+        Encola `tarea(conn)`. Al terminar llama en el hilo de Tk a `al_terminar(resultado)`
+        o a `al_fallar(error)`. La transacción se confirma si la tarea no lanza excepción.
+        """
+        def correr():
+            try:
+                with self.pool.connection() as conn:
+                    resultado = tarea(conn)
+            except Exception as e:
+                self.resultados.put((al_fallar, e))
+            else:
+                self.resultados.put((al_terminar, resultado))
+
+        return self.executor.submit(correr)
+
+    def entregar(self, callback, valor):
+        """Hace llegar `callback(valor)` al hilo de Tk desde cualquier otro hilo."""
+        self.resultados.put((callback, valor))
+
+    def _entregar_resultados(self):
+        try:
+            while True:
+                callback, valor = self.resultados.get_nowait()
+                if callback:
+                    callback(valor)
+        except queue.Empty:
+            pass
+        self.ventana.after(INTERVALO_RESULTADOS_MS, self._entregar_resultados)
+
+    def cerrar(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close(timeout=2)
+
+
+class BuscadorCandidatos:
+    """
+    Corre las búsquedas en su propio hilo y con su propia conexión, para poder cancelar
+    la consulta en curso (cancel_safe) sin afectar a las del pool. Solo se entrega el
+    resultado de la búsqueda más reciente.
+    """
+
+    def __init__(self, db_params, trabajador):
+        self.db_params = db_params
+        self.trabajador = trabajador
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="busqueda")
+        self.conn = None
+        self.en_curso = False
+        # `version` la escriben el hilo de Tk y la lee el de búsqueda: siempre bajo el lock
+        self.lock = threading.Lock()
+        self.version = 0
+
+    def nueva_version(self):
+        """Invalida las búsquedas anteriores: sus resultados ya no se entregan."""
+        with self.lock:
+            self.version += 1
+            return self.version
+
+    def vigente(self, version):
+        with self.lock:
+            return version == self.version
+
+    def buscar(self, texto, al_terminar, al_fallar):
+        version = self.nueva_version()
+        self.cancelar()
+        patron = "%" + texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        params = {"texto": texto, "patron": patron, "limite": MAX_RESULTADOS_BUSQUEDA}
+
+        def si_vigente(callback):
+            return lambda valor: callback(valor) if self.vigente(version) else None
+
+        def correr():
+            # Mientras esperaba en la cola llegó otra búsqueda: esta ya no hace falta
+            if not self.vigente(version): return
+            for intento in range(2):
+                try:
+                    if self.conn is None or self.conn.closed:
+                        self.conn = psycopg.connect(**self.db_params, autocommit=True,
+                                                    options="-c statement_timeout=5000")
+                    self.en_curso = True
+                    try:
+                        filas = self.conn.execute(SQL_BUSCAR_CANDIDATOS, params).fetchall()
+                    finally:
+                        self.en_curso = False
+                except errors.QueryCanceled:
+                    # Cancelada por una búsqueda nueva; si el aviso llegó tarde y cortó
+                    # a esta misma (que sigue vigente), se reintenta una vez
+                    if not self.vigente(version): return
+                    continue
+                except Error as e:
+                    self.trabajador.entregar(si_vigente(al_fallar), e)
+                    return
+                self.trabajador.entregar(si_vigente(al_terminar), filas)
+                return
+
+        self.executor.submit(correr)
+
+    def cancelar(self):
+        """Cancela en el servidor la búsqueda en curso, si hay una."""
+        conn = self.conn
+        if conn is not None and self.en_curso:
+            try:
+                conn.cancel_safe(timeout=1)
+            except Error:
+                pass
+
+    def cerrar(self):
+        self.nueva_version()
+        self.cancelar()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.conn is not None: self.conn.close()
+
+
+class EscuchaCambios(threading.Thread):
+    """
+    Hilo que hace LISTEN sobre CANAL_CAMBIOS con una conexión propia (fuera del pool,
+    porque queda ocupada mientras la app está abierta) y entrega cada aviso al hilo de
+    Tk. Si se pierde la conexión lo registra, avisa con `al_desconectar(espera)` y
+    reintenta con espera exponencial; al volver avisa con `al_reconectar`, ya que los
+    cambios ocurridos mientras tanto no se recibieron.
+    """
+
+    def __init__(self, db_params, trabajador, al_aviso, al_reconectar, al_desconectar):
+        super().__init__(name="escucha-cambios", daemon=True)
+        self.db_params = db_params
+        self.trabajador = trabajador
+        self.al_aviso = al_aviso
+        self.al_reconectar = al_reconectar
+        self.al_desconectar = al_desconectar
+        self.detenido = threading.Event()
+
+    def run(self):
+        espera, conectado_antes = 1, False
+        while not self.detenido.is_set():
+            try:
+                with psycopg.connect(**self.db_params, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CANAL_CAMBIOS}")
+                    if conectado_antes:
+                        logger.info("Escucha de cambios reconectada")
+                        self.trabajador.entregar(self.al_reconectar, None)
+                    conectado_antes, espera = True, 1
+                    while not self.detenido.is_set():
+                        for aviso in conn.notifies(timeout=1.0):
+                            self.trabajador.entregar(self.al_aviso, aviso.payload)
+            except Error as e:
+                if self.detenido.is_set(): return
+                logger.warning("Escucha de cambios desconectada, reintento en %s s: %s", espera, e)
+                self.trabajador.entregar(self.al_desconectar, espera)
+                # Aunque nunca haya conectado, al volver hay que recargar la tabla
+                conectado_antes = True
+                self.detenido.wait(espera)
+                espera = min(espera * 2, 30)
+
+    def detener(self):
+        self.detenido.set()
+
+
 class AppBolsaEmpleo(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -25,6 +278,10 @@ class AppBolsaEmpleo(ctk.CTk):
 
         self.selected_user_id = None  # Almacena el ID del usuario seleccionado para Modificar/Eliminar
 
+        # Pool de conexiones + hilo de trabajo: la interfaz no espera a la BD
+        self.bd = TrabajadorBD(self, self.db_params)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Layout Principal
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -33,6 +290,12 @@ class AppBolsaEmpleo(ctk.CTk):
         self.sidebar = ctk.CTkFrame(self, width=200, corner_radius=0)
         self.sidebar.grid(row=0, column=0, sticky="nsew")
         self.logo = ctk.CTkLabel(self.sidebar, text="JOB CONNECT", font=ctk.CTkFont(size=20, weight="bold")).pack(pady=30)
+        self.lbl_estado = ctk.CTkLabel(self.sidebar, text="", wraplength=180)
+        self.lbl_estado.pack(side="bottom", pady=20)
+        # Estado de la escucha de cambios; queda visible mientras esté caída
+        self.lbl_conexion = ctk.CTkLabel(self.sidebar, text="", wraplength=180, text_color="#ffc107")
+        self.lbl_conexion.pack(side="bottom")
+        self.tareas_pendientes = 0
 
         # Contenedor principal
         self.main_view = ctk.CTkScrollableFrame(self, corner_radius=15)
@@ -40,8 +303,33 @@ class AppBolsaEmpleo(ctk.CTk):
 
         self.init_ui()
 
-    def get_connection(self):
-        return psycopg.connect(**self.db_params)
+    def run_db(self, tarea, al_terminar=None, al_fallar=None, mensaje="Consultando..."):
+        """Envía `tarea(conn)` al hilo de BD y muestra el estado mientras corre."""
+        self.tareas_pendientes += 1
+        self.lbl_estado.configure(text=mensaje)
+
+        def terminar(callback):
+            def envoltura(valor):
+                self.tareas_pendientes -= 1
+                if not self.tareas_pendientes:
+                    self.lbl_estado.configure(text="")
+                if callback:
+                    callback(valor)
+            return envoltura
+
+        self.bd.ejecutar(tarea, terminar(al_terminar), terminar(al_fallar or self.show_db_error))
+
+    def show_db_error(self, error):
+        if isinstance(error, PoolTimeout):
+            messagebox.showerror("Error", "No hay conexión con la base de datos.")
+        else:
+            messagebox.showerror("Error", str(error))
+
+    def on_close(self):
+        self.cambios.detener()
+        self.buscador.cerrar()
+        self.bd.cerrar()
+        self.destroy()
 
     def init_ui(self):
         # Título
@@ -104,123 +392,288 @@ class AppBolsaEmpleo(ctk.CTk):
         style.configure("Treeview", background="#2b2b2b", foreground="white", fieldbackground="#2b2b2b", rowheight=25)
         style.map("Treeview", background=[('selected', '#1a73e8')])
 
-        self.tree = ttk.Treeview(table_frame, columns=("ID", "Nombre", "DNI", "Título", "Email"), show='headings')
+        self.tree = ttk.Treeview(table_frame, columns=("ID", "Nombre", "DNI", "Título", "Email"), show='headings', height=15)
         self.tree.heading("ID", text="ID"); self.tree.column("ID", width=40)
         self.tree.heading("Nombre", text="Nombre")
         self.tree.heading("DNI", text="Identificación")
         self.tree.heading("Título", text="Título")
         self.tree.heading("Email", text="Email")
         
+        # Búsqueda aproximada (pg_trgm) en el servidor mientras se escribe
+        self.entry_buscar = ctk.CTkEntry(table_frame, placeholder_text="Buscar por nombre, identificación, título o email...")
+        self.entry_buscar.pack(fill="x", padx=5, pady=5)
+        self.entry_buscar.bind("<KeyRelease>", self.on_search_key)
+        self.buscador = BuscadorCandidatos(self.db_params, self.bd)
+        self.search_after = None
+        self.search_active = False
+
+        # La tabla se llena por páginas: al acercarse al final del scroll se pide la siguiente
+        self.scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_item_select)
+
+        self.table_version = 0      # Cambia en cada recarga; descarta páginas de una carga anterior
+        self.last_loaded_id = 0     # Cursor (keyset): último u.id cargado
+        self.all_loaded = False
+        self.loading_page = False
+        self.refresh_table()
+
+        # Cambios hechos por otros operadores: llegan por NOTIFY y se aplican fila a fila
+        self.pending_changes = set()
+        self.cambios = EscuchaCambios(self.db_params, self.bd, self.on_db_notify,
+                                      self.on_db_reconnect, self.on_db_disconnect)
+        self.cambios.start()
+
+    def on_db_notify(self, payload):
+        """Aviso "<op>:<usuario_id>" de los triggers; las lecturas se agrupan en una consulta."""
+        try:
+            op, user_id = payload.split(":")
+            user_id = int(user_id)
+        except ValueError:
+            return
+        if op == "D":
+            self.pending_changes.discard(user_id)
+            self.remove_row(user_id)
+            return
+        if not self.pending_changes:
+            self.after(ESPERA_CAMBIOS_MS, self.flush_changes)
+        self.pending_changes.add(user_id)
+
+    def on_db_disconnect(self, espera):
+        self.lbl_conexion.configure(text=f"Sin avisos de cambios: reintentando en {espera} s")
+
+    def on_db_reconnect(self, _):
+        self.lbl_conexion.configure(text="")
+        # Los avisos perdidos mientras tanto no se recuperan: se recarga todo
         self.refresh_table()
 
+    def flush_changes(self):
+        ids, self.pending_changes = list(self.pending_changes), set()
+        if not ids: return
+
+        def consultar(conn):
+            return conn.execute(SQL_FILAS_TABLA + " WHERE u.id = ANY(%s)", (ids,)).fetchall()
+
+        def aplicar(filas):
+            for row in filas: self.apply_row(row)
+            # Sin fila: el usuario ya no tiene perfil de candidato
+            for user_id in set(ids) - {row[0] for row in filas}: self.remove_row(user_id)
+
+        def fallo(e):
+            # Sincronización en segundo plano: no interrumpe al operador con un diálogo
+            logger.warning("No se pudieron sincronizar los candidatos %s: %s", ids, e)
+
+        self.run_db(consultar, aplicar, fallo, mensaje="Sincronizando...")
+
     # --- LÓGICA CRUD ---
 
     def refresh_table(self):
-        for item in self.tree.get_children(): self.tree.delete(item)
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT u.id, c.nombre_completo, c.numero_identificacion, c.titulo_profesional, u.email 
-                FROM accounts_usuario u JOIN accounts_candidato c ON u.id = c.usuario_id
-            """)
-            for row in cur.fetchall(): self.tree.insert("", "end", values=row)
-            conn.close()
-        except Exception as e: print(f"Error: {e}")
+        """Vacía la tabla y vuelve a cargar desde la primera página."""
+        if self.search_active: return self.run_search()
+        self.table_version += 1
+        self.last_loaded_id = 0
+        self.all_loaded = False
+        self.loading_page = False
+        self.tree.delete(*self.tree.get_children())
+        self.load_next_page()
+
+    def load_next_page(self):
+        if self.loading_page or self.all_loaded: return
+        self.loading_page = True
+        version, desde = self.table_version, self.last_loaded_id
+
+        # Paginación por clave (u.id > último cargado): usa la PK y no recorre las filas ya vistas
+        def consultar(conn):
+            cur = conn.execute(SQL_FILAS_TABLA + " WHERE u.id > %s ORDER BY u.id LIMIT %s",
+                               (desde, FILAS_POR_PAGINA))
+            return cur.fetchall()
+
+        def mostrar(filas):
+            if version != self.table_version: return
+            self.loading_page = False
+            for row in filas:
+                if not self.tree.exists(str(row[0])):
+                    self.tree.insert("", "end", iid=str(row[0]), values=row)
+            if filas: self.last_loaded_id = filas[-1][0]
+            self.all_loaded = len(filas) < FILAS_POR_PAGINA
+
+        def fallo(e):
+            if version == self.table_version: self.loading_page = False
+            self.show_db_error(e)
+
+        self.run_db(consultar, mostrar, fallo, mensaje="Cargando candidatos...")
+
+    def on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= UMBRAL_SCROLL:
+            self.load_next_page()
+
+    def apply_row(self, row):
+        """Inserta o actualiza una sola fila de la tabla sin recargarla."""
+        iid = str(row[0])
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=row)
+        elif not self.search_active and (self.all_loaded or row[0] <= self.last_loaded_id):
+            # Si la fila cae dentro de lo ya cargado se ubica en orden; si no, llegará con su página
+            posicion = "end"
+            if row[0] < self.last_loaded_id:
+                for i, item in enumerate(self.tree.get_children()):
+                    if int(item) > row[0]:
+                        posicion = i
+                        break
+            self.tree.insert("", posicion, iid=iid, values=row)
+            if row[0] > self.last_loaded_id: self.last_loaded_id = row[0]
+
+    def on_search_key(self, event):
+        # Debounce: solo se busca cuando el usuario deja de teclear ESPERA_TECLEO_MS
+        if self.search_after: self.after_cancel(self.search_after)
+        self.search_after = self.after(ESPERA_TECLEO_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after = None
+        texto = self.entry_buscar.get().strip()
+        if not texto:
+            if self.search_active:
+                self.search_active = False
+                self.buscador.nueva_version()
+                self.buscador.cancelar()
+                self.refresh_table()
+            return
+        if len(texto) < MIN_CARACTERES_BUSQUEDA: return
+
+        self.search_active = True
+        self.lbl_estado.configure(text="Buscando...")
+
+        def mostrar(filas):
+            self.lbl_estado.configure(text=f"{len(filas)} resultado(s)")
+            # Descarta páginas del listado que aún estén en camino
+            self.table_version += 1
+            self.all_loaded, self.loading_page = True, False
+            self.tree.delete(*self.tree.get_children())
+            for row in filas: self.tree.insert("", "end", iid=str(row[0]), values=row)
+
+        self.buscador.buscar(texto, mostrar, self.show_db_error)
+
+    def remove_row(self, user_id):
+        iid = str(user_id)
+        if self.tree.exists(iid): self.tree.delete(iid)
 
     def on_item_select(self, event):
         selected = self.tree.focus()
         if not selected: return
-        data = self.tree.item(selected, 'values')
-        self.selected_user_id = data[0]
+        self.selected_user_id = user_id = int(selected)
 
         # Cargar datos detallados de la BD
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            cur.execute("""
+        def consultar(conn):
+            cur = conn.execute("""
                 SELECT c.nombre_completo, u.email, c.numero_identificacion, c.fecha_nacimiento, 
                        c.genero, c.titulo_profesional, c.telefono, c.salario_esperado, 
                        c.disponibilidad, c.linkedin_url, c.github_url
                 FROM accounts_usuario u JOIN accounts_candidato c ON u.id = c.usuario_id WHERE u.id = %s
-            """, (self.selected_user_id,))
-            res = cur.fetchone()
-            
+            """, (user_id,))
+            return cur.fetchone()
+
+        def mostrar(res):
+            # Si mientras tanto se eligió otra fila, esta respuesta ya no sirve
+            if res is None or self.selected_user_id != user_id: return
             self.clear_form(keep_id=True)
             self.entry_nombre.insert(0, res[0])
             self.entry_email.insert(0, res[1])
-            self.entry_dni.insert(0, res[2])
+            self.entry_dni.insert(0, res[2] or "")
             self.entry_nacimiento.insert(0, res[3])
-            self.combo_genero.set(res[4])
-            self.entry_titulo.insert(0, res[5])
+            self.combo_genero.set(res[4] or "")
+            self.entry_titulo.insert(0, res[5] or "")
             self.entry_telefono.insert(0, res[6] or "")
             self.entry_salario.insert(0, res[7] or "")
             self.entry_dispo.insert(0, res[8] or "")
             self.entry_linkedin.insert(0, res[9] or "")
             self.entry_github.insert(0, res[10] or "")
-            conn.close()
-        except Exception as e: print(e)
+
+        self.run_db(consultar, mostrar, mensaje="Cargando perfil...")
+
+    def form_values(self):
+        """Lee el formulario en el hilo de Tk; el hilo de BD solo recibe valores."""
+        return {
+            "nombre": self.entry_nombre.get(),
+            "email": self.entry_email.get(),
+            "password": self.entry_pass.get(),
+            "dni": self.entry_dni.get(),
+            "nacimiento": self.entry_nacimiento.get(),
+            "genero": self.combo_genero.get(),
+            "titulo": self.entry_titulo.get(),
+            "telefono": self.entry_telefono.get(),
+            "salario": self.entry_salario.get() or None,
+            "dispo": self.entry_dispo.get(),
+            "linkedin": self.entry_linkedin.get(),
+            "github": self.entry_github.get(),
+        }
 
     def create_record(self):
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            cur.execute("""
+        v = self.form_values()
+
+        def guardar(conn):
+            cur = conn.execute("""
                 INSERT INTO accounts_usuario (email, username, password, tipo_usuario, is_active, is_staff, is_superuser, date_joined) 
                 VALUES (%s, %s, %s, 'candidato', true, false, false, NOW()) RETURNING id
-            """, (self.entry_email.get(), self.entry_email.get(), self.entry_pass.get()))
+            """, (v["email"], v["email"], v["password"]))
             uid = cur.fetchone()[0]
             
-            cur.execute("""
+            conn.execute("""
                 INSERT INTO accounts_candidato (usuario_id, nombre_completo, numero_identificacion, fecha_nacimiento, 
                 genero, titulo_profesional, telefono, salario_esperado, disponibilidad, linkedin_url, github_url)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (uid, self.entry_nombre.get(), self.entry_dni.get(), self.entry_nacimiento.get(), 
-                  self.combo_genero.get(), self.entry_titulo.get(), self.entry_telefono.get(), 
-                  self.entry_salario.get() or None, self.entry_dispo.get(), self.entry_linkedin.get(), self.entry_github.get()))
-            
-            conn.commit()
+            """, (uid, v["nombre"], v["dni"], v["nacimiento"], v["genero"], v["titulo"], v["telefono"],
+                  v["salario"], v["dispo"], v["linkedin"], v["github"]))
+            return (uid, v["nombre"], v["dni"], v["titulo"], v["email"])
+
+        def listo(row):
             messagebox.showinfo("Éxito", "Candidato registrado")
-            self.refresh_table()
+            self.apply_row(row)
             self.clear_form()
-        except Exception as e: messagebox.showerror("Error", f"No se pudo guardar: {e}")
+
+        self.run_db(guardar, listo, lambda e: messagebox.showerror("Error", f"No se pudo guardar: {e}"),
+                    mensaje="Guardando...")
 
     def update_record(self):
         if not self.selected_user_id:
             messagebox.showwarning("Error", "Selecciona un registro de la tabla")
             return
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            cur.execute("UPDATE accounts_usuario SET email=%s, username=%s WHERE id=%s", 
-                        (self.entry_email.get(), self.entry_email.get(), self.selected_user_id))
-            cur.execute("""
+        v = self.form_values()
+        user_id = self.selected_user_id
+
+        def guardar(conn):
+            conn.execute("UPDATE accounts_usuario SET email=%s, username=%s WHERE id=%s", 
+                         (v["email"], v["email"], user_id))
+            conn.execute("""
                 UPDATE accounts_candidato SET nombre_completo=%s, numero_identificacion=%s, fecha_nacimiento=%s, 
                 genero=%s, titulo_profesional=%s, telefono=%s, salario_esperado=%s, disponibilidad=%s, 
                 linkedin_url=%s, github_url=%s WHERE usuario_id=%s
-            """, (self.entry_nombre.get(), self.entry_dni.get(), self.entry_nacimiento.get(), 
-                  self.combo_genero.get(), self.entry_titulo.get(), self.entry_telefono.get(), 
-                  self.entry_salario.get() or None, self.entry_dispo.get(), 
-                  self.entry_linkedin.get(), self.entry_github.get(), self.selected_user_id))
-            conn.commit()
+            """, (v["nombre"], v["dni"], v["nacimiento"], v["genero"], v["titulo"], v["telefono"],
+                  v["salario"], v["dispo"], v["linkedin"], v["github"], user_id))
+            return (user_id, v["nombre"], v["dni"], v["titulo"], v["email"])
+
+        def listo(row):
             messagebox.showinfo("Éxito", "Registro actualizado")
-            self.refresh_table()
-        except Exception as e: messagebox.showerror("Error", str(e))
+            self.apply_row(row)
+
+        self.run_db(guardar, listo, mensaje="Guardando...")
 
     def delete_record(self):
         if not self.selected_user_id: return
         if messagebox.askyesno("Confirmar", "¿Desea eliminar permanentemente este perfil?"):
-            try:
-                conn = self.get_connection()
-                cur = conn.cursor()
-                cur.execute("DELETE FROM accounts_candidato WHERE usuario_id=%s", (self.selected_user_id,))
-                cur.execute("DELETE FROM accounts_usuario WHERE id=%s", (self.selected_user_id,))
-                conn.commit()
-                self.refresh_table()
+            user_id = self.selected_user_id
+
+            def eliminar(conn):
+                conn.execute("DELETE FROM accounts_candidato WHERE usuario_id=%s", (user_id,))
+                conn.execute("DELETE FROM accounts_usuario WHERE id=%s", (user_id,))
+
+            def listo(_):
+                self.remove_row(user_id)
                 self.clear_form()
-            except Exception as e: messagebox.showerror("Error", str(e))
+
+            self.run_db(eliminar, listo, mensaje="Eliminando...")
 
     def clear_form(self, keep_id=False):
         if not keep_id: self.selected_user_id = None
@@ -230,5 +683,6 @@ class AppBolsaEmpleo(ctk.CTk):
             entry.delete(0, 'end')
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app = AppBolsaEmpleo()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,320 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+
+"""
+Caché versionada de las páginas públicas (lista_ofertas, detallar_oferta, perfil_publico_empresa).
+
+Se guarda la respuesta completa de los visitantes anónimos; los usuarios con sesión
+iniciada ven botones y datos propios y siempre pasan por la vista. La clave incluye
+números de versión que se guardan en la caché por defecto de Django:
+
+- versión global: la usan los listados; cambia con cualquier oferta, requisito o empresa.
+- versión por empresa: la usan el detalle de sus ofertas y su perfil público.
+
+Las señales (jobs/signals.py) incrementan las versiones en post_save/post_delete de
+OfertaEmpleo, OfertaHabilidad y Empresa; los procesos en bloque (importador, expirador,
+generador de datos) lo hacen a mano. Nunca se borra una entrada: al cambiar la versión
+la clave vieja deja de pedirse y la desaloja el LRU. Si una versión se pierde de la
+caché se reinicia en un número aleatorio, así nunca vuelve a coincidir con una clave
+anterior. Los nombres de catálogo (ciudad, habilidad) no versionan: se ven al vencer
+la entrada (JOBS_CACHE_PAGINAS_TTL).
+
+Almacenes:
+- CacheLRU (por defecto): memoria del proceso, acotada en bytes con desalojo LRU.
+- CacheCompartida: cualquier alias de CACHES (p. ej. FileBasedCache) con
+  JOBS_CACHE_PAGINAS_ALIAS.
+
+Ambos evitan la estampida (dogpile): cuando una entrada vence o cambia de versión, una
+sola petición la regenera; las demás sirven la copia vencida si existe o esperan a que
+termine, en lugar de renderizar la misma página 50 veces a la vez.
+
+Con varios procesos, la caché por defecto debe ser compartida (Redis, Memcached) para
+que todos vean los cambios de versión; con LocMemCache cada proceso ve solo los suyos
+y el resto se entera al vencer la entrada.
+"""
+
+TTL = 300
+MAX_BYTES = 64 * 1024 * 1024
+# Cuánto espera una petición a que otra termine de regenerar la misma entrada
+ESPERA_REGENERACION = 5.0
+# Las copias vencidas se conservan este múltiplo del TTL para servirlas mientras se regeneran
+MULTIPLO_RANCIO = 10
+CABECERA = 'X-Cache-Paginas'
+
+_GLOBAL = 'global'
+
+
+# --- Versiones ---
+
+def _clave_version(ambito):
+    return f"jobs:pagina:version:{ambito}"
+
+
+def ambito_empresa(empresa_id):
+    return f"empresa:{empresa_id}"
+
+
+def versiones(ambitos):
+    """Versión actual de cada ámbito, en una sola lectura de la caché."""
+    claves = [_clave_version(a) for a in ambitos]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, secrets.randbits(48), None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def incrementar(*ambitos):
+    for ambito in ambitos:
+        clave = _clave_version(ambito)
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.add(clave, secrets.randbits(48), None)
+
+
+def invalidar_empresas(empresa_ids=()):
+    """Invalida los listados y las páginas de las empresas indicadas."""
+    incrementar(_GLOBAL, *(ambito_empresa(e) for e in set(empresa_ids) if e is not None))
+
+
+# --- Almacenes ---
+
+class CacheLRU:
+    """Diccionario acotado en bytes, con vencimiento por entrada y desalojo LRU. Thread-safe."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._datos = OrderedDict()     # clave -> (valor, tamaño, vence, descarte)
+        self._lock = threading.Lock()
+        self._en_curso = {}             # clave -> threading.Event de quien la regenera
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._vigente(clave)
+            return entrada[0] if entrada else None
+
+    def _vigente(self, clave):
+        """Entrada (aunque esté vencida) mientras no pase su descarte; con el lock tomado."""
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            return None
+        if entrada[3] <= time.monotonic():
+            del self._datos[clave]
+            self.bytes -= entrada[1]
+            return None
+        self._datos.move_to_end(clave)
+        return entrada
+
+    def set(self, clave, valor, ttl, tamanio):
+        if tamanio > self.max_bytes:
+            return
+        with self._lock:
+            previa = self._datos.pop(clave, None)
+            if previa:
+                self.bytes -= previa[1]
+            vence = time.monotonic() + ttl
+            self._datos[clave] = (valor, tamanio, vence, vence + ttl * (MULTIPLO_RANCIO - 1))
+            self.bytes += tamanio
+            while self.bytes > self.max_bytes:
+                _, (_, liberado, _, _) = self._datos.popitem(last=False)
+                self.bytes -= liberado
+
+    def obtener_o_calcular(self, clave, calcular, ttl):
+        """
+        Devuelve (valor, origen) con origen 'hit', 'stale' o 'miss'. `calcular()`
+        devuelve (valor, tamaño) o None si el resultado no debe guardarse.
+        """
+        with self._lock:
+            entrada = self._vigente(clave)
+            if entrada is not None and entrada[2] > time.monotonic():
+                return entrada[0], 'hit'
+            evento = self._en_curso.get(clave)
+            propio = evento is None
+            if propio:
+                evento = self._en_curso[clave] = threading.Event()
+
+        if not propio:
+            if entrada is not None:
+                return entrada[0], 'stale'
+            evento.wait(ESPERA_REGENERACION)
+            valor = self.get(clave)
+            if valor is not None:
+                return valor, 'hit'
+            resultado = calcular()
+            return (resultado[0] if resultado else None), 'miss'
+
+        try:
+            resultado = calcular()
+            if resultado is None:
+                return None, 'miss'
+            valor, tamanio = resultado
+            self.set(clave, valor, ttl, tamanio)
+            return valor, 'miss'
+        finally:
+            with self._lock:
+                self._en_curso.pop(clave, None)
+            evento.set()
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self.bytes = 0
+
+
+class CacheCompartida:
+    """Sobre un alias de CACHES. El candado de regeneración es una clave creada con add()."""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def obtener_o_calcular(self, clave, calcular, ttl):
+        entrada = self.cache.get(clave)   # (valor, vence)
+        if entrada is not None and entrada[1] > time.time():
+            return entrada[0], 'hit'
+
+        candado = f"{clave}:regenerando"
+        if not self.cache.add(candado, 1, ESPERA_REGENERACION):
+            if entrada is not None:
+                return entrada[0], 'stale'
+            limite = time.monotonic() + ESPERA_REGENERACION
+            while time.monotonic() < limite:
+                time.sleep(0.05)
+                entrada = self.cache.get(clave)
+                if entrada is not None:
+                    return entrada[0], 'hit'
+            resultado = calcular()
+            return (resultado[0] if resultado else None), 'miss'
+
+        try:
+            resultado = calcular()
+            if resultado is None:
+                return None, 'miss'
+            self.cache.set(clave, (resultado[0], time.time() + ttl), ttl * MULTIPLO_RANCIO)
+            return resultado[0], 'miss'
+        finally:
+            self.cache.delete(candado)
+
+    def limpiar(self):
+        self.cache.clear()
+
+
+_almacen = None
+_almacen_lock = threading.Lock()
+
+
+def almacen():
+    global _almacen
+    if _almacen is None:
+        with _almacen_lock:
+            if _almacen is None:
+                alias = getattr(settings, 'JOBS_CACHE_PAGINAS_ALIAS', None)
+                _almacen = CacheCompartida(alias) if alias else CacheLRU(
+                    getattr(settings, 'JOBS_CACHE_PAGINAS_BYTES', MAX_BYTES)
+                )
+    return _almacen
+
+
+def limpiar():
+    almacen().limpiar()
+
+
+# --- Decorador de vistas ---
+
+def _es_cacheable(request):
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # Mensajes pendientes (p. ej. "sesión cerrada"): la página no es la misma para todos
+    return not len(get_messages(request))
+
+
+def _serializar(response):
+    cabeceras = list(response.items())
+    return (response.status_code, cabeceras, response.content), len(response.content) + 512
+
+
+def _respuesta(valor, origen):
+    estado, cabeceras, contenido = valor
+    response = HttpResponse(contenido, status=estado)
+    for nombre, contenido_cabecera in cabeceras:
+        response[nombre] = contenido_cabecera
+    response[CABECERA] = origen
+    return response
+
+
+def cache_publica(ambitos):
+    """
+    Cachea la respuesta de la vista para visitantes anónimos.
+
+    `ambitos(request, **kwargs)` devuelve la lista de ámbitos de versión de los que
+    depende la página (p. ej. ['global'] o ['empresa:7']) o None si no debe cachearse.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if not getattr(settings, 'JOBS_CACHE_PAGINAS', True) or not _es_cacheable(request):
+                return vista(request, *args, **kwargs)
+            dependencias = ambitos(request, **kwargs)
+            if dependencias is None:
+                return vista(request, *args, **kwargs)
+
+            consulta = '&'.join(sorted(request.GET.urlencode().split('&')))
+            version = '.'.join(str(v) for v in versiones(dependencias))
+            clave = 'jobs:pagina:' + hashlib.sha1(f"{request.path}?{consulta}|{version}".encode()).hexdigest()
+
+            generada = {}
+
+            def calcular():
+                response = vista(request, *args, **kwargs)
+                generada['response'] = response
+                # Solo respuestas 200 sin cookies propias ni token CSRF (que es por visitante)
+                if (response.status_code != 200 or response.cookies or response.streaming
+                        or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')):
+                    return None
+                return _serializar(response)
+
+            ttl = getattr(settings, 'JOBS_CACHE_PAGINAS_TTL', TTL)
+            valor, origen = almacen().obtener_o_calcular(clave, calcular, ttl)
+            if 'response' in generada:
+                generada['response'][CABECERA] = origen
+                return generada['response']
+            if valor is None:
+                return vista(request, *args, **kwargs)
+            return _respuesta(valor, origen)
+        return envoltura
+    return decorador
+
+
+# --- Ámbitos de las vistas públicas ---
+
+def ambitos_listado(request, **kwargs):
+    return [_GLOBAL]
+
+
+def ambitos_empresa(request, empresa_id, **kwargs):
+    return [ambito_empresa(empresa_id)]
+
+
+def ambitos_oferta(request, oferta_id, **kwargs):
+    """La empresa de la oferta no cambia: se recuerda en la caché por defecto sin vencimiento."""
+    from .models import OfertaEmpleo
+
+    clave = f"jobs:pagina:empresa_de_oferta:{oferta_id}"
+    empresa_id = cache.get(clave)
+    if empresa_id is None:
+        empresa_id = OfertaEmpleo.objects.filter(pk=oferta_id).values_list('empresa_id', flat=True).first()
+        if empresa_id is None:
+            return None
+        cache.set(clave, empresa_id, None)
+    return [ambito_empresa(empresa_id)]
@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+"""
+Contadores de postulaciones por oferta (counter cache).
+
+OfertaEmpleo guarda el total de postulaciones y el número por cada EstadoPostulacion
+en columnas propias. Las señales de Postulacion (jobs/signals.py) los ajustan con
+UPDATE ... SET campo = campo + 1 (F()), así dos postulaciones simultáneas nunca se
+pisan. Las restas se acotan en 0: si un contador se desvió, el CHECK de
+PositiveIntegerField haría fallar el borrado de la Postulacion. Los cambios hechos con
+QuerySet.update() o SQL directo no disparan señales: para esos casos está
+`python manage.py recalcular_contadores`.
+"""
+
+CAMPO_TOTAL = 'num_postulaciones'
+
+
+def campo_estado(estado):
+    return f'num_{estado}'
+
+
+def _campos_estado():
+    from .models import EstadoPostulacion
+    return [campo_estado(estado) for estado in EstadoPostulacion.values]
+
+
+def campos_contadores():
+    """Todas las columnas de contadores: el total y una por EstadoPostulacion."""
+    return frozenset([CAMPO_TOTAL, *_campos_estado()])
+
+
+def ajustar(oferta_id, delta_total=0, **deltas_estado):
+    """
+    Aplica deltas atómicos a los contadores de una oferta.
+
+    Ejemplo: ajustar(5, delta_total=1, pendiente=1) o ajustar(5, pendiente=-1, visto=1)
+    """
+    from .models import OfertaEmpleo
+
+    deltas = {CAMPO_TOTAL: delta_total}
+    deltas.update((campo_estado(estado), delta) for estado, delta in deltas_estado.items())
+    cambios = {}
+    for campo, delta in deltas.items():
+        if delta > 0:
+            cambios[campo] = F(campo) + delta
+        elif delta < 0:
+            cambios[campo] = Greatest(F(campo) + delta, 0)
+    if cambios:
+        OfertaEmpleo.objects.filter(pk=oferta_id).update(**cambios)
+
+
+def recalcular_contadores(oferta_ids=None, tamanio_lote=1000):
+    """
+    Recalcula los contadores desde Postulacion con una agregación por lote de ofertas.
+
+    Devuelve cuántas ofertas se procesaron.
+    """
+    from .models import EstadoPostulacion, OfertaEmpleo, Postulacion
+
+    ofertas = OfertaEmpleo.objects.order_by('pk')
+    if oferta_ids is not None:
+        ofertas = ofertas.filter(pk__in=list(oferta_ids))
+    ids = list(ofertas.values_list('pk', flat=True))
+    campos = [CAMPO_TOTAL] + _campos_estado()
+
+    agregados = {CAMPO_TOTAL: Count('id')}
+    for estado in EstadoPostulacion.values:
+        agregados[campo_estado(estado)] = Count('id', filter=Q(estado=estado))
+
+    for inicio in range(0, len(ids), tamanio_lote):
+        lote = ids[inicio:inicio + tamanio_lote]
+        conteos = {
+            fila.pop('oferta_id'): fila
+            for fila in Postulacion.objects.filter(oferta_id__in=lote)
+            .values('oferta_id').annotate(**agregados).order_by()
+        }
+        objetos = []
+        for pk in lote:
+            fila = conteos.get(pk, {})
+            objetos.append(OfertaEmpleo(pk=pk, **{campo: fila.get(campo, 0) for campo in campos}))
+        with transaction.atomic():
+            OfertaEmpleo.objects.bulk_update(objetos, campos)
+    return len(ids)
@@ -0,0 +1,67 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidar_empresas
+from .facets import CAMPOS_FACETAS, descontar_ofertas
+
+"""
+Expiración de ofertas vencidas.
+
+Pasa a 'expirada' las ofertas publicadas cuya fecha_expiracion ya pasó, en lotes
+acotados. Cada lote se toma con SELECT ... FOR UPDATE SKIP LOCKED (en PostgreSQL), de
+modo que varios nodos pueden ejecutar el expirador a la vez sin bloquearse ni expirar
+dos veces la misma oferta. El recorrido usa el índice parcial oferta_publicada_expira_idx.
+
+Como el cambio se hace con QuerySet.update() (sin señales), aquí mismo se descuentan
+las facetas de las ofertas expiradas y se invalidan sus páginas en caché (jobs.caching).
+"""
+
+logger = logging.getLogger(__name__)
+
+TAMANIO_LOTE = 500
+
+
+def expirar_lote(ahora=None, tamanio_lote=TAMANIO_LOTE):
+    """Expira como máximo `tamanio_lote` ofertas vencidas. Devuelve cuántas cambió."""
+    from .models import EstadoOferta, OfertaEmpleo
+
+    ahora = ahora or timezone.now()
+    with transaction.atomic():
+        vencidas = (
+            OfertaEmpleo.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(estado=EstadoOferta.PUBLICADA, fecha_expiracion__isnull=False, fecha_expiracion__lte=ahora)
+            .order_by('fecha_expiracion')
+            .values_list('pk', flat=True)[:tamanio_lote]
+        )
+        ids = list(vencidas)
+        if not ids:
+            return 0
+
+        datos = list(OfertaEmpleo.objects.filter(pk__in=ids).values(*CAMPOS_FACETAS, 'empresa_id'))
+        cambiadas = OfertaEmpleo.objects.filter(pk__in=ids, estado=EstadoOferta.PUBLICADA).update(
+            estado=EstadoOferta.EXPIRADA
+        )
+        descontar_ofertas(datos)
+    invalidar_empresas(fila['empresa_id'] for fila in datos)
+    return cambiadas
+
+
+def expirar_vencidas(ahora=None, tamanio_lote=TAMANIO_LOTE, max_lotes=None):
+    """
+    Ejecuta lotes hasta que no queden ofertas vencidas (o hasta `max_lotes`).
+
+    Devuelve (ofertas_expiradas, lotes_ejecutados).
+    """
+    ahora = ahora or timezone.now()
+    total, lotes = 0, 0
+    while max_lotes is None or lotes < max_lotes:
+        cambiadas = expirar_lote(ahora, tamanio_lote)
+        if not cambiadas:
+            break
+        total += cambiadas
+        lotes += 1
+        logger.debug("Lote %s: %s ofertas expiradas", lotes, cambiadas)
+    return total, lotes
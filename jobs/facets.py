@@ -0,0 +1,277 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+
+"""
+Facetas del listado público de ofertas.
+
+Los conteos por faceta ("Remoto (1,204)") viven precalculados en FacetaConteo y se
+ajustan con deltas +1/-1 desde las señales de OfertaEmpleo (ver jobs/signals.py),
+así la vista solo lee esa tabla y nunca ejecuta un GROUP BY por faceta.
+
+El delta sale de comparar la fila antes y después del guardado. OfertaEmpleo.save
+guarda dentro de una transacción y la señal pre_save lee la fila con FOR UPDATE, así
+dos ediciones simultáneas de la misma oferta se serializan y no aplican dos veces el
+mismo cambio (en SQLite no hay FOR UPDATE, pero las escrituras ya son exclusivas).
+
+Si los conteos se desincronizan (cargas masivas con SQL, cambios de catálogo) se
+reconstruyen con `python manage.py recalcular_facetas`.
+"""
+
+FACETAS = ('categoria', 'pais', 'provincia', 'ciudad', 'tipo_contrato', 'modalidad', 'rango_salario')
+
+TITULOS_FACETAS = {
+    'categoria': 'Categoría',
+    'pais': 'País',
+    'provincia': 'Provincia',
+    'ciudad': 'Ciudad',
+    'tipo_contrato': 'Tipo de contrato',
+    'modalidad': 'Modalidad',
+    'rango_salario': 'Salario',
+}
+
+# Tramos de salario (desde, hasta); None = sin límite superior
+RANGOS_SALARIO = (
+    (0, 500),
+    (500, 1000),
+    (1000, 2000),
+    (2000, 3000),
+    (3000, None),
+)
+
+MAX_VALORES_POR_FACETA = 10
+
+
+def rango_salario(salario_min, salario_max):
+    """Devuelve la clave del tramo ('1000-2000', '3000-') o None si no hay salario."""
+    referencia = salario_max if salario_max is not None else salario_min
+    if referencia is None:
+        return None
+    for desde, hasta in RANGOS_SALARIO:
+        if referencia >= desde and (hasta is None or referencia < hasta):
+            return f"{desde}-{hasta or ''}"
+    return None
+
+
+def etiqueta_rango(clave):
+    desde, hasta = clave.split('-')
+    if not hasta:
+        return f"Más de ${int(desde):,}"
+    return f"${int(desde):,} - ${int(hasta):,}"
+
+
+def facetas_de_oferta(datos):
+    """
+    Calcula {(faceta, valor): etiqueta} para una oferta publicada.
+
+    `datos` es un dict con los campos de la oferta y de su ubicación, tal como lo
+    devuelve `datos_facetas`.
+    """
+    from .models import TipoContrato
+
+    resultado = {}
+    if datos.get('categoria_id'):
+        resultado[('categoria', str(datos['categoria_id']))] = datos['categoria__nombre']
+    if datos.get('ciudad_id'):
+        resultado[('ciudad', str(datos['ciudad_id']))] = datos['ciudad__nombre']
+        resultado[('provincia', str(datos['ciudad__provincia_id']))] = datos['ciudad__provincia__nombre']
+        resultado[('pais', str(datos['ciudad__provincia__pais_id']))] = datos['ciudad__provincia__pais__nombre']
+    if datos.get('tipo_contrato'):
+        etiquetas = dict(TipoContrato.choices)
+        resultado[('tipo_contrato', datos['tipo_contrato'])] = str(
+            etiquetas.get(datos['tipo_contrato'], datos['tipo_contrato'])
+        )
+    modalidad = (datos.get('modalidad') or '').strip()
+    if modalidad:
+        resultado[('modalidad', modalidad.lower()[:100])] = modalidad.capitalize()
+    rango = rango_salario(datos.get('salario_min'), datos.get('salario_max'))
+    if rango:
+        resultado[('rango_salario', rango)] = etiqueta_rango(rango)
+    return resultado
+
+
+CAMPOS_FACETAS = (
+    'estado', 'categoria_id', 'categoria__nombre', 'ciudad_id', 'ciudad__nombre',
+    'ciudad__provincia_id', 'ciudad__provincia__nombre',
+    'ciudad__provincia__pais_id', 'ciudad__provincia__pais__nombre',
+    'tipo_contrato', 'modalidad', 'salario_min', 'salario_max',
+)
+
+
+def datos_facetas(oferta_id, bloquear=False):
+    """
+    Lee de la BD (una consulta) los campos que definen las facetas de una oferta.
+
+    Con `bloquear` la fila de la oferta queda con FOR UPDATE hasta el fin de la
+    transacción (solo la oferta: las demás tablas van por LEFT JOIN).
+    """
+    from .models import OfertaEmpleo
+    ofertas = OfertaEmpleo.objects.filter(pk=oferta_id)
+    if bloquear:
+        ofertas = ofertas.select_for_update(of=('self',))
+    return ofertas.values(*CAMPOS_FACETAS).first()
+
+
+def facetas_publicadas(datos):
+    """Facetas que aporta la oferta al conteo; vacío si no está publicada."""
+    from .models import EstadoOferta
+    if not datos or datos.get('estado') != EstadoOferta.PUBLICADA:
+        return {}
+    return facetas_de_oferta(datos)
+
+
+def aplicar_cambio(anteriores, nuevas):
+    """Ajusta los conteos con la diferencia entre dos conjuntos de facetas."""
+    deltas = {clave: (-1, anteriores[clave]) for clave in anteriores.keys() - nuevas.keys()}
+    deltas.update({clave: (1, nuevas[clave]) for clave in nuevas.keys() - anteriores.keys()})
+    aplicar_deltas(deltas)
+
+
+def descontar_ofertas(filas):
+    """
+    Resta del conteo un lote de ofertas que dejan de estar publicadas.
+
+    `filas` son dicts con CAMPOS_FACETAS leídos antes del cambio de estado. Se agrupan
+    para ejecutar un UPDATE por valor de faceta y no uno por oferta.
+    """
+    aplicar_deltas(_deltas_lote(filas, -1))
+
+
+def sumar_ofertas(filas):
+    """Suma al conteo un lote de ofertas nuevas (p. ej. de una importación masiva)."""
+    aplicar_deltas(_deltas_lote(filas, 1))
+
+
+def _deltas_lote(filas, signo):
+    deltas = {}
+    for datos in filas:
+        for clave, etiqueta in facetas_publicadas(datos).items():
+            delta, _ = deltas.get(clave, (0, etiqueta))
+            deltas[clave] = (delta + signo, etiqueta)
+    return deltas
+
+
+def aplicar_deltas(deltas):
+    """Aplica {(faceta, valor): (delta, etiqueta)} con UPDATE ... SET total = total + delta."""
+    from .models import FacetaConteo
+
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        for (faceta, valor), (delta, etiqueta) in deltas.items():
+            actualizadas = FacetaConteo.objects.filter(faceta=faceta, valor=valor).update(
+                total=F('total') + delta
+            )
+            if actualizadas or delta <= 0:
+                continue
+            try:
+                with transaction.atomic():
+                    FacetaConteo.objects.create(faceta=faceta, valor=valor, etiqueta=etiqueta, total=delta)
+            except IntegrityError:
+                # Otro proceso creó la fila entre el UPDATE y el INSERT
+                FacetaConteo.objects.filter(faceta=faceta, valor=valor).update(total=F('total') + delta)
+
+
+def recalcular_facetas():
+    """Reconstruye la tabla de conteos desde cero recorriendo las ofertas publicadas."""
+    from .models import EstadoOferta, FacetaConteo, OfertaEmpleo
+
+    conteos = {}
+    publicadas = OfertaEmpleo.objects.filter(estado=EstadoOferta.PUBLICADA).values(*CAMPOS_FACETAS)
+    for datos in publicadas.iterator(chunk_size=2000):
+        for clave, etiqueta in facetas_de_oferta(datos).items():
+            total, _ = conteos.get(clave, (0, etiqueta))
+            conteos[clave] = (total + 1, etiqueta)
+
+    with transaction.atomic():
+        FacetaConteo.objects.all().delete()
+        FacetaConteo.objects.bulk_create(
+            [
+                FacetaConteo(faceta=faceta, valor=valor, etiqueta=etiqueta, total=total)
+                for (faceta, valor), (total, etiqueta) in conteos.items()
+            ],
+            batch_size=1000,
+        )
+    return len(conteos)
+
+
+def leer_facetas(seleccion=None):
+    """
+    Devuelve la lista de facetas para la plantilla: [(faceta, titulo, [FacetaConteo])].
+
+    Una sola consulta sobre la tabla de conteos. Los valores seleccionados se marcan
+    con el atributo `activo`.
+    """
+    from .models import FacetaConteo
+
+    seleccion = seleccion or {}
+    agrupadas = {faceta: [] for faceta in FACETAS}
+    for conteo in FacetaConteo.objects.filter(total__gt=0).order_by('faceta', '-total', 'etiqueta'):
+        valores = agrupadas.get(conteo.faceta)
+        if valores is None:
+            continue
+        conteo.activo = seleccion.get(conteo.faceta) == conteo.valor
+        if len(valores) < MAX_VALORES_POR_FACETA or conteo.activo:
+            valores.append(conteo)
+    return [(faceta, TITULOS_FACETAS[faceta], agrupadas[faceta]) for faceta in FACETAS if agrupadas[faceta]]
+
+
+def enlazar_facetas(facetas, params):
+    """Asigna a cada valor el querystring que activa (o quita, si ya está activo) su filtro."""
+    for faceta, _, valores in facetas:
+        for conteo in valores:
+            nuevos = params.copy()
+            for param in ('cursor', 'page', faceta):
+                nuevos.pop(param, None)
+            if not conteo.activo:
+                nuevos[faceta] = conteo.valor
+            conteo.querystring = nuevos.urlencode()
+    return facetas
+
+
+def leer_seleccion(params):
+    """Extrae de request.GET los filtros de faceta válidos."""
+    return {faceta: params[faceta] for faceta in FACETAS if params.get(faceta)}
+
+
+def filtrar_por_facetas(queryset, seleccion):
+    """Aplica al queryset de ofertas los filtros de faceta seleccionados."""
+    if 'categoria' in seleccion:
+        queryset = queryset.filter(categoria_id=_entero(seleccion['categoria']))
+    if 'ciudad' in seleccion:
+        queryset = queryset.filter(ciudad_id=_entero(seleccion['ciudad']))
+    if 'provincia' in seleccion:
+        queryset = queryset.filter(ciudad__provincia_id=_entero(seleccion['provincia']))
+    if 'pais' in seleccion:
+        queryset = queryset.filter(ciudad__provincia__pais_id=_entero(seleccion['pais']))
+    if 'tipo_contrato' in seleccion:
+        queryset = queryset.filter(tipo_contrato=seleccion['tipo_contrato'])
+    if 'modalidad' in seleccion:
+        queryset = queryset.filter(modalidad__iexact=seleccion['modalidad'])
+    if 'rango_salario' in seleccion:
+        queryset = _filtrar_rango(queryset, seleccion['rango_salario'])
+    return queryset
+
+
+def _entero(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _filtrar_rango(queryset, clave):
+    try:
+        desde, hasta = clave.split('-')
+        desde = Decimal(desde)
+        hasta = Decimal(hasta) if hasta else None
+    except (ValueError, ArithmeticError):
+        return queryset.none()
+    queryset = queryset.annotate(salario_referencia=Coalesce('salario_max', 'salario_min'))
+    condicion = Q(salario_referencia__gte=desde)
+    if hasta is not None:
+        condicion &= Q(salario_referencia__lt=hasta)
+    return queryset.filter(condicion)
@@ -1,5 +1,9 @@
 from django import forms
-from .models import Empresa, OfertaEmpleo, OfertaHabilidad
+from .models import Empresa, EstadoOferta, OfertaEmpleo, OfertaHabilidad
+from accounts.models import Habilidad, Idioma, NivelHabilidad
+from accounts.search import NIVELES_IDIOMA, FiltrosTalento
+from locations import geo
+from locations.widgets import CiudadAutocomplete
 
 class EmpresaForm(forms.ModelForm):
     class Meta:
@@ -12,7 +16,7 @@ class EmpresaForm(forms.ModelForm):
             'descripcion': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
             'nombre_empresa': forms.TextInput(attrs={'class': 'form-control'}),
             'sector': forms.TextInput(attrs={'class': 'form-control'}),
-            'ciudad': forms.Select(attrs={'class': 'form-control'}),
+            'ciudad': CiudadAutocomplete(),
             'direccion_detalle': forms.TextInput(attrs={'class': 'form-control'}),
             'sitio_web': forms.URLInput(attrs={'class': 'form-control'}),
             'telefono': forms.TextInput(attrs={'class': 'form-control'}),
@@ -30,7 +34,7 @@ class OfertaEmpleoForm(forms.ModelForm):
         widgets = {
             'titulo': forms.TextInput(attrs={'class': 'form-control'}),
             'categoria': forms.Select(attrs={'class': 'form-control'}),
-            'ciudad': forms.Select(attrs={'class': 'form-control'}),
+            'ciudad': CiudadAutocomplete(),
             'descripcion': forms.Textarea(attrs={'class': 'form-control', 'rows': 5}),
             'tipo_contrato': forms.Select(attrs={'class': 'form-control'}),
             'modalidad': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ej: Híbrido 2 días'}),
@@ -48,4 +52,116 @@ class OfertaHabilidadForm(forms.ModelForm):
             'habilidad': forms.Select(attrs={'class': 'form-control'}),
             'nivel_requerido': forms.Select(attrs={'class': 'form-control'}),
             'es_obligatorio': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-        }
\ No newline at end of file
+        }
+
+class ImportarOfertasForm(forms.Form):
+    archivo = forms.FileField(
+        help_text="CSV con encabezado o JSONL (un objeto por línea).",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.ndjson,.json'}),
+    )
+    estado = forms.ChoiceField(
+        choices=EstadoOferta.choices,
+        initial=EstadoOferta.BORRADOR,
+        help_text="Estado de las ofertas que no indican uno.",
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+
+    def clean_archivo(self):
+        archivo = self.cleaned_data['archivo']
+        if not archivo.name.lower().endswith(('.csv', '.jsonl', '.ndjson', '.json')):
+            raise forms.ValidationError("El archivo debe ser .csv o .jsonl.")
+        return archivo
+
+
+class BusquedaRadioForm(forms.Form):
+    """Filtro "a menos de N km de una ciudad" (locations.geo)."""
+    cerca = forms.IntegerField(required=False, label="Cerca de", widget=CiudadAutocomplete())
+    radio = forms.TypedChoiceField(
+        required=False, coerce=int, empty_value=geo.RADIO_POR_DEFECTO_KM, label="Radio",
+        choices=[(r, f"{r} km") for r in geo.RADIOS_KM],
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+
+    def distancias(self, ciudad_defecto=None):
+        """
+        {ciudad_id: km} dentro del radio; None si no se pidió una búsqueda por radio.
+        Si la ciudad no tiene coordenadas se agrega un error al formulario y se devuelve {}.
+        """
+        if not self.is_valid():
+            return None
+        ciudad_id = self.cleaned_data['cerca'] or ciudad_defecto
+        if not ciudad_id or (not self.cleaned_data['cerca'] and not self.data.get('radio')):
+            return None
+        distancias = geo.ciudades_cerca_de(ciudad_id, self.cleaned_data['radio'])
+        if distancias is None:
+            self.add_error(None, "La ciudad elegida no tiene coordenadas: no se puede buscar por distancia.")
+            return {}
+        return distancias
+
+
+class BusquedaTalentoForm(BusquedaRadioForm):
+    """Búsqueda de candidatos para empresas (accounts.search), con el filtro por radio."""
+    FILAS_HABILIDAD = 3
+
+    q = forms.CharField(required=False, label="Texto", widget=forms.TextInput(
+        attrs={'class': 'form-control', 'placeholder': 'Título, resumen, experiencia o CV'}
+    ))
+    idioma = forms.TypedChoiceField(required=False, coerce=int, empty_value=None, label="Idioma",
+                                    widget=forms.Select(attrs={'class': 'form-control'}))
+    nivel_idioma = forms.ChoiceField(
+        required=False, label="Nivel mínimo", choices=[('', 'Cualquier nivel')] + [(n, n) for n in NIVELES_IDIOMA],
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    salario_min = forms.DecimalField(required=False, min_value=0, label="Salario desde",
+                                     widget=forms.NumberInput(attrs={'class': 'form-control'}))
+    salario_max = forms.DecimalField(required=False, min_value=0, label="Salario hasta",
+                                     widget=forms.NumberInput(attrs={'class': 'form-control'}))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Una consulta por catálogo, compartida por todas las filas de habilidad
+        habilidades = [('', 'Habilidad')] + list(Habilidad.objects.order_by('nombre').values_list('id', 'nombre'))
+        for i in range(1, self.FILAS_HABILIDAD + 1):
+            self.fields[f'habilidad_{i}'] = forms.TypedChoiceField(
+                required=False, coerce=int, empty_value=None, choices=habilidades,
+                widget=forms.Select(attrs={'class': 'form-control'}),
+            )
+            self.fields[f'nivel_{i}'] = forms.ChoiceField(
+                required=False, choices=[('', 'Cualquier nivel')] + NivelHabilidad.choices,
+                widget=forms.Select(attrs={'class': 'form-control'}),
+            )
+            self.fields[f'anios_{i}'] = forms.IntegerField(
+                required=False, min_value=0, widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Años mín.'}),
+            )
+        self.fields['idioma'].choices = [('', 'Cualquier idioma')] + list(
+            Idioma.objects.order_by('nombre').values_list('id', 'nombre')
+        )
+
+    def clean(self):
+        datos = super().clean()
+        if (datos.get('salario_min') is not None and datos.get('salario_max') is not None
+                and datos['salario_min'] > datos['salario_max']):
+            self.add_error('salario_max', "Debe ser mayor o igual que el salario desde.")
+        return datos
+
+    def filas_habilidad(self):
+        """[(habilidad, nivel, años)] de campos enlazados, para la plantilla."""
+        return [
+            (self[f'habilidad_{i}'], self[f'nivel_{i}'], self[f'anios_{i}'])
+            for i in range(1, self.FILAS_HABILIDAD + 1)
+        ]
+
+    def filtros(self):
+        """FiltrosTalento con lo elegido; None si el formulario no es válido."""
+        if not self.is_valid():
+            return None
+        datos = self.cleaned_data
+        return FiltrosTalento(
+            habilidades=[
+                (datos[f'habilidad_{i}'], datos[f'nivel_{i}'], datos[f'anios_{i}'])
+                for i in range(1, self.FILAS_HABILIDAD + 1) if datos[f'habilidad_{i}']
+            ],
+            idioma=(datos['idioma'], datos['nivel_idioma']) if datos['idioma'] else None,
+            distancias=self.distancias(),
+            salario_min=datos['salario_min'], salario_max=datos['salario_max'], texto=datos['q'].strip(),
+        )
@@ -0,0 +1,415 @@
+import csv
+import json
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .facets import CAMPOS_FACETAS, sumar_ofertas
+from .search import actualizar_vectores
+from .caching import invalidar_empresas
+
+"""
+Importación masiva de ofertas (CSV o JSONL) con sus habilidades requeridas.
+
+La usan el comando `importar_ofertas` y la vista `importar_ofertas` del panel de empresa.
+
+- El archivo se lee fila a fila y se inserta en lotes con bulk_create, así la memoria
+  no depende del tamaño del archivo. Se usa bulk_create y no COPY porque hacen falta
+  los ids generados para insertar las OfertaHabilidad del mismo lote (en PostgreSQL es
+  un INSERT ... RETURNING por lote).
+- Categoria, Ciudad y Habilidad se resuelven con diccionarios cargados una sola vez;
+  las habilidades que no existen se crean al guardar cada lote.
+- Cada fila inválida se reporta con su número y el motivo, sin detener la importación.
+  Si el archivo deja de poder leerse (no es UTF-8, encabezado CSV ilegible) se guarda
+  lo leído hasta ahí y el fallo queda como un error más del resultado.
+- bulk_create no dispara señales: aquí mismo se suman las facetas y se calculan los
+  vectores de búsqueda de las ofertas insertadas.
+
+Columnas: titulo, descripcion, categoria, ciudad, tipo_contrato, modalidad, salario_min,
+salario_max, fecha_publicacion, fecha_expiracion, estado y habilidades. La ciudad se
+indica por id, por nombre o como "Nombre, Provincia" si el nombre se repite. En CSV las
+habilidades van como "Python:avanzado:obligatoria; SQL:basico:opcional"; en JSONL
+también puede ser una lista de objetos {"nombre", "nivel", "obligatorio"}.
+"""
+
+TAMANIO_LOTE = 1000
+MAX_ERRORES_GUARDADOS = 500
+
+_AMBIGUA = object()
+
+
+class ErrorFila(ValueError):
+    """Fila que no se puede importar; el mensaje se muestra en el reporte."""
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.filas = 0
+        self.creadas = 0
+        self.habilidades_creadas = 0
+        self.total_errores = 0
+        # Solo los primeros errores quedan en memoria; el resto se entrega al callback
+        self.errores = []
+
+    def registrar_error(self, numero, mensaje):
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES_GUARDADOS:
+            self.errores.append((numero, mensaje))
+
+
+# --- LECTURA ---
+
+class ErrorArchivo(ValueError):
+    """El resto del archivo no se puede leer; lo anterior ya se importó."""
+
+
+def leer_csv(archivo):
+    """
+    Genera (numero_linea, dict) desde un archivo de texto CSV con encabezado.
+
+    Una línea que el módulo csv rechaza (p. ej. un campo mayor que csv.field_size_limit())
+    se entrega como ErrorFila y la lectura sigue en la siguiente.
+    """
+    lector = csv.DictReader(archivo)
+    while True:
+        try:
+            fila = next(lector)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            if lector.line_num == 0:
+                raise ErrorArchivo(f"No se pudo leer el encabezado CSV: {exc}")
+            # line_num aún no cuenta la línea rechazada
+            yield lector.line_num + 1, ErrorFila(f"CSV inválido: {exc}")
+            continue
+        yield lector.line_num, fila
+
+
+def leer_jsonl(archivo):
+    """Genera (numero_linea, dict); una línea que no es JSON se entrega como ErrorFila."""
+    for numero, linea in enumerate(archivo, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            datos = json.loads(linea)
+        except ValueError as exc:
+            yield numero, ErrorFila(f"JSON inválido: {exc}")
+            continue
+        if not isinstance(datos, dict):
+            yield numero, ErrorFila("Cada línea debe ser un objeto JSON.")
+            continue
+        yield numero, datos
+
+
+LECTORES = {'csv': leer_csv, 'jsonl': leer_jsonl}
+
+
+def detectar_formato(nombre_archivo):
+    nombre = (nombre_archivo or '').lower()
+    if nombre.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return 'csv'
+
+
+# --- IMPORTADOR ---
+
+class ImportadorOfertas:
+    """
+    Importa ofertas para una empresa.
+
+    `al_error(numero, mensaje)` recibe cada fila rechazada en cuanto se detecta y
+    `al_lote(resultado)` se llama después de guardar cada lote (para mostrar avance).
+    """
+
+    def __init__(self, empresa, estado_por_defecto=None, tamanio_lote=TAMANIO_LOTE,
+                 crear_habilidades=True, al_error=None, al_lote=None):
+        from .models import EstadoOferta
+
+        self.empresa = empresa
+        self.estado_por_defecto = estado_por_defecto or EstadoOferta.BORRADOR
+        self.tamanio_lote = tamanio_lote
+        self.crear_habilidades = crear_habilidades
+        self.al_error = al_error
+        self.al_lote = al_lote
+        self._cargar_catalogos()
+
+    def _cargar_catalogos(self):
+        from accounts.models import Habilidad
+        from locations.models import Ciudad
+        from .models import Categoria, EstadoOferta, NivelHabilidad, TipoContrato
+
+        self.categorias = {_clave(nombre): pk for pk, nombre in Categoria.objects.values_list('id', 'nombre')}
+        self.habilidades = {_clave(nombre): pk for pk, nombre in Habilidad.objects.values_list('id', 'nombre')}
+
+        self.ciudades = {}
+        self.ciudad_ids = set()
+        for pk, nombre, provincia in Ciudad.objects.values_list('id', 'nombre', 'provincia__nombre'):
+            self.ciudad_ids.add(pk)
+            self.ciudades[_clave(f"{nombre}, {provincia}")] = pk
+            # Un nombre sin provincia solo sirve si no se repite en otra provincia
+            clave = _clave(nombre)
+            self.ciudades[clave] = _AMBIGUA if clave in self.ciudades else pk
+
+        self.tipos_contrato = _opciones(TipoContrato)
+        self.estados = _opciones(EstadoOferta)
+        self.niveles = _opciones(NivelHabilidad)
+        self.nivel_por_defecto = NivelHabilidad.BASICO
+
+    def importar(self, filas):
+        """Consume un iterable de (numero, dict) y devuelve un ResultadoImportacion."""
+        resultado = ResultadoImportacion()
+        lote = []
+        numero = 0
+        filas = iter(filas)
+        while True:
+            try:
+                numero, datos = next(filas)
+            except StopIteration:
+                break
+            except (ErrorArchivo, UnicodeDecodeError) as exc:
+                # El lector ya no puede seguir: se guarda lo leído y el resto queda como un error
+                if isinstance(exc, UnicodeDecodeError):
+                    exc = "El archivo debe estar codificado en UTF-8."
+                self._error(resultado, numero + 1, f"Se detuvo la lectura: {exc}")
+                break
+            resultado.filas += 1
+            numero = numero or resultado.filas
+            try:
+                if isinstance(datos, ErrorFila):
+                    raise datos
+                lote.append((numero,) + self._preparar(datos))
+            except ErrorFila as exc:
+                self._error(resultado, numero, str(exc))
+                continue
+            if len(lote) >= self.tamanio_lote:
+                self._guardar_lote(lote, resultado)
+                lote = []
+        if lote:
+            self._guardar_lote(lote, resultado)
+        return resultado
+
+    def _error(self, resultado, numero, mensaje):
+        resultado.registrar_error(numero, mensaje)
+        if self.al_error:
+            self.al_error(numero, mensaje)
+
+    # --- VALIDACIÓN DE UNA FILA ---
+
+    def _preparar(self, datos):
+        from .models import OfertaEmpleo
+
+        datos = {_clave(k): v for k, v in datos.items() if k}
+
+        titulo = _texto(datos.get('titulo'))
+        descripcion = _texto(datos.get('descripcion'))
+        if not titulo:
+            raise ErrorFila("Falta el título.")
+        if len(titulo) > 200:
+            raise ErrorFila("El título supera los 200 caracteres.")
+        if not descripcion:
+            raise ErrorFila("Falta la descripción.")
+
+        modalidad = _texto(datos.get('modalidad')) or None
+        if modalidad and len(modalidad) > 100:
+            raise ErrorFila("La modalidad supera los 100 caracteres.")
+
+        salario_min = _decimal(datos.get('salario_min'), 'salario_min')
+        salario_max = _decimal(datos.get('salario_max'), 'salario_max')
+        if salario_min is not None and salario_max is not None and salario_min > salario_max:
+            raise ErrorFila("salario_min es mayor que salario_max.")
+
+        oferta = OfertaEmpleo(
+            empresa=self.empresa,
+            categoria_id=self._categoria(datos.get('categoria')),
+            ciudad_id=self._ciudad(datos.get('ciudad')),
+            titulo=titulo,
+            descripcion=descripcion,
+            tipo_contrato=self._opcion(self.tipos_contrato, datos.get('tipo_contrato'), 'tipo_contrato')
+            or OfertaEmpleo._meta.get_field('tipo_contrato').default,
+            modalidad=modalidad,
+            salario_min=salario_min,
+            salario_max=salario_max,
+            fecha_publicacion=_fecha(datos.get('fecha_publicacion'), 'fecha_publicacion') or timezone.now(),
+            fecha_expiracion=_fecha(datos.get('fecha_expiracion'), 'fecha_expiracion'),
+            estado=self._opcion(self.estados, datos.get('estado'), 'estado') or self.estado_por_defecto,
+        )
+        return oferta, self._habilidades(datos.get('habilidades'))
+
+    def _categoria(self, valor):
+        valor = _texto(valor)
+        if not valor:
+            return None
+        pk = self.categorias.get(_clave(valor))
+        if pk is None:
+            raise ErrorFila(f"Categoría desconocida: {valor}.")
+        return pk
+
+    def _ciudad(self, valor):
+        valor = _texto(valor)
+        if not valor:
+            return None
+        if valor.isdigit():
+            if int(valor) not in self.ciudad_ids:
+                raise ErrorFila(f"No existe la ciudad con id {valor}.")
+            return int(valor)
+        pk = self.ciudades.get(_clave(valor))
+        if pk is None:
+            raise ErrorFila(f"Ciudad desconocida: {valor}.")
+        if pk is _AMBIGUA:
+            raise ErrorFila(f'Hay varias ciudades "{valor}"; indique "Ciudad, Provincia".')
+        return pk
+
+    def _opcion(self, opciones, valor, campo):
+        valor = _texto(valor)
+        if not valor:
+            return None
+        opcion = opciones.get(_clave(valor))
+        if opcion is None:
+            raise ErrorFila(f"Valor no válido para {campo}: {valor}.")
+        return opcion
+
+    def _habilidades(self, valor):
+        """Devuelve [(nombre, nivel, es_obligatorio)] sin repetidos."""
+        if not valor:
+            return []
+        if isinstance(valor, str):
+            valor = [parte for parte in valor.split(';') if parte.strip()]
+        if not isinstance(valor, list):
+            raise ErrorFila("habilidades debe ser texto o una lista.")
+
+        resultado = {}
+        for item in valor:
+            if isinstance(item, dict):
+                nombre = _texto(item.get('nombre'))
+                nivel = item.get('nivel')
+                obligatorio = item.get('obligatorio', item.get('es_obligatorio', True))
+            else:
+                partes = [p.strip() for p in str(item).split(':')]
+                nombre = partes[0]
+                nivel = partes[1] if len(partes) > 1 else None
+                obligatorio = partes[2] if len(partes) > 2 else True
+            if not nombre:
+                raise ErrorFila("Habilidad sin nombre.")
+            if len(nombre) > 100:
+                raise ErrorFila(f"Nombre de habilidad demasiado largo: {nombre[:30]}...")
+            if _clave(nombre) not in self.habilidades and not self.crear_habilidades:
+                raise ErrorFila(f"Habilidad desconocida: {nombre}.")
+            nivel = self._opcion(self.niveles, nivel, 'nivel') or self.nivel_por_defecto
+            resultado[_clave(nombre)] = (nombre, nivel, _booleano(obligatorio))
+        return list(resultado.values())
+
+    # --- ESCRITURA ---
+
+    def _guardar_lote(self, lote, resultado):
+        from .models import EstadoOferta, OfertaEmpleo, OfertaHabilidad
+
+        try:
+            with transaction.atomic():
+                resultado.habilidades_creadas += self._crear_habilidades_nuevas(lote)
+                ofertas = OfertaEmpleo.objects.bulk_create([oferta for _, oferta, _ in lote])
+                OfertaHabilidad.objects.bulk_create(
+                    [
+                        OfertaHabilidad(
+                            oferta_id=oferta.pk,
+                            habilidad_id=self.habilidades[_clave(nombre)],
+                            nivel_requerido=nivel,
+                            es_obligatorio=obligatorio,
+                        )
+                        for (_, _, habilidades), oferta in zip(lote, ofertas)
+                        for nombre, nivel, obligatorio in habilidades
+                    ],
+                    batch_size=self.tamanio_lote,
+                )
+                ids = [oferta.pk for oferta in ofertas]
+                sumar_ofertas(
+                    OfertaEmpleo.objects.filter(pk__in=ids, estado=EstadoOferta.PUBLICADA).values(*CAMPOS_FACETAS)
+                )
+                actualizar_vectores(oferta_ids=ids)
+        except DatabaseError as exc:
+            # Las filas ya pasaron la validación; un fallo aquí invalida el lote completo
+            self._cargar_catalogos()
+            for numero, _, _ in lote:
+                self._error(resultado, numero, f"Error de base de datos en el lote: {exc}")
+        else:
+            resultado.creadas += len(ofertas)
+            invalidar_empresas([self.empresa.pk])
+        if self.al_lote:
+            self.al_lote(resultado)
+
+    def _crear_habilidades_nuevas(self, lote):
+        from accounts.models import Habilidad
+
+        nuevas = {}
+        for _, _, habilidades in lote:
+            for nombre, _, _ in habilidades:
+                if _clave(nombre) not in self.habilidades:
+                    nuevas.setdefault(_clave(nombre), nombre)
+        if not nuevas:
+            return 0
+        Habilidad.objects.bulk_create(
+            [Habilidad(nombre=nombre) for nombre in nuevas.values()], ignore_conflicts=True
+        )
+        for pk, nombre in Habilidad.objects.filter(nombre__in=nuevas.values()).values_list('id', 'nombre'):
+            self.habilidades[_clave(nombre)] = pk
+        return len(nuevas)
+
+
+# --- CONVERSIONES ---
+
+def _clave(valor):
+    return ' '.join(str(valor).split()).casefold()
+
+
+def _texto(valor):
+    return '' if valor is None else str(valor).strip()
+
+
+def _opciones(choices):
+    """Acepta tanto el valor interno ('tiempo_completo') como la etiqueta ('Tiempo Completo')."""
+    opciones = {}
+    for valor, etiqueta in choices.choices:
+        opciones[_clave(valor)] = valor
+        opciones[_clave(etiqueta)] = valor
+    return opciones
+
+
+def _decimal(valor, campo):
+    valor = _texto(valor)
+    if not valor:
+        return None
+    try:
+        numero = Decimal(valor)
+    except InvalidOperation:
+        raise ErrorFila(f"{campo} no es un número: {valor}.")
+    if not numero.is_finite() or numero < 0 or numero >= Decimal(10) ** 10:
+        raise ErrorFila(f"{campo} fuera de rango: {valor}.")
+    return numero.quantize(Decimal('0.01'))
+
+
+def _fecha(valor, campo):
+    valor = _texto(valor)
+    if not valor:
+        return None
+    try:
+        fecha = parse_datetime(valor)
+        if fecha is None:
+            dia = parse_date(valor)
+            fecha = datetime.combine(dia, time.min) if dia else None
+    except ValueError:
+        fecha = None
+    if fecha is None:
+        raise ErrorFila(f"{campo} no es una fecha válida (AAAA-MM-DD): {valor}.")
+    if settings.USE_TZ and timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+def _booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    return _clave(valor) not in ('0', 'no', 'false', 'falso', 'opcional', 'n')
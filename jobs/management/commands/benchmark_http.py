@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de carga de extremo a extremo: clientes asyncio concurrentes recorren los flujos de "
+        "candidato y empresa y se reporta p50/p95/p99 y peticiones por segundo por endpoint. "
+        "Escribe en la BD: usar sobre datos de prueba (generar_datos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="URL de un servidor ya levantado (requiere httpx). "
+                                          "Sin ella se usa config.asgi en el mismo proceso.")
+        parser.add_argument('--host', default='localhost', help="Cabecera Host en modo ASGI (debe estar en ALLOWED_HOSTS).")
+        parser.add_argument('--candidatos', type=int, default=20, help="Clientes concurrentes con sesión de candidato.")
+        parser.add_argument('--empresas', type=int, default=5, help="Clientes concurrentes con sesión de empresa.")
+        parser.add_argument('--duracion', type=float, default=30, help="Segundos de medición.")
+        parser.add_argument('--calentamiento', type=float, default=2, help="Segundos iniciales que no se miden.")
+        parser.add_argument('--iteraciones', type=int, help="Máximo de recorridos por cliente (además de --duracion).")
+        parser.add_argument('--pausa', type=float, default=0, help="Pausa media en segundos entre recorridos de un cliente.")
+        parser.add_argument('--muestreo-sql', type=float,
+                            help="SQL_MUESTREO del middleware de instrumentación durante el benchmark (modo ASGI); "
+                                 "0 para medir sin su costo ni sus logs.")
+        parser.add_argument('--semilla', type=int, default=0)
+        parser.add_argument('--salida', default='benchmark.json', help="Archivo JSON con los resultados.")
+        parser.add_argument('--comparar', help="JSON de una corrida anterior para mostrar el cambio de p95.")
+
+    def handle(self, *args, **options):
+        datos = benchmark.preparar_datos(options['candidatos'], options['empresas'], options['semilla'])
+        if not datos.ofertas and not datos.empresas:
+            raise CommandError("No hay ofertas publicadas ni postulaciones: genere datos con generar_datos.")
+        self.stdout.write(
+            f"{len(datos.candidatos)} candidatos y {len(datos.empresas)} empresas sobre "
+            f"{len(datos.ofertas)} ofertas durante {options['duracion']:.0f} s..."
+        )
+
+        if options['url']:
+            try:
+                transporte = benchmark.TransporteHTTP(options['url'], len(datos.candidatos) + len(datos.empresas))
+            except ImportError:
+                raise CommandError("El modo --url necesita httpx (pip install httpx).")
+        else:
+            if options['muestreo_sql'] is not None:
+                # El middleware lee el setting al construirse, es decir, al crear la aplicación ASGI
+                settings.SQL_MUESTREO = options['muestreo_sql']
+            transporte = benchmark.TransporteASGI(host=options['host'])
+
+        metricas, segundos, recorridos = asyncio.run(benchmark.ejecutar(
+            transporte, datos, duracion=options['duracion'], calentamiento=options['calentamiento'],
+            iteraciones=options['iteraciones'], pausa=options['pausa'], semilla=options['semilla'],
+        ))
+        if not metricas.tiempos:
+            raise CommandError("No se midió ninguna petición (¿calentamiento mayor que la duración?).")
+
+        parametros = {
+            clave: options[clave]
+            for clave in (
+                'url', 'candidatos', 'empresas', 'duracion', 'calentamiento', 'iteraciones', 'pausa', 'muestreo_sql', 'semilla',
+            )
+        }
+        resultado = benchmark.informe(metricas, segundos, recorridos, parametros)
+        benchmark.guardar(resultado, options['salida'])
+
+        self.stdout.write(f"{'endpoint':38} {'n':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}")
+        for nombre, fila in list(resultado['endpoints'].items()) + [('TOTAL', resultado['total'])]:
+            self.stdout.write(
+                f"{nombre:38} {fila['peticiones']:>7} {fila['errores']:>5} {fila['p50_ms']:>8.1f} "
+                f"{fila['p95_ms']:>8.1f} {fila['p99_ms']:>8.1f} {fila['rps']:>8.1f}"
+            )
+
+        if options['comparar']:
+            with open(options['comparar'], encoding='utf-8') as archivo:
+                anterior = json.load(archivo)
+            self.stdout.write(f"\np95 frente a {options['comparar']} (commit {anterior.get('commit')}):")
+            for nombre, antes, ahora, cambio in benchmark.comparar(anterior, resultado):
+                texto = f"{cambio:+.1f} %" if cambio is not None else "-"
+                self.stdout.write(f"{nombre:38} {antes:>8.1f} -> {ahora:>8.1f}  {texto}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['total']['peticiones']} peticiones en {segundos:.1f} s "
+            f"({resultado['total']['rps']:.1f}/s). Resultados en {options['salida']}."
+        ))
@@ -0,0 +1,50 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from jobs.expiration import TAMANIO_LOTE, expirar_vencidas
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa a 'expirada' las ofertas publicadas cuya fecha de expiración ya pasó. "
+        "Con --intervalo queda corriendo como worker y repite cada N segundos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=TAMANIO_LOTE, help="Ofertas por lote (transacción).")
+        parser.add_argument('--max-lotes', type=int, default=None,
+                            help="Máximo de lotes por ejecución; el resto queda para el siguiente ciclo.")
+        parser.add_argument('--intervalo', type=int, default=0,
+                            help="Segundos entre ciclos. 0 = una sola ejecución.")
+
+    def handle(self, *args, **options):
+        self.detener = False
+        if options['intervalo']:
+            signal.signal(signal.SIGTERM, self._detener)
+            signal.signal(signal.SIGINT, self._detener)
+
+        while True:
+            inicio = time.monotonic()
+            total, lotes = expirar_vencidas(tamanio_lote=options['lote'], max_lotes=options['max_lotes'])
+            duracion = time.monotonic() - inicio
+            self.stdout.write(
+                f"[{timezone.now():%Y-%m-%d %H:%M:%S}] {total} ofertas expiradas "
+                f"en {lotes} lote(s), {duracion:.2f}s"
+            )
+            if not options['intervalo'] or self.detener:
+                break
+
+            # Entre ciclos no mantener conexiones abiertas ni caídas
+            close_old_connections()
+            fin_espera = time.monotonic() + options['intervalo']
+            while not self.detener and time.monotonic() < fin_espera:
+                time.sleep(min(1, options['intervalo']))
+            if self.detener:
+                break
+
+    def _detener(self, signum, frame):
+        self.detener = True
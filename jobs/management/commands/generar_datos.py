@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.synthetic import CLAVE_USUARIOS, TAMANIO_LOTE, Escala, GeneradorDatos
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un conjunto de datos sintético y reproducible (ubicaciones, empresas, candidatos, "
+        "ofertas, postulaciones...) para pruebas de carga. Con los valores por defecto crea unos "
+        "2,5 millones de filas."
+    )
+
+    def add_arguments(self, parser):
+        defecto = Escala()
+        parser.add_argument('--semilla', type=int, default=0,
+                            help="Semilla aleatoria: la misma semilla genera los mismos datos.")
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help="Multiplica empresas, candidatos, ofertas y postulaciones (p. ej. 0.01 para una prueba).")
+        parser.add_argument('--lote', type=int, default=TAMANIO_LOTE, help="Filas por lote/transacción.")
+        parser.add_argument('--sesgo', type=float, default=defecto.sesgo,
+                            help="Exponente de Zipf de la popularidad de las ofertas (más alto, más concentrado).")
+        parser.add_argument('--clave', default=CLAVE_USUARIOS, help="Contraseña de todos los usuarios generados.")
+        for campo in ('empresas', 'candidatos', 'ofertas', 'postulaciones'):
+            parser.add_argument(f'--{campo}', type=int, help=f"Cantidad de {campo} (por defecto {getattr(defecto, campo)} × escala).")
+
+    def handle(self, *args, **options):
+        escala = Escala(sesgo=options['sesgo']).escalar(options['escala'])
+        for campo in ('empresas', 'candidatos', 'ofertas', 'postulaciones'):
+            if options[campo] is not None:
+                setattr(escala, campo, options[campo])
+        if min(escala.empresas, escala.candidatos, escala.ofertas) < 1 or options['lote'] < 1:
+            raise CommandError("Las cantidades y el tamaño de lote deben ser mayores que cero.")
+
+        inicio = time.perf_counter()
+        ultimo = {}
+
+        def progreso(tabla, filas):
+            # Una línea por tabla cada ~10 lotes para no inundar la salida
+            if options['verbosity'] >= 2 or filas - ultimo.get(tabla, 0) >= 10 * options['lote']:
+                ultimo[tabla] = filas
+                self.stdout.write(f"  {tabla}: {filas} filas ({time.perf_counter() - inicio:.0f} s)")
+
+        generador = GeneradorDatos(
+            escala, semilla=options['semilla'], tamanio_lote=options['lote'],
+            al_progreso=progreso, clave=options['clave'],
+        )
+        if generador.ya_generado():
+            raise CommandError(
+                f"Ya existen usuarios generados con la semilla {options['semilla']} "
+                f"(prefijo '{generador.prefijo}'). Use otra semilla."
+            )
+
+        conteos = generador.generar()
+        total = sum(conteos.values())
+        for tabla, filas in conteos.items():
+            self.stdout.write(f"{tabla:32} {filas:>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} filas generadas en {generador.segundos:.1f} s "
+            f"({total / max(generador.segundos, 1e-9):.0f} filas/s)."
+        ))
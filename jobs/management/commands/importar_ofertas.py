@@ -0,0 +1,61 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Empresa
+from jobs.importer import LECTORES, TAMANIO_LOTE, ImportadorOfertas, detectar_formato
+from jobs.models import EstadoOferta
+
+
+class Command(BaseCommand):
+    help = "Importa ofertas de una empresa desde un archivo CSV o JSONL (ver jobs/importer.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del archivo a importar.")
+        parser.add_argument('--empresa', type=int, required=True, help="ID de la empresa dueña de las ofertas.")
+        parser.add_argument('--formato', choices=sorted(LECTORES), help="Por defecto se deduce de la extensión.")
+        parser.add_argument('--estado', choices=EstadoOferta.values, default=EstadoOferta.BORRADOR,
+                            help="Estado de las filas que no traen uno.")
+        parser.add_argument('--lote', type=int, default=TAMANIO_LOTE, help="Ofertas por lote (transacción).")
+        parser.add_argument('--reporte', help="Archivo CSV donde escribir las filas rechazadas.")
+        parser.add_argument('--no-crear-habilidades', action='store_true',
+                            help="Rechazar filas con habilidades que no están en el catálogo.")
+
+    def handle(self, *args, **options):
+        try:
+            empresa = Empresa.objects.get(pk=options['empresa'])
+        except Empresa.DoesNotExist:
+            raise CommandError(f"No existe la empresa {options['empresa']}.")
+
+        leer = LECTORES[options['formato'] or detectar_formato(options['archivo'])]
+        reporte = open(options['reporte'], 'w', newline='', encoding='utf-8') if options['reporte'] else None
+        try:
+            if reporte:
+                escritor = csv.writer(reporte)
+                escritor.writerow(['fila', 'error'])
+                al_error = lambda numero, mensaje: escritor.writerow([numero, mensaje])
+            else:
+                al_error = lambda numero, mensaje: self.stderr.write(f"Fila {numero}: {mensaje}")
+
+            importador = ImportadorOfertas(
+                empresa,
+                estado_por_defecto=options['estado'],
+                tamanio_lote=options['lote'],
+                crear_habilidades=not options['no_crear_habilidades'],
+                al_error=al_error,
+                al_lote=lambda r: self.stdout.write(f"{r.filas} filas leídas, {r.creadas} ofertas creadas..."),
+            )
+            with open(options['archivo'], newline='', encoding='utf-8-sig') as archivo:
+                resultado = importador.importar(leer(archivo))
+        except OSError as exc:
+            raise CommandError(f"No se pudo leer el archivo: {exc}")
+        finally:
+            if reporte:
+                reporte.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.creadas} ofertas importadas de {resultado.filas} filas "
+            f"({resultado.habilidades_creadas} habilidades nuevas)."
+        ))
+        if resultado.total_errores:
+            self.stdout.write(self.style.WARNING(f"{resultado.total_errores} filas rechazadas."))
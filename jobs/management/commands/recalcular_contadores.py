@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import recalcular_contadores
+
+
+class Command(BaseCommand):
+    help = "Recalcula en bloque los contadores de postulaciones de las ofertas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oferta', type=int, action='append', dest='ofertas',
+                            help="ID de oferta a reparar (se puede repetir). Por defecto, todas.")
+        parser.add_argument('--lote', type=int, default=1000, help="Ofertas por lote.")
+
+    def handle(self, *args, **options):
+        total = recalcular_contadores(options['ofertas'], tamanio_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"Contadores recalculados en {total} ofertas."))
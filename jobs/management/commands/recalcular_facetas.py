@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs.facets import recalcular_facetas
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero los conteos de facetas de las ofertas publicadas."
+
+    def handle(self, *args, **options):
+        total = recalcular_facetas()
+        self.stdout.write(self.style.SUCCESS(f"{total} valores de faceta recalculados."))
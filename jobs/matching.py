@@ -0,0 +1,285 @@
+import numpy as np
+from scipy import sparse
+
+"""
+Motor de coincidencias (match) entre candidatos y ofertas por habilidades.
+
+Puntaje de un candidato i para una oferta j (0 a 100):
+
+    sum_s  peso_js * min(nivel_is, requerido_js) / requerido_js   (cobertura de nivel)
+  + PESO_EXPERIENCIA * sum_s peso_js * min(anios_is, TOPE_ANIOS) / TOPE_ANIOS
+    -------------------------------------------------------------------------
+                 (1 + PESO_EXPERIENCIA) * sum_s peso_js
+
+Si el candidato no tiene alguna habilidad obligatoria de la oferta el par queda
+descartado (puntaje 0, no aparece en los resultados).
+
+Para poder calcularlo con productos de matrices dispersas, el nivel se codifica de forma
+acumulada: un candidato "avanzado" (3) en la habilidad s tiene un 1 en las columnas
+(s, 1), (s, 2) y (s, 3). Una oferta que exige nivel r en s pone peso/r en las columnas
+(s, 1..r). El producto de ambas filas da exactamente peso * min(nivel, r) / r, así que
+todo un bloque de candidatos contra todas las ofertas es un único producto CSR. El conteo
+de obligatorias cumplidas viaja en el mismo producto, en la "parte alta" del valor.
+
+Para atender una petición se usan las consultas de una sola entidad
+(`top_ofertas_candidato`, `top_candidatos_oferta`): un producto de una fila y
+argpartition, del orden de milisegundos. Los `top_*_por_*` recorren el universo
+completo y son para precálculos fuera de línea; con habilidades muy comunes el
+producto por bloques crece con candidatos × ofertas.
+"""
+
+NIVELES = {
+    'basico': 1,
+    'intermedio': 2,
+    'avanzado': 3,
+    'experto': 4,
+}
+MAX_NIVEL = max(NIVELES.values())
+
+PESO_OBLIGATORIO = 2.0
+PESO_OPCIONAL = 1.0
+PESO_EXPERIENCIA = 0.25
+TOPE_ANIOS = 10
+
+# Las obligatorias cumplidas viajan en el mismo producto, escaladas por este factor
+# (muy superior a cualquier puntaje parcial) para separarlas después sin otra multiplicación
+_FACTOR_OBLIGATORIAS = 1e6
+
+# Filas por bloque: acota la memoria del producto disperso intermedio
+TAMANIO_BLOQUE = 512
+
+
+def _indices(valores):
+    """Devuelve (valores_unicos, posicion_de_cada_valor)."""
+    unicos, posiciones = np.unique(np.asarray(valores, dtype=np.int64), return_inverse=True)
+    return unicos, posiciones
+
+
+def _niveles_a_enteros(niveles):
+    return np.array([NIVELES.get(nivel, 1) for nivel in niveles], dtype=np.int64)
+
+
+def _expandir_niveles(filas, habilidades, niveles, valores):
+    """
+    Codificación acumulada: cada (fila, habilidad, nivel) se expande a las columnas
+    habilidad * MAX_NIVEL + k para k < nivel, todas con el mismo valor.
+    """
+    repeticiones = niveles
+    filas_rep = np.repeat(filas, repeticiones)
+    valores_rep = np.repeat(valores, repeticiones)
+    # k = 0..nivel-1 dentro de cada grupo repetido
+    inicio = np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    k = np.arange(filas_rep.size) - inicio
+    columnas = np.repeat(habilidades, repeticiones) * MAX_NIVEL + k
+    return filas_rep, columnas, valores_rep
+
+
+def _top_k_de_fila(puntajes, ids, k):
+    """[(id, puntaje), ...] con los k mayores de una matriz CSR de una fila, del mejor al peor."""
+    datos, columnas = puntajes.data, puntajes.indices
+    if k < datos.size:
+        elegidos = np.argpartition(-datos, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.int64)
+        datos, columnas = datos[elegidos], columnas[elegidos]
+    ids = ids[columnas]
+    # Puntaje descendente; a igual puntaje, id ascendente
+    orden = np.lexsort((ids, -datos))
+    return list(zip(ids[orden].tolist(), np.round(datos[orden], 2).tolist()))
+
+
+def _posicion(ids, id_):
+    """Fila de `id_` en el arreglo ordenado `ids`, o None si no está."""
+    fila = np.searchsorted(ids, id_)
+    if fila >= ids.size or ids[fila] != id_:
+        return None
+    return int(fila)
+
+
+def _top_k_por_fila(matriz, k):
+    """
+    Para una matriz CSR devuelve, por fila, los índices de columna y valores de los k
+    mayores elementos, sin recorrer las filas en Python.
+    """
+    matriz = matriz.tocsr()
+    matriz.eliminate_zeros()
+    por_fila = np.diff(matriz.indptr)
+    filas = np.repeat(np.arange(matriz.shape[0]), por_fila)
+    # Orden: fila ascendente, puntaje descendente
+    orden = np.lexsort((-matriz.data, filas))
+    inicio_fila = np.repeat(matriz.indptr[:-1], por_fila)
+    rango = np.arange(orden.size) - inicio_fila
+    elegidos = orden[rango < k]
+    return filas[elegidos], matriz.indices[elegidos], matriz.data[elegidos]
+
+
+class MotorCoincidencias:
+    """
+    Matrices dispersas de habilidades de candidatos y ofertas listas para puntuar.
+
+    `habilidades_candidatos`: iterable de (candidato_id, habilidad_id, nivel, anios_experiencia)
+    `habilidades_ofertas`: iterable de (oferta_id, habilidad_id, nivel_requerido, es_obligatorio)
+
+    Los niveles pueden venir como texto ('avanzado') o como entero (1-4).
+    """
+
+    def __init__(self, habilidades_candidatos, habilidades_ofertas):
+        cand = list(habilidades_candidatos)
+        ofer = list(habilidades_ofertas)
+        cand_ids, cand_hab, cand_nivel, cand_anios = self._columnas(cand, 4)
+        ofer_ids, ofer_hab, ofer_nivel, ofer_obl = self._columnas(ofer, 4)
+
+        # Solo importan las habilidades que pide alguna oferta
+        self.habilidad_ids, ofer_col = _indices(ofer_hab)
+        posicion = np.searchsorted(self.habilidad_ids, cand_hab)
+        posicion = np.clip(posicion, 0, max(self.habilidad_ids.size - 1, 0))
+        util = self.habilidad_ids.size > 0
+        util = np.zeros(cand_hab.size, dtype=bool) if not util else self.habilidad_ids[posicion] == cand_hab
+        cand_ids, cand_col = cand_ids[util], posicion[util]
+        cand_nivel, cand_anios = self._niveles(cand_nivel)[util], cand_anios[util].astype(np.float64)
+
+        self.candidato_ids, cand_fila = _indices(cand_ids)
+        self.oferta_ids, ofer_fila = _indices(ofer_ids)
+        n_hab = self.habilidad_ids.size
+        n_cand, n_ofer = self.candidato_ids.size, self.oferta_ids.size
+
+        ofer_nivel = np.clip(self._niveles(ofer_nivel), 1, MAX_NIVEL)
+        cand_nivel = np.clip(cand_nivel, 1, MAX_NIVEL)
+        ofer_obl = ofer_obl.astype(bool)
+        peso = np.where(ofer_obl, PESO_OBLIGATORIO, PESO_OPCIONAL)
+
+        # Candidatos: [niveles acumulados | experiencia normalizada | tenencia]
+        f, c, v = _expandir_niveles(cand_fila, cand_col, cand_nivel, np.ones(cand_fila.size))
+        cand_nivel_m = sparse.csr_matrix((v, (f, c)), shape=(n_cand, n_hab * MAX_NIVEL))
+        cand_anios_m = sparse.csr_matrix(
+            (PESO_EXPERIENCIA * np.minimum(cand_anios, TOPE_ANIOS) / TOPE_ANIOS, (cand_fila, cand_col)),
+            shape=(n_cand, n_hab),
+        )
+        cand_tiene_m = sparse.csr_matrix(
+            (np.full(cand_fila.size, _FACTOR_OBLIGATORIAS), (cand_fila, cand_col)), shape=(n_cand, n_hab)
+        )
+        self._cand = sparse.hstack([cand_nivel_m, cand_anios_m, cand_tiene_m], format='csr')
+
+        # Ofertas: [peso/requerido por nivel | peso | obligatoria (0/1)]
+        f, c, v = _expandir_niveles(ofer_fila, ofer_col, ofer_nivel, peso / ofer_nivel)
+        ofer_nivel_m = sparse.csr_matrix((v, (f, c)), shape=(n_ofer, n_hab * MAX_NIVEL))
+        ofer_peso_m = sparse.csr_matrix((peso, (ofer_fila, ofer_col)), shape=(n_ofer, n_hab))
+        ofer_obl_m = sparse.csr_matrix(
+            (np.ones(int(ofer_obl.sum())), (ofer_fila[ofer_obl], ofer_col[ofer_obl])), shape=(n_ofer, n_hab)
+        )
+        self._ofer = sparse.hstack([ofer_nivel_m, ofer_peso_m, ofer_obl_m], format='csr')
+        self._n_obligatorias = np.bincount(ofer_fila[ofer_obl], minlength=n_ofer)
+        peso_total = np.bincount(ofer_fila, weights=peso, minlength=n_ofer)
+        self._escala = 100.0 / ((1 + PESO_EXPERIENCIA) * np.maximum(peso_total, 1e-9))
+
+        # Transpuestas precalculadas para multiplicar bloques en ambos sentidos
+        self._cand_t = self._cand.T.tocsr()
+        self._ofer_t = self._ofer.T.tocsr()
+
+    @staticmethod
+    def _columnas(filas, n):
+        if not filas:
+            return tuple(np.empty(0, dtype=np.int64) for _ in range(n))
+        columnas = list(zip(*filas))
+        return tuple(np.asarray(col) for col in columnas)
+
+    @staticmethod
+    def _niveles(niveles):
+        if niveles.dtype.kind in 'iu':
+            return niveles.astype(np.int64)
+        return _niveles_a_enteros(niveles)
+
+    @classmethod
+    def desde_bd(cls, candidatos=None, ofertas=None):
+        """
+        Construye el motor leyendo CandidatoHabilidad y OfertaHabilidad (dos consultas).
+
+        `candidatos` y `ofertas` son querysets opcionales para acotar el universo,
+        por ejemplo solo las ofertas publicadas o solo los postulantes de una oferta.
+        """
+        from accounts.models import CandidatoHabilidad
+        from .models import OfertaHabilidad
+
+        hab_cand = CandidatoHabilidad.objects.all()
+        if candidatos is not None:
+            hab_cand = hab_cand.filter(candidato__in=candidatos)
+        hab_ofer = OfertaHabilidad.objects.all()
+        if ofertas is not None:
+            hab_ofer = hab_ofer.filter(oferta__in=ofertas)
+
+        return cls(
+            hab_cand.values_list('candidato_id', 'habilidad_id', 'nivel', 'anios_experiencia').iterator(chunk_size=5000),
+            hab_ofer.values_list('oferta_id', 'habilidad_id', 'nivel_requerido', 'es_obligatorio').iterator(chunk_size=5000),
+        )
+
+    # --- PUNTAJES ---
+
+    def _bloque(self, filas, por_oferta=False):
+        """
+        Puntajes de un bloque de filas contra todo el otro lado, como matriz CSR.
+
+        Con `por_oferta` las filas son ofertas y las columnas candidatos; si no, al revés.
+        Los pares sin habilidades en común o que no cumplen las obligatorias no
+        aparecen en la matriz.
+        """
+        if por_oferta:
+            producto = (self._ofer[filas] @ self._cand_t).tocsr()
+        else:
+            producto = (self._cand[filas] @ self._ofer_t).tocsr()
+
+        fila = np.repeat(np.arange(producto.shape[0]), np.diff(producto.indptr))
+        oferta = np.asarray(filas)[fila] if por_oferta else producto.indices
+
+        # Separar el conteo de obligatorias cumplidas (parte alta) del puntaje (parte baja)
+        cumplidas = np.floor(producto.data / _FACTOR_OBLIGATORIAS + 1e-6)
+        puntaje = producto.data - cumplidas * _FACTOR_OBLIGATORIAS
+
+        # Filtro duro: todas las obligatorias de la oferta
+        cumple = cumplidas >= self._n_obligatorias[oferta]
+        datos = puntaje[cumple] * self._escala[oferta[cumple]]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(fila[cumple], minlength=producto.shape[0]))))
+        return sparse.csr_matrix((datos, producto.indices[cumple], indptr), shape=producto.shape)
+
+    def top_ofertas_por_candidato(self, k=10, bloque=TAMANIO_BLOQUE):
+        """{candidato_id: [(oferta_id, puntaje), ...]} con las k mejores ofertas de cada uno."""
+        resultado = {}
+        for inicio in range(0, self.candidato_ids.size, bloque):
+            filas = np.arange(inicio, min(inicio + bloque, self.candidato_ids.size))
+            f, c, v = _top_k_por_fila(self._bloque(filas), k)
+            self._agrupar(resultado, self.candidato_ids[filas][f], self.oferta_ids[c], v)
+        return resultado
+
+    def top_candidatos_por_oferta(self, k=10, bloque=TAMANIO_BLOQUE):
+        """{oferta_id: [(candidato_id, puntaje), ...]} con los k mejores candidatos de cada una."""
+        resultado = {}
+        for inicio in range(0, self.oferta_ids.size, bloque):
+            filas = np.arange(inicio, min(inicio + bloque, self.oferta_ids.size))
+            f, c, v = _top_k_por_fila(self._bloque(filas, por_oferta=True), k)
+            self._agrupar(resultado, self.oferta_ids[filas][f], self.candidato_ids[c], v)
+        return resultado
+
+    def top_ofertas_candidato(self, candidato_id, k=10):
+        """[(oferta_id, puntaje), ...] con las k mejores ofertas de un candidato."""
+        fila = _posicion(self.candidato_ids, candidato_id)
+        if fila is None:
+            return []
+        return _top_k_de_fila(self._bloque([fila]), self.oferta_ids, k)
+
+    def top_candidatos_oferta(self, oferta_id, k=10):
+        """[(candidato_id, puntaje), ...] con los k mejores candidatos de una oferta."""
+        fila = _posicion(self.oferta_ids, oferta_id)
+        if fila is None:
+            return []
+        return _top_k_de_fila(self._bloque([fila], por_oferta=True), self.candidato_ids, k)
+
+    def puntajes_oferta(self, oferta_id):
+        """{candidato_id: puntaje} de todos los candidatos que califican para una oferta."""
+        fila = _posicion(self.oferta_ids, oferta_id)
+        if fila is None:
+            return {}
+        puntajes = self._bloque([fila], por_oferta=True)
+        candidatos = self.candidato_ids[puntajes.indices]
+        return dict(zip(candidatos.tolist(), np.round(puntajes.data, 2).tolist()))
+
+    @staticmethod
+    def _agrupar(resultado, claves, ids, puntajes):
+        for clave, id_, puntaje in zip(claves.tolist(), ids.tolist(), np.round(puntajes, 2).tolist()):
+            resultado.setdefault(clave, []).append((id_, puntaje))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ofertaempleo',
+            index=models.Index(condition=models.Q(('estado', 'publicada')), fields=['-fecha_publicacion', '-id'], name='oferta_publicada_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:10
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    # El índice GIN y el tsvector solo existen en PostgreSQL; en SQLite se usa
+    # el backend de búsqueda simple y la columna queda vacía.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from jobs.search import SQL_ACTUALIZAR_VECTOR
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS oferta_search_vector_gin "
+        "ON jobs_ofertaempleo USING gin (search_vector)"
+    )
+    schema_editor.execute(SQL_ACTUALIZAR_VECTOR)
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS oferta_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_oferta_publicada_fecha_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_ofertaempleo_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetaConteo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('faceta', models.CharField(max_length=30)),
+                ('valor', models.CharField(max_length=100)),
+                ('etiqueta', models.CharField(max_length=200)),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Conteo de Faceta',
+                'verbose_name_plural': 'Conteos de Facetas',
+                'unique_together': {('faceta', 'valor')},
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:18
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def rellenar_contadores(apps, schema_editor):
+    OfertaEmpleo = apps.get_model('jobs', 'OfertaEmpleo')
+    Postulacion = apps.get_model('jobs', 'Postulacion')
+    estados = ['pendiente', 'visto', 'entrevista', 'prueba_tecnica', 'oferta', 'rechazado', 'contratado', 'retirado']
+    agregados = {'num_postulaciones': Count('id')}
+    for estado in estados:
+        agregados[f'num_{estado}'] = Count('id', filter=Q(estado=estado))
+    for fila in Postulacion.objects.values('oferta_id').annotate(**agregados).order_by().iterator():
+        OfertaEmpleo.objects.filter(pk=fila.pop('oferta_id')).update(**fila)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_facetaconteo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_contratado',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_entrevista',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_oferta',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_pendiente',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_postulaciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_prueba_tecnica',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_rechazado',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_retirado',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ofertaempleo',
+            name='num_visto',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(rellenar_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_ofertaempleo_contadores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ofertaempleo',
+            index=models.Index(condition=models.Q(('estado', 'publicada'), ('fecha_expiracion__isnull', False)), fields=['fecha_expiracion'], name='oferta_publicada_expira_idx'),
+        ),
+    ]
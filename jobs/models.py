@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 
 """
 APLICATIVO: JOBS (Ofertas y Postulaciones)
@@ -16,6 +17,7 @@ Modelos:
 3. Postulacion: Registro de la aplicación de un candidato a una oferta específica.
 4. OfertaHabilidad: Habilidades requeridas para una oferta (pivote).
 5. OfertasGuardadas: Lista de deseos de candidatos para ofertas de interés.
+6. FacetaConteo: Conteos precalculados de ofertas publicadas por faceta (filtros del listado).
 """
 
 class TipoContrato(models.TextChoices):
@@ -77,9 +79,55 @@ class OfertaEmpleo(models.Model):
     fecha_expiracion = models.DateTimeField(blank=True, null=True)
     estado = models.CharField(max_length=20, choices=EstadoOferta.choices, default=EstadoOferta.BORRADOR)
 
+    # Contadores de postulaciones (counter cache). Se mantienen con F() desde jobs.counters;
+    # `python manage.py recalcular_contadores` los reconstruye si se desincronizan.
+    num_postulaciones = models.PositiveIntegerField(default=0, editable=False)
+    num_pendiente = models.PositiveIntegerField(default=0, editable=False)
+    num_visto = models.PositiveIntegerField(default=0, editable=False)
+    num_entrevista = models.PositiveIntegerField(default=0, editable=False)
+    num_prueba_tecnica = models.PositiveIntegerField(default=0, editable=False)
+    num_oferta = models.PositiveIntegerField(default=0, editable=False)
+    num_rechazado = models.PositiveIntegerField(default=0, editable=False)
+    num_contratado = models.PositiveIntegerField(default=0, editable=False)
+    num_retirado = models.PositiveIntegerField(default=0, editable=False)
+
+    # Documento de búsqueda (título, empresa, habilidades y descripción). Lo mantiene
+    # jobs.search.actualizar_vectores; el índice GIN se crea en la migración 0003.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Soporta la paginación por cursor del listado público (solo publicadas)
+            models.Index(
+                fields=['-fecha_publicacion', '-id'],
+                name='oferta_publicada_fecha_idx',
+                condition=models.Q(estado='publicada'),
+            ),
+            # Lo recorre el expirador de ofertas (jobs.expiration) buscando vencidas
+            models.Index(
+                fields=['fecha_expiracion'],
+                name='oferta_publicada_expira_idx',
+                condition=models.Q(estado='publicada', fecha_expiracion__isnull=False),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.titulo} - {self.empresa.nombre_empresa}"
 
+    def save(self, *args, **kwargs):
+        # Al editar una oferta existente no se escriben los contadores: el valor en memoria
+        # puede estar desactualizado y pisaría los incrementos hechos por otras peticiones.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            from .counters import campos_contadores
+            contadores = campos_contadores()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in contadores
+            ]
+        # Las señales de facetas leen la fila anterior con FOR UPDATE (jobs/facets.py)
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
 class OfertaHabilidad(models.Model):
     oferta = models.ForeignKey(OfertaEmpleo, on_delete=models.CASCADE, related_name='habilidades_requeridas')
     habilidad = models.ForeignKey(Habilidad, on_delete=models.CASCADE)
@@ -116,3 +164,19 @@ class OfertasGuardadas(models.Model):
     class Meta:
         verbose_name = "Oferta Guardada"
         verbose_name_plural = "Ofertas Guardadas"
+
+
+class FacetaConteo(models.Model):
+    """Número de ofertas publicadas por valor de faceta. Se mantiene desde jobs.facets."""
+    faceta = models.CharField(max_length=30)
+    valor = models.CharField(max_length=100)
+    etiqueta = models.CharField(max_length=200)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('faceta', 'valor')
+        verbose_name = "Conteo de Faceta"
+        verbose_name_plural = "Conteos de Facetas"
+
+    def __str__(self):
+        return f"{self.etiqueta} ({self.total})"
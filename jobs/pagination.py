@@ -0,0 +1,82 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+"""
+Paginación por cursor (keyset) para listados ordenados por fecha (o id) descendente.
+
+En lugar de OFFSET, cada página recuerda el último par (fecha, id) que mostró y la
+siguiente consulta arranca justo después de ese par. Con un índice compuesto sobre
+(fecha, id) el costo de cualquier página es el mismo que el de la primera.
+"""
+
+
+def codificar_cursor(fecha, pk):
+    """Convierte el par (fecha, id) en un token opaco apto para la URL."""
+    raw = f"{fecha.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decodificar_cursor(token):
+    """Devuelve el par (fecha, id) del token o None si es inválido."""
+    if not token:
+        return None
+    try:
+        padding = '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(token + padding).decode()
+        fecha_txt, pk_txt = raw.rsplit('|', 1)
+        fecha = parse_datetime(fecha_txt)
+        pk = int(pk_txt)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if fecha is None:
+        return None
+    return fecha, pk
+
+
+def paginar_por_cursor(queryset, cursor=None, por_pagina=20, campo_fecha='fecha_publicacion'):
+    """
+    Devuelve (items, siguiente_cursor) ordenando por (campo_fecha, id) descendente.
+
+    La condición redundante `campo_fecha <= fecha` permite que PostgreSQL use el índice
+    como límite del recorrido; el OR solo descarta los empates de la misma fecha.
+    """
+    queryset = queryset.order_by(f'-{campo_fecha}', '-id')
+    posicion = decodificar_cursor(cursor)
+    if posicion:
+        fecha, pk = posicion
+        queryset = queryset.filter(**{f'{campo_fecha}__lte': fecha}).filter(
+            Q(**{f'{campo_fecha}__lt': fecha}) | Q(**{campo_fecha: fecha, 'id__lt': pk})
+        )
+
+    # Pedimos un elemento extra para saber si existe una página siguiente
+    items = list(queryset[:por_pagina + 1])
+    siguiente = None
+    if len(items) > por_pagina:
+        items = items[:por_pagina]
+        ultimo = items[-1]
+        siguiente = codificar_cursor(getattr(ultimo, campo_fecha), ultimo.id)
+    return items, siguiente
+
+
+def paginar_por_id(queryset, cursor=None, por_pagina=20):
+    """
+    Devuelve (items, siguiente_cursor) ordenando solo por id descendente, para tablas
+    sin fecha (p. ej. la búsqueda de talento). El cursor es el último id mostrado.
+    """
+    queryset = queryset.order_by('-id')
+    try:
+        ultimo_id = int(cursor) if cursor else None
+    except ValueError:
+        ultimo_id = None
+    if ultimo_id is not None:
+        queryset = queryset.filter(id__lt=ultimo_id)
+
+    items = list(queryset[:por_pagina + 1])
+    siguiente = None
+    if len(items) > por_pagina:
+        items = items[:por_pagina]
+        siguiente = str(items[-1].id)
+    return items, siguiente
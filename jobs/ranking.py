@@ -0,0 +1,166 @@
+import secrets
+
+import numpy as np
+from django.core.cache import cache
+
+from .matching import MotorCoincidencias
+
+"""
+Ranking de postulantes por ajuste a la oferta ("ordenar por ajuste" en ver_postulantes).
+
+Ajuste (0 a 100) = habilidades * PESO_HABILIDADES + salario * PESO_SALARIO + ubicación * PESO_UBICACION
+
+- Habilidades: puntaje del motor de coincidencias (0 si falta una obligatoria).
+- Salario: 1 si el salario esperado cabe en el rango de la oferta; decae linealmente
+  hasta 0 cuando pide el doble del máximo. Sin datos cuenta como neutro (0.5).
+- Ubicación: 1 misma ciudad u oferta remota, 0.5 misma provincia, 0 en otro caso.
+
+Cada puntaje se guarda en su propia clave de caché (oferta, versión de la oferta,
+candidato). La lista de postulantes sale siempre de la BD y solo se calculan los que
+faltan en caché, así que nunca se pierde ni sobra un postulante aunque dos postulaciones
+lleguen a la vez o una transacción se deshaga. Una nueva postulación calcula su puntaje
+al confirmarse; cuando cambian la oferta o sus habilidades se sube la versión de la
+oferta, y cuando cambian las habilidades, el salario o la ciudad de un candidato se
+borran sus puntajes (jobs/signals.py).
+"""
+
+PESO_HABILIDADES = 0.7
+PESO_SALARIO = 0.15
+PESO_UBICACION = 0.15
+
+NEUTRO = 0.5
+DURACION_CACHE = 60 * 60
+
+
+def _clave_version(oferta_id):
+    return f"jobs:ajuste_postulantes:version:{oferta_id}"
+
+
+def _versiones(oferta_ids):
+    """{oferta_id: versión} en una sola lectura de la caché."""
+    claves = {_clave_version(o): o for o in oferta_ids}
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, secrets.randbits(48), None)
+            actuales[clave] = cache.get(clave)
+    return {claves[clave]: version for clave, version in actuales.items()}
+
+
+def _clave(oferta_id, version, candidato_id):
+    return f"jobs:ajuste_postulantes:{oferta_id}:{version}:{candidato_id}"
+
+
+def calcular_ajuste(oferta, candidatos):
+    """
+    Calcula {candidato_id: ajuste} para los candidatos dados (queryset de Candidato).
+
+    Tres consultas sin importar cuántos candidatos haya: datos de perfil y las dos
+    tablas de habilidades del motor de coincidencias.
+    """
+    from .models import OfertaEmpleo
+
+    filas = list(candidatos.values_list('id', 'salario_esperado', 'ciudad_id', 'ciudad__provincia_id'))
+    if not filas:
+        return {}
+    ids, salarios, ciudades, provincias = zip(*filas)
+    ids = np.array(ids, dtype=np.int64)
+
+    # Habilidades
+    motor = MotorCoincidencias.desde_bd(candidatos=candidatos, ofertas=OfertaEmpleo.objects.filter(pk=oferta.pk))
+    if motor.oferta_ids.size:
+        puntajes = motor.puntajes_oferta(oferta.pk)
+        habilidades = np.array([puntajes.get(i, 0.0) for i in ids.tolist()]) / 100.0
+    else:
+        # La oferta no pide habilidades: no diferencia a nadie
+        habilidades = np.ones(ids.size)
+
+    # Salario
+    esperado = np.array([np.nan if s is None else float(s) for s in salarios])
+    minimo = float(oferta.salario_min) if oferta.salario_min is not None else np.nan
+    maximo = float(oferta.salario_max) if oferta.salario_max is not None else minimo
+    salario = np.full(ids.size, NEUTRO)
+    if not np.isnan(maximo):
+        conocido = ~np.isnan(esperado)
+        exceso = np.maximum(esperado[conocido] - maximo, 0) / max(maximo, 1.0)
+        salario[conocido] = np.clip(1.0 - exceso, 0.0, 1.0)
+
+    # Ubicación
+    if (oferta.modalidad or '').strip().lower().startswith('remot'):
+        ubicacion = np.ones(ids.size)
+    elif oferta.ciudad_id is None:
+        ubicacion = np.full(ids.size, NEUTRO)
+    else:
+        provincia_oferta = oferta.ciudad.provincia_id
+        ciudades = np.array([c or 0 for c in ciudades])
+        provincias = np.array([p or 0 for p in provincias])
+        ubicacion = np.where(
+            ciudades == oferta.ciudad_id, 1.0, np.where(provincias == provincia_oferta, 0.5, 0.0)
+        )
+
+    ajuste = 100 * (PESO_HABILIDADES * habilidades + PESO_SALARIO * salario + PESO_UBICACION * ubicacion)
+    return dict(zip(ids.tolist(), np.round(ajuste, 2).tolist()))
+
+
+def ajuste_postulantes(oferta):
+    """
+    {candidato_id: ajuste} de todos los postulantes de la oferta. Los puntajes salen
+    de la caché; solo se calculan (y se guardan) los que falten.
+    """
+    from accounts.models import Candidato
+    from .models import Postulacion
+
+    ids = list(Postulacion.objects.filter(oferta=oferta).values_list('candidato_id', flat=True))
+    if not ids:
+        return {}
+    version = _versiones([oferta.pk])[oferta.pk]
+    claves = {_clave(oferta.pk, version, i): i for i in ids}
+    puntajes = {claves[clave]: ajuste for clave, ajuste in cache.get_many(claves).items()}
+    faltan = [i for i in ids if i not in puntajes]
+    if faltan:
+        nuevos = calcular_ajuste(oferta, Candidato.objects.filter(pk__in=faltan))
+        cache.set_many({_clave(oferta.pk, version, i): a for i, a in nuevos.items()}, DURACION_CACHE)
+        puntajes.update(nuevos)
+    return puntajes
+
+
+def agregar_postulante(oferta, candidato_id):
+    """Calcula de antemano el puntaje del nuevo postulante (una sola clave, sin leer las demás)."""
+    from accounts.models import Candidato
+
+    version = _versiones([oferta.pk])[oferta.pk]
+    for i, ajuste in calcular_ajuste(oferta, Candidato.objects.filter(pk=candidato_id)).items():
+        cache.set(_clave(oferta.pk, version, i), ajuste, DURACION_CACHE)
+
+
+def quitar_postulante(oferta_id, candidato_id):
+    version = _versiones([oferta_id])[oferta_id]
+    cache.delete(_clave(oferta_id, version, candidato_id))
+
+
+def invalidar(oferta_id):
+    """La oferta cambió: todos sus puntajes quedan viejos."""
+    clave = _clave_version(oferta_id)
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.add(clave, secrets.randbits(48), None)
+
+
+def invalidar_candidato(candidato_id):
+    """El perfil del candidato cambió: se borran sus puntajes en las ofertas a las que postuló."""
+    from .models import Postulacion
+
+    oferta_ids = list(Postulacion.objects.filter(candidato_id=candidato_id).values_list('oferta_id', flat=True))
+    if oferta_ids:
+        cache.delete_many([_clave(o, v, candidato_id) for o, v in _versiones(oferta_ids).items()])
+
+
+def ordenar_por_ajuste(puntajes):
+    """Ids de candidato ordenados de mayor a menor ajuste."""
+    if not puntajes:
+        return []
+    ids = np.fromiter(puntajes.keys(), dtype=np.int64, count=len(puntajes))
+    valores = np.fromiter(puntajes.values(), dtype=np.float64, count=len(puntajes))
+    # Empates: el id más bajo primero, para que el orden sea estable entre páginas
+    return ids[np.lexsort((ids, -valores))].tolist()
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, connections
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When
+from django.utils.module_loading import import_string
+
+"""
+Motor de búsqueda de ofertas.
+
+El backend de PostgreSQL usa la columna `OfertaEmpleo.search_vector` (tsvector con
+stemming en español e índice GIN), que se mantiene desde las señales de jobs/signals.py
+cada vez que cambia la oferta, su empresa o sus habilidades requeridas.
+
+El backend simple no necesita PostgreSQL: sirve para las pruebas con SQLite y para
+entornos de desarrollo sin base de datos real.
+
+El backend se elige con el setting JOBS_BUSQUEDA_BACKEND; si no existe, se decide
+según el motor de la conexión por defecto.
+"""
+
+CONFIG_IDIOMA = 'spanish'
+
+# Pesos: título > empresa y habilidades > descripción
+SQL_ACTUALIZAR_VECTOR = """
+    UPDATE jobs_ofertaempleo AS o SET search_vector =
+        setweight(to_tsvector('{config}', coalesce(o.titulo, '')), 'A') ||
+        setweight(to_tsvector('{config}', coalesce(e.nombre_empresa, '')), 'B') ||
+        setweight(to_tsvector('{config}', coalesce((
+            SELECT string_agg(h.nombre, ' ')
+            FROM jobs_ofertahabilidad oh
+            JOIN accounts_habilidad h ON h.id = oh.habilidad_id
+            WHERE oh.oferta_id = o.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('{config}', coalesce(o.descripcion, '')), 'C')
+    FROM accounts_empresa AS e
+    WHERE e.id = o.empresa_id
+""".format(config=CONFIG_IDIOMA)
+
+
+def actualizar_vectores(oferta_ids=None, empresa_id=None, using=None):
+    """
+    Recalcula `search_vector` para las ofertas indicadas (o todas si no se filtra).
+
+    No hace nada fuera de PostgreSQL.
+    """
+    conn = connections[using] if using else connection
+    if conn.vendor != 'postgresql':
+        return 0
+
+    sql = SQL_ACTUALIZAR_VECTOR
+    params = []
+    if oferta_ids is not None:
+        oferta_ids = list(oferta_ids)
+        if not oferta_ids:
+            return 0
+        sql += " AND o.id = ANY(%s)"
+        params.append(oferta_ids)
+    if empresa_id is not None:
+        sql += " AND o.empresa_id = %s"
+        params.append(empresa_id)
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+class BusquedaPostgres:
+    """Búsqueda full-text sobre el tsvector almacenado, ordenada por relevancia."""
+
+    def buscar(self, queryset, texto):
+        query = SearchQuery(texto, config=CONFIG_IDIOMA, search_type='websearch')
+        return queryset.filter(search_vector=query).annotate(
+            relevancia=SearchRank(F('search_vector'), query)
+        ).order_by('-relevancia', '-fecha_publicacion', '-id')
+
+
+class BusquedaSimple:
+    """
+    Backend portable para pruebas: cada término debe aparecer en algún campo y la
+    relevancia suma un peso por cada campo que coincide (título pesa más).
+    """
+
+    campos = (
+        ('titulo', 4),
+        ('empresa__nombre_empresa', 2),
+        ('descripcion', 1),
+    )
+    peso_habilidad = 2
+
+    def condiciones(self, termino):
+        from .models import OfertaHabilidad
+        for campo, peso in self.campos:
+            yield Q(**{f'{campo}__icontains': termino}), peso
+        # Exists evita el join con habilidades y, con él, las filas duplicadas
+        habilidad = Exists(OfertaHabilidad.objects.filter(
+            oferta=OuterRef('pk'), habilidad__nombre__icontains=termino
+        ))
+        yield habilidad, self.peso_habilidad
+
+    def buscar(self, queryset, texto):
+        terminos = texto.split()
+        relevancia = Value(0)
+        for termino in terminos:
+            coincide = Q()
+            for condicion, peso in self.condiciones(termino):
+                coincide |= condicion
+                relevancia = relevancia + Case(
+                    When(condicion, then=Value(peso)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            queryset = queryset.filter(coincide)
+
+        return queryset.annotate(relevancia=relevancia).order_by(
+            '-relevancia', '-fecha_publicacion', '-id'
+        )
+
+
+def get_backend():
+    ruta = getattr(settings, 'JOBS_BUSQUEDA_BACKEND', None)
+    if ruta:
+        return import_string(ruta)()
+    if connection.vendor == 'postgresql':
+        return BusquedaPostgres()
+    return BusquedaSimple()
+
+
+def buscar_ofertas(queryset, texto):
+    """Filtra y ordena por relevancia el queryset de ofertas según el texto buscado."""
+    texto = (texto or '').strip()
+    if not texto:
+        return queryset
+    return get_backend().buscar(queryset, texto)
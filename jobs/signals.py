@@ -0,0 +1,177 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from accounts import dashboard
+from accounts.models import Candidato, CandidatoHabilidad, Empresa, Habilidad
+from .models import OfertaEmpleo, OfertaHabilidad, OfertasGuardadas, Postulacion
+from .search import actualizar_vectores
+from .facets import aplicar_cambio, datos_facetas, facetas_publicadas
+from . import caching, counters, ranking
+
+"""
+Señales del módulo JOBS.
+
+Mantienen sincronizados los datos derivados de las ofertas (vector de búsqueda,
+conteos de facetas, ranking de postulantes, contadores de postulaciones, dashboard del candidato,
+caché de páginas públicas) cuando cambian las tablas de las que dependen.
+"""
+
+# --- VECTOR DE BÚSQUEDA ---
+
+@receiver(post_save, sender=OfertaEmpleo)
+def oferta_guardada_busqueda(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    actualizar_vectores(oferta_ids=[instance.pk])
+
+@receiver([post_save, post_delete], sender=OfertaHabilidad)
+def habilidad_oferta_cambiada_busqueda(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    actualizar_vectores(oferta_ids=[instance.oferta_id])
+
+@receiver(post_save, sender=Empresa)
+def empresa_guardada_busqueda(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    actualizar_vectores(empresa_id=instance.pk)
+
+@receiver(post_save, sender=Habilidad)
+def habilidad_renombrada_busqueda(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    ids = OfertaHabilidad.objects.filter(habilidad=instance).values_list('oferta_id', flat=True)
+    actualizar_vectores(oferta_ids=ids)
+
+
+# --- CONTEOS DE FACETAS ---
+
+@receiver(pre_save, sender=OfertaEmpleo)
+def oferta_antes_de_guardar_facetas(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Facetas con las que contaba la oferta antes del cambio (vacío si es nueva). La fila
+    # queda bloqueada hasta que termina el save (ver OfertaEmpleo.save y jobs/facets.py)
+    instance._facetas_previas = facetas_publicadas(datos_facetas(instance.pk, bloquear=True)) if instance.pk else {}
+
+@receiver(post_save, sender=OfertaEmpleo)
+def oferta_guardada_facetas(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previas = getattr(instance, '_facetas_previas', {})
+    aplicar_cambio(previas, facetas_publicadas(datos_facetas(instance.pk)))
+    instance._facetas_previas = {}
+
+@receiver(pre_delete, sender=OfertaEmpleo)
+def oferta_antes_de_eliminar_facetas(sender, instance, **kwargs):
+    instance._facetas_previas = facetas_publicadas(datos_facetas(instance.pk))
+
+@receiver(post_delete, sender=OfertaEmpleo)
+def oferta_eliminada_facetas(sender, instance, **kwargs):
+    aplicar_cambio(getattr(instance, '_facetas_previas', {}), {})
+
+
+# --- RANKING DE POSTULANTES ---
+# Al confirmarse la transacción: una postulación deshecha no deja puntaje y una lectura
+# concurrente no vuelve a guardar datos viejos después de invalidar
+
+@receiver(post_save, sender=Postulacion)
+def postulacion_creada_ranking(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not created:
+        return
+    transaction.on_commit(partial(ranking.agregar_postulante, instance.oferta, instance.candidato_id))
+
+@receiver(post_delete, sender=Postulacion)
+def postulacion_eliminada_ranking(sender, instance, **kwargs):
+    transaction.on_commit(partial(ranking.quitar_postulante, instance.oferta_id, instance.candidato_id))
+
+@receiver(post_save, sender=OfertaEmpleo)
+def oferta_guardada_ranking(sender, instance, raw=False, **kwargs):
+    # Salario, ciudad o modalidad pudieron cambiar: se recalcula en la próxima visita
+    transaction.on_commit(partial(ranking.invalidar, instance.pk))
+
+@receiver([post_save, post_delete], sender=OfertaHabilidad)
+def habilidad_oferta_cambiada_ranking(sender, instance, raw=False, **kwargs):
+    transaction.on_commit(partial(ranking.invalidar, instance.oferta_id))
+
+CAMPOS_AJUSTE = {'salario_esperado', 'ciudad'}
+
+@receiver(post_save, sender=Candidato)
+def candidato_guardado_ranking(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and CAMPOS_AJUSTE.isdisjoint(update_fields)):
+        return
+    transaction.on_commit(partial(ranking.invalidar_candidato, instance.pk))
+
+@receiver([post_save, post_delete], sender=CandidatoHabilidad)
+def habilidad_candidato_cambiada_ranking(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(partial(ranking.invalidar_candidato, instance.candidato_id))
+
+
+# --- CONTADORES DE POSTULACIONES ---
+
+@receiver(post_init, sender=Postulacion)
+def postulacion_cargada_contadores(sender, instance, **kwargs):
+    # Estado con el que se leyó de la BD, para saber qué contador restar si cambia.
+    # Se lee de __dict__ para no disparar una consulta si el campo está diferido.
+    instance._estado_original = instance.__dict__.get('estado') if instance.pk else None
+
+@receiver(pre_save, sender=Postulacion)
+def postulacion_antes_de_guardar_contadores(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk or getattr(instance, '_estado_original', None):
+        return
+    instance._estado_original = Postulacion.objects.filter(pk=instance.pk).values_list('estado', flat=True).first()
+
+@receiver(post_save, sender=Postulacion)
+def postulacion_guardada_contadores(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, '_estado_original', None)
+    if created:
+        counters.ajustar(instance.oferta_id, delta_total=1, **{instance.estado: 1})
+    elif anterior and anterior != instance.estado:
+        counters.ajustar(instance.oferta_id, **{anterior: -1, instance.estado: 1})
+    instance._estado_original = instance.estado
+
+@receiver(post_delete, sender=Postulacion)
+def postulacion_eliminada_contadores(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, OfertaEmpleo):
+        # Borrado en cascada: los contadores se van con la oferta
+        return
+    estado = getattr(instance, '_estado_original', None) or instance.estado
+    counters.ajustar(instance.oferta_id, delta_total=-1, **{estado: -1})
+
+
+# --- DASHBOARD DEL CANDIDATO ---
+
+@receiver([post_save, post_delete], sender=Postulacion)
+@receiver([post_save, post_delete], sender=OfertasGuardadas)
+def actividad_candidato_dashboard(sender, instance, **kwargs):
+    dashboard.invalidar(instance.candidato_id)
+
+
+# --- CACHÉ DE PÁGINAS PÚBLICAS ---
+
+@receiver([post_save, post_delete], sender=OfertaEmpleo)
+def oferta_cambiada_paginas(sender, instance, **kwargs):
+    caching.invalidar_empresas([instance.empresa_id])
+
+@receiver([post_save, post_delete], sender=OfertaHabilidad)
+def habilidad_oferta_cambiada_paginas(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, OfertaEmpleo):
+        # Borrado en cascada: ya invalida la señal de la propia oferta
+        return
+    # Las vistas ya traen la oferta (select_related o asignación); si no, una consulta
+    if OfertaHabilidad.oferta.is_cached(instance):
+        empresa_id = instance.oferta.empresa_id
+    else:
+        empresa_id = OfertaEmpleo.objects.filter(pk=instance.oferta_id).values_list('empresa_id', flat=True).first()
+    caching.invalidar_empresas([empresa_id])
+
+@receiver([post_save, post_delete], sender=Empresa)
+def empresa_cambiada_paginas(sender, instance, **kwargs):
+    caching.invalidar_empresas([instance.pk])
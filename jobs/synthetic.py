@@ -0,0 +1,667 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import DateField, DecimalField
+from django.utils import timezone
+
+"""
+Generador de datos sintéticos para pruebas de carga.
+
+Crea un conjunto completo y reproducible (misma semilla, mismos datos) de ubicaciones,
+catálogos, empresas, candidatos con su perfil, ofertas, postulaciones y ofertas
+guardadas. Las distribuciones son sesgadas como en un portal real: pocas ciudades
+concentran la mayoría de candidatos, pocas empresas publican la mayoría de ofertas y
+unas pocas ofertas "calientes" reciben decenas de miles de postulaciones (ley de Zipf).
+
+Para llegar a millones de filas en minutos:
+- Se escribe por lotes, cada uno en su propia transacción con las FK diferidas hasta el
+  COMMIT; en PostgreSQL, además, sin esperar el fsync (synchronous_commit=off).
+- Las tablas de las que se necesitan los ids (usuarios, perfiles, ofertas) van con
+  bulk_create; las tablas hoja (habilidades, idiomas, experiencia, postulaciones...) con
+  COPY en PostgreSQL e INSERT con executemany en los demás motores.
+- La memoria no crece con el tamaño: de cada entidad solo se guardan los ids (y la
+  antigüedad de las ofertas) en arreglos de numpy; las filas se generan lote a lote.
+- La contraseña se hashea una sola vez y se comparte entre todos los usuarios.
+
+bulk_create y COPY no disparan señales: los contadores de postulaciones se acumulan en
+memoria mientras se generan y al final se recalculan las facetas y los vectores de búsqueda
+y se invalida la caché de los listados.
+"""
+
+TAMANIO_LOTE = 5000
+CLAVE_USUARIOS = 'sintetico'
+DIA = 24 * 3600
+
+PAISES = [
+    ('Ecuador', 'EC'), ('Colombia', 'CO'), ('Perú', 'PE'), ('México', 'MX'), ('Chile', 'CL'),
+    ('Argentina', 'AR'), ('Bolivia', 'BO'), ('Uruguay', 'UY'), ('Paraguay', 'PY'), ('Venezuela', 'VE'),
+]
+# Centro aproximado de cada país (lat, lon): las ciudades se reparten alrededor
+CENTROS_PAISES = {
+    'EC': (-1.5, -78.4), 'CO': (4.6, -74.1), 'PE': (-9.2, -75.0), 'MX': (21.0, -101.0), 'CL': (-33.5, -70.7),
+    'AR': (-34.6, -61.0), 'BO': (-16.5, -65.0), 'UY': (-32.8, -56.0), 'PY': (-24.0, -57.5), 'VE': (8.0, -66.0),
+}
+CATEGORIAS = [
+    'Tecnología', 'Ventas', 'Salud', 'Educación', 'Finanzas', 'Marketing', 'Logística',
+    'Recursos Humanos', 'Ingeniería', 'Atención al Cliente', 'Legal', 'Diseño',
+]
+IDIOMAS = ['Español', 'Inglés', 'Portugués', 'Francés', 'Alemán', 'Italiano', 'Chino', 'Quechua']
+NIVELES_IDIOMA = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'Nativo']
+HABILIDADES = [
+    'Python', 'Java', 'JavaScript', 'SQL', 'Excel', 'Django', 'React', 'PostgreSQL', 'Docker', 'Linux',
+    'AWS', 'Git', 'C#', 'PHP', 'Power BI', 'Contabilidad', 'Ventas consultivas', 'Negociación',
+    'Atención al cliente', 'Liderazgo', 'Scrum', 'Marketing digital', 'SEO', 'Photoshop', 'Figma',
+    'Redacción', 'Logística', 'SAP', 'Kotlin', 'Swift', 'Go', 'Rust', 'TypeScript', 'Node.js',
+]
+NOMBRES = [
+    'María', 'José', 'Ana', 'Luis', 'Carmen', 'Carlos', 'Lucía', 'Jorge', 'Sofía', 'Andrés',
+    'Valeria', 'Diego', 'Camila', 'Miguel', 'Daniela', 'Juan', 'Paula', 'Fernando', 'Gabriela', 'Pedro',
+]
+APELLIDOS = [
+    'García', 'Rodríguez', 'López', 'Martínez', 'Sánchez', 'Pérez', 'Gómez', 'Torres', 'Flores', 'Vera',
+    'Castro', 'Morales', 'Ortiz', 'Ramírez', 'Herrera', 'Mendoza', 'Cedeño', 'Zambrano', 'Paredes', 'Vargas',
+]
+CARGOS = [
+    'Desarrollador Backend', 'Desarrolladora Frontend', 'Analista de Datos', 'Contador', 'Vendedor',
+    'Asistente Administrativo', 'Diseñador UX', 'Jefe de Proyecto', 'Soporte Técnico', 'Enfermera',
+    'Docente', 'Ejecutivo Comercial', 'Ingeniero Civil', 'Community Manager', 'Analista de RRHH',
+]
+SECTORES = ['Software', 'Banca', 'Retail', 'Salud', 'Educación', 'Manufactura', 'Consultoría', 'Logística']
+SUFIJOS_EMPRESA = ['S.A.', 'Cía. Ltda.', 'S.A.S.', 'Group', 'Consulting', 'Tech']
+INSTITUCIONES = [
+    'Universidad Central', 'Escuela Politécnica Nacional', 'Universidad de Guayaquil', 'Universidad Técnica',
+    'Universidad Católica', 'Instituto Tecnológico Superior', 'Colegio Nacional Mejía',
+]
+NIVELES_EDUCACION = ['Bachiller', 'Tercer Nivel', 'Tercer Nivel', 'Maestría']
+MODALIDADES = ['Presencial', 'Remoto', 'Híbrido']
+
+# Probabilidades de cada valor de los TextChoices correspondientes
+PROB_ESTADO_OFERTA = {
+    'borrador': 0.08, 'publicada': 0.60, 'pausada': 0.05, 'cerrada': 0.15, 'expirada': 0.12,
+}
+PROB_ESTADO_POSTULACION = {
+    'pendiente': 0.55, 'visto': 0.20, 'entrevista': 0.08, 'prueba_tecnica': 0.04,
+    'oferta': 0.02, 'rechazado': 0.08, 'contratado': 0.01, 'retirado': 0.02,
+}
+PROB_TIPO_CONTRATO = {
+    'tiempo_completo': 0.55, 'medio_tiempo': 0.12, 'freelance': 0.10,
+    'pasantia': 0.08, 'temporal': 0.08, 'por_proyecto': 0.07,
+}
+PROB_NIVEL_HABILIDAD = {'basico': 0.30, 'intermedio': 0.40, 'avanzado': 0.22, 'experto': 0.08}
+
+
+@dataclass
+class Escala:
+    """Cantidades a generar. Los valores por defecto dan unos 2,5 millones de filas."""
+    paises: int = 3
+    provincias_por_pais: int = 10
+    ciudades_por_provincia: int = 15
+    habilidades: int = 300
+    empresas: int = 2_000
+    candidatos: int = 100_000
+    ofertas: int = 30_000
+    postulaciones: int = 1_000_000
+    # Promedios por candidato / oferta
+    habilidades_por_candidato: float = 6
+    idiomas_por_candidato: float = 1.5
+    experiencias_por_candidato: float = 2
+    guardadas_por_candidato: float = 2
+    habilidades_por_oferta: float = 4
+    # Exponente de Zipf de la popularidad de las ofertas: con 0.7 y los valores por
+    # defecto la oferta más popular recibe más de 10.000 postulaciones
+    sesgo: float = 0.7
+
+    def escalar(self, factor):
+        """Copia con las entidades masivas multiplicadas por `factor` (catálogos iguales)."""
+        masivas = {'empresas', 'candidatos', 'ofertas', 'postulaciones'}
+        return Escala(**{
+            f.name: max(1, round(getattr(self, f.name) * factor)) if f.name in masivas else getattr(self, f.name)
+            for f in fields(self)
+        })
+
+
+def _distribucion(n, exponente):
+    """CDF de Zipf sobre n elementos (el rango 0 es el más frecuente)."""
+    pesos = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** exponente
+    cdf = np.cumsum(pesos)
+    return cdf / cdf[-1]
+
+
+def _tandas(total, tamanio):
+    for inicio in range(0, total, tamanio):
+        yield inicio, min(inicio + tamanio, total)
+
+
+class GeneradorDatos:
+    """
+    Uso:
+        generador = GeneradorDatos(Escala(), semilla=42)
+        conteos = generador.generar()
+
+    `al_progreso(tabla, filas)` se llama después de cada lote con el total acumulado
+    de la tabla. `ahora` fija la fecha de referencia (por defecto, timezone.now()).
+    """
+
+    def __init__(self, escala=None, semilla=0, tamanio_lote=TAMANIO_LOTE, al_progreso=None, ahora=None,
+                 clave=CLAVE_USUARIOS):
+        self.escala = escala or Escala()
+        self.semilla = semilla
+        self.rng = np.random.default_rng(semilla)
+        self.tamanio_lote = tamanio_lote
+        self.al_progreso = al_progreso
+        self.ahora = ahora or timezone.now()
+        self.clave = clave
+        self.prefijo = f'sint{semilla}-'
+        self.conteos = {}
+        self.usar_copy = False
+        if connection.vendor == 'postgresql':
+            # COPY ... FROM STDIN con write_row es la API de psycopg 3
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+            self.usar_copy = is_psycopg3
+
+    def ya_generado(self):
+        """Si ya existen usuarios con el prefijo de esta semilla (los nombres chocarían)."""
+        from accounts.models import Usuario
+        return Usuario.objects.filter(username__startswith=self.prefijo).exists()
+
+    def generar(self):
+        inicio = time.perf_counter()
+        self.generar_ubicaciones()
+        self.generar_catalogos()
+        self.generar_empresas()
+        self.generar_candidatos()
+        self.generar_perfiles()
+        self.generar_ofertas()
+        self.generar_postulaciones()
+        self.generar_guardadas()
+        self.reconstruir_derivados()
+        self.segundos = time.perf_counter() - inicio
+        return self.conteos
+
+    # --- Escritura ---
+
+    @contextmanager
+    def _transaccion_lote(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                    cursor.execute("SET LOCAL synchronous_commit TO OFF")
+                elif connection.vendor == 'sqlite':
+                    cursor.execute("PRAGMA defer_foreign_keys = ON")
+            yield
+
+    def _contar(self, modelo, filas):
+        tabla = modelo._meta.db_table
+        self.conteos[tabla] = self.conteos.get(tabla, 0) + filas
+        if self.al_progreso:
+            self.al_progreso(tabla, self.conteos[tabla])
+
+    def _crear(self, modelo, objetos):
+        """bulk_create de un lote; devuelve los ids asignados como arreglo de numpy."""
+        with self._transaccion_lote():
+            creados = modelo.objects.bulk_create(objetos, batch_size=self.tamanio_lote)
+        self._contar(modelo, len(creados))
+        return np.fromiter((obj.pk for obj in creados), dtype=np.int64, count=len(creados))
+
+    def _copiar(self, modelo, filas):
+        """Inserta filas (dicts por attname) de una tabla de la que no se necesitan los ids."""
+        campos = [f for f in modelo._meta.concrete_fields if not f.primary_key]
+        defectos = {f.attname: f.get_default() for f in campos}
+        qn = connection.ops.quote_name
+        tabla = qn(modelo._meta.db_table)
+        columnas = ', '.join(qn(f.column) for f in campos)
+        escritas = 0
+        with self._transaccion_lote(), connection.cursor() as cursor:
+            if self.usar_copy:
+                with cursor.cursor.copy(f'COPY {tabla} ({columnas}) FROM STDIN') as copia:
+                    for fila in filas:
+                        copia.write_row([fila.get(f.attname, defectos[f.attname]) for f in campos])
+                        escritas += 1
+            else:
+                # INSERT con executemany: evita instanciar modelos y compilar cada lote
+                conexion = connections[DEFAULT_DB_ALIAS]  # sin el proxy `connection`, que es lento por valor
+                preparar = [
+                    (f.attname, f.get_db_prep_save if isinstance(f, (DateField, DecimalField)) else None)
+                    for f in campos
+                ]
+                valores = [
+                    [
+                        prep(fila.get(nombre, defectos[nombre]), conexion) if prep else fila.get(nombre, defectos[nombre])
+                        for nombre, prep in preparar
+                    ]
+                    for fila in filas
+                ]
+                marcadores = ', '.join(['%s'] * len(campos))
+                cursor.executemany(f'INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})', valores)
+                escritas = len(valores)
+        self._contar(modelo, escritas)
+
+    # --- Utilidades de muestreo ---
+
+    def _elegir_indices(self, probabilidades, n):
+        """n posiciones de un dict {valor: probabilidad} (en el orden del dict)."""
+        pesos = np.array(list(probabilidades.values()))
+        return self.rng.choice(len(pesos), size=n, p=pesos / pesos.sum())
+
+    def _elegir(self, probabilidades, n):
+        """n valores de un dict {valor: probabilidad}."""
+        return np.array(list(probabilidades), dtype=object)[self._elegir_indices(probabilidades, n)]
+
+    def _zipf(self, cdf, n):
+        """n rangos (0 = el más popular) según la CDF de Zipf."""
+        return np.minimum(np.searchsorted(cdf, self.rng.random(n), side='right'), len(cdf) - 1)
+
+    def _por_ranking(self, ids, exponente):
+        """(cdf, destinos): destinos[rango] es el id con esa popularidad, en orden aleatorio."""
+        return _distribucion(len(ids), exponente), ids[self.rng.permutation(len(ids))]
+
+    def _cantidades(self, n, promedio, minimo=0):
+        """Cantidades por elemento con cola larga (geométrica) y el promedio pedido."""
+        extra = max(promedio - minimo, 0)
+        if extra == 0:
+            return np.full(n, minimo, dtype=np.int64)
+        return self.rng.geometric(1.0 / (extra + 1), size=n) - 1 + minimo
+
+    def _pares(self, cantidades, cdf, destinos):
+        """
+        Para cada dueño i del lote, hasta cantidades[i] destinos distintos según la
+        popularidad. Devuelve (índices de dueño, ids de destino) sin pares repetidos.
+        """
+        n = len(cdf)
+        cantidades = np.minimum(cantidades, n)
+        duenios = np.repeat(np.arange(len(cantidades), dtype=np.int64), cantidades)
+        claves = np.unique(duenios * n + self._zipf(cdf, len(duenios)))
+        return claves // n, destinos[claves % n]
+
+    def _hace(self, segundos):
+        return self.ahora - timedelta(seconds=int(segundos))
+
+    def _fecha(self, desde_anio, hasta_anio, n):
+        inicio = date(desde_anio, 1, 1).toordinal()
+        fin = date(hasta_anio, 12, 31).toordinal()
+        return [date.fromordinal(int(d)) for d in self.rng.integers(inicio, fin, size=n)]
+
+    def _nombres(self, n):
+        nombres = self.rng.integers(len(NOMBRES), size=n)
+        apellidos = self.rng.integers(len(APELLIDOS), size=(n, 2))
+        return [
+            (NOMBRES[a], f"{APELLIDOS[b]} {APELLIDOS[c]}")
+            for a, (b, c) in zip(nombres, apellidos)
+        ]
+
+    def _salarios(self, n, mediana, sin_dato):
+        salarios = np.round(self.rng.lognormal(np.log(mediana), 0.45, size=n), -1)
+        return [None if nulo else Decimal(int(s)) for s, nulo in zip(salarios, self.rng.random(n) < sin_dato)]
+
+    # --- Entidades ---
+
+    def generar_ubicaciones(self):
+        from locations.models import Ciudad, Pais, Provincia
+
+        escala = self.escala
+        paises = [Pais(nombre=nombre, codigo_iso=iso) for nombre, iso in PAISES[:escala.paises]]
+        paises_ids = self._crear(Pais, paises)
+        provincias_ids = self._crear(Provincia, [
+            Provincia(pais_id=int(pais_id), nombre=f"Provincia {i + 1} ({pais.codigo_iso})")
+            for pais_id, pais in zip(paises_ids, paises)
+            for i in range(escala.provincias_por_pais)
+        ])
+        # Provincias a ~2° del centro del país y ciudades a ~0.4° de su provincia. Generador
+        # aparte para no cambiar el resto de los datos de cada semilla.
+        rng_geo = np.random.default_rng([self.semilla, 1])
+        centros = np.repeat([CENTROS_PAISES[p.codigo_iso] for p in paises], escala.provincias_por_pais, axis=0)
+        centros = centros + rng_geo.normal(0, 2.0, centros.shape)
+        coordenadas = np.repeat(centros, escala.ciudades_por_provincia, axis=0)
+        coordenadas = np.round(coordenadas + rng_geo.normal(0, 0.4, coordenadas.shape), 5)
+        self.ciudades_ids = self._crear(Ciudad, [
+            Ciudad(provincia_id=int(provincia_id), nombre=f"Ciudad {provincia_id}-{j + 1}",
+                   latitud=float(lat), longitud=float(lon))
+            for (provincia_id, j), (lat, lon) in zip(
+                ((p, j) for p in provincias_ids for j in range(escala.ciudades_por_provincia)), coordenadas
+            )
+        ])
+        # Pocas ciudades grandes concentran la mayoría de usuarios y ofertas
+        self.ciudades_cdf, self.ciudades_destinos = self._por_ranking(self.ciudades_ids, 1.1)
+
+    def generar_catalogos(self):
+        """Categorías, habilidades e idiomas: reutiliza los que ya existen por nombre."""
+        from accounts.models import Habilidad, Idioma
+        from jobs.models import Categoria
+
+        nombres_habilidades = HABILIDADES[:self.escala.habilidades] + [
+            f"Habilidad {i + 1}" for i in range(max(self.escala.habilidades - len(HABILIDADES), 0))
+        ]
+        catalogos = [(Categoria, CATEGORIAS), (Habilidad, nombres_habilidades), (Idioma, IDIOMAS)]
+        ids = []
+        for modelo, nombres in catalogos:
+            with self._transaccion_lote():
+                modelo.objects.bulk_create([modelo(nombre=n) for n in nombres], ignore_conflicts=True)
+            ids.append(np.array(sorted(
+                modelo.objects.filter(nombre__in=nombres).values_list('pk', flat=True)
+            ), dtype=np.int64))
+            self._contar(modelo, len(ids[-1]))
+        self.categorias_ids, self.habilidades_ids, self.idiomas_ids = ids
+        self.categorias_cdf, self.categorias_destinos = self._por_ranking(self.categorias_ids, 0.8)
+        self.habilidades_cdf, self.habilidades_destinos = self._por_ranking(self.habilidades_ids, 1.0)
+        self.idiomas_cdf, self.idiomas_destinos = self._por_ranking(self.idiomas_ids, 1.2)
+
+    def _usuarios(self, tipo, desde, hasta, nombres):
+        from accounts.models import Usuario
+
+        if not hasattr(self, '_password'):
+            self._password = make_password(self.clave)
+        letra = tipo[0]
+        alta = self.rng.integers(0, 3 * 365 * DIA, size=hasta - desde)
+        return self._crear(Usuario, [
+            Usuario(
+                username=f"{self.prefijo}{letra}{i}",
+                email=f"{self.prefijo}{letra}{i}@ejemplo.test",
+                password=self._password,
+                first_name=nombre,
+                last_name=apellido,
+                tipo_usuario=tipo,
+                date_joined=self._hace(segundos),
+            )
+            for i, (nombre, apellido), segundos in zip(range(desde, hasta), nombres, alta)
+        ])
+
+    def generar_empresas(self):
+        from accounts.models import Empresa
+
+        lotes = []
+        for desde, hasta in _tandas(self.escala.empresas, self.tamanio_lote):
+            n = hasta - desde
+            usuarios = self._usuarios('empresa', desde, hasta, [('', '')] * n)
+            palabras = self.rng.integers(len(APELLIDOS), size=n)
+            sufijos = self.rng.integers(len(SUFIJOS_EMPRESA), size=n)
+            sectores = self.rng.integers(len(SECTORES), size=n)
+            ciudades = self.ciudades_destinos[self._zipf(self.ciudades_cdf, n)]
+            lotes.append(self._crear(Empresa, [
+                Empresa(
+                    usuario_id=int(usuario_id),
+                    nombre_empresa=f"{APELLIDOS[p]} {SUFIJOS_EMPRESA[s]} {i}",
+                    sector=SECTORES[sector],
+                    ciudad_id=int(ciudad_id),
+                    descripcion=f"Empresa del sector {SECTORES[sector].lower()}.",
+                )
+                for i, usuario_id, p, s, sector, ciudad_id in zip(
+                    range(desde, hasta), usuarios, palabras, sufijos, sectores, ciudades
+                )
+            ]))
+        self.empresas_ids = np.concatenate(lotes)
+
+    def generar_candidatos(self):
+        from accounts.models import Candidato, Genero
+
+        lotes = []
+        for desde, hasta in _tandas(self.escala.candidatos, self.tamanio_lote):
+            n = hasta - desde
+            nombres = self._nombres(n)
+            usuarios = self._usuarios('candidato', desde, hasta, nombres)
+            generos = self.rng.choice(Genero.values, size=n, p=[0.48, 0.48, 0.01, 0.03])
+            cargos = self.rng.integers(len(CARGOS), size=n)
+            ciudades = self.ciudades_destinos[self._zipf(self.ciudades_cdf, n)]
+            lotes.append(self._crear(Candidato, [
+                Candidato(
+                    usuario_id=int(usuario_id),
+                    nombre_completo=f"{nombre} {apellido}",
+                    fecha_nacimiento=nacimiento,
+                    genero=genero,
+                    numero_identificacion=f"{self.prefijo}{i}",
+                    titulo_profesional=CARGOS[cargo],
+                    ciudad_id=int(ciudad_id),
+                    salario_esperado=salario,
+                )
+                for i, usuario_id, (nombre, apellido), nacimiento, genero, cargo, ciudad_id, salario in zip(
+                    range(desde, hasta), usuarios, nombres, self._fecha(1965, 2004, n), generos, cargos,
+                    ciudades, self._salarios(n, 900, 0.15),
+                )
+            ]))
+        self.candidatos_ids = np.concatenate(lotes)
+
+    def _lotes_candidatos(self, promedio):
+        """Tandas de candidatos cuyo número de filas generadas ronda el tamaño de lote."""
+        tamanio = max(1, int(self.tamanio_lote / max(promedio, 1)))
+        for desde, hasta in _tandas(len(self.candidatos_ids), tamanio):
+            yield self.candidatos_ids[desde:hasta]
+
+    def generar_perfiles(self):
+        """Habilidades, idiomas, experiencia y educación de los candidatos."""
+        from accounts.models import CandidatoHabilidad, CandidatoIdioma, Educacion, ExperienciaLaboral
+
+        escala = self.escala
+        for candidatos in self._lotes_candidatos(escala.habilidades_por_candidato):
+            duenios, habilidades = self._pares(
+                self._cantidades(len(candidatos), escala.habilidades_por_candidato, minimo=1),
+                self.habilidades_cdf, self.habilidades_destinos,
+            )
+            n = len(duenios)
+            self._copiar(CandidatoHabilidad, [
+                {'candidato_id': int(candidatos[d]), 'habilidad_id': int(h), 'nivel': nivel, 'anios_experiencia': int(a)}
+                for d, h, nivel, a in zip(
+                    duenios, habilidades, self._elegir(PROB_NIVEL_HABILIDAD, n), self.rng.geometric(0.3, size=n),
+                )
+            ])
+
+        for candidatos in self._lotes_candidatos(escala.idiomas_por_candidato):
+            duenios, idiomas = self._pares(
+                self._cantidades(len(candidatos), escala.idiomas_por_candidato),
+                self.idiomas_cdf, self.idiomas_destinos,
+            )
+            niveles = self.rng.integers(len(NIVELES_IDIOMA), size=len(duenios))
+            self._copiar(CandidatoIdioma, [
+                {'candidato_id': int(candidatos[d]), 'idioma_id': int(i), 'nivel': NIVELES_IDIOMA[nivel]}
+                for d, i, nivel in zip(duenios, idiomas, niveles)
+            ])
+
+        for candidatos in self._lotes_candidatos(escala.experiencias_por_candidato):
+            duenios = np.repeat(candidatos, self._cantidades(len(candidatos), escala.experiencias_por_candidato))
+            n = len(duenios)
+            inicios = self._fecha(2005, 2023, n)
+            meses = self.rng.integers(6, 60, size=n)
+            actuales = self.rng.random(n) < 0.15
+            empresas = self.rng.integers(len(APELLIDOS), size=n)
+            cargos = self.rng.integers(len(CARGOS), size=n)
+            self._copiar(ExperienciaLaboral, [
+                {
+                    'candidato_id': int(candidato_id),
+                    'empresa': f"{APELLIDOS[e]} {SUFIJOS_EMPRESA[e % len(SUFIJOS_EMPRESA)]}",
+                    'cargo': CARGOS[c],
+                    'fecha_inicio': inicio,
+                    'fecha_fin': None if actual else min(inicio + timedelta(days=30 * int(m)), self.ahora.date()),
+                    'trabajo_actual': bool(actual),
+                }
+                for candidato_id, inicio, m, actual, e, c in zip(duenios, inicios, meses, actuales, empresas, cargos)
+            ])
+
+        for candidatos in self._lotes_candidatos(1.6):
+            duenios = np.repeat(candidatos, 1 + self.rng.binomial(2, 0.3, size=len(candidatos)))
+            n = len(duenios)
+            inicios = self._fecha(1995, 2022, n)
+            en_curso = self.rng.random(n) < 0.2
+            instituciones = self.rng.integers(len(INSTITUCIONES), size=n)
+            niveles = self.rng.integers(len(NIVELES_EDUCACION), size=n)
+            cargos = self.rng.integers(len(CARGOS), size=n)
+            self._copiar(Educacion, [
+                {
+                    'candidato_id': int(candidato_id),
+                    'institucion': INSTITUCIONES[i],
+                    'titulo': f"Formación para {CARGOS[c]}",
+                    'nivel': NIVELES_EDUCACION[nivel],
+                    'fecha_inicio': inicio,
+                    'fecha_fin': None if curso else inicio + timedelta(days=365 * 4),
+                    'estado': 'En curso' if curso else 'Graduado',
+                }
+                for candidato_id, inicio, curso, i, nivel, c in zip(duenios, inicios, en_curso, instituciones, niveles, cargos)
+            ])
+
+    def generar_ofertas(self):
+        from jobs.models import OfertaEmpleo, OfertaHabilidad
+
+        escala = self.escala
+        # Pocas empresas grandes publican la mayoría de las ofertas
+        empresas_cdf, empresas_destinos = self._por_ranking(self.empresas_ids, 1.0)
+        lotes_ids, lotes_edad, lotes_abiertas = [], [], []
+        for desde, hasta in _tandas(escala.ofertas, self.tamanio_lote):
+            n = hasta - desde
+            estados = self._elegir(PROB_ESTADO_OFERTA, n)
+            # Antigüedad de la publicación: hasta un año, más densa en lo reciente
+            edades = np.minimum(self.rng.exponential(90 * DIA, size=n), 365 * DIA).astype(np.int64)
+            vigencias = self.rng.integers(15, 90, size=n) * DIA
+            sin_expiracion = self.rng.random(n) < 0.3
+            salarios_min = self._salarios(n, 800, 0.2)
+            factores = self.rng.uniform(1.1, 1.8, size=n)
+            cargos = self.rng.integers(len(CARGOS), size=n)
+            ofertas = []
+            for i, estado, edad, vigencia, sin_fecha, salario, factor, cargo, empresa_id, categoria_id, ciudad_id, modalidad, contrato in zip(
+                range(desde, hasta), estados, edades, vigencias, sin_expiracion, salarios_min, factores, cargos,
+                empresas_destinos[self._zipf(empresas_cdf, n)],
+                self.categorias_destinos[self._zipf(self.categorias_cdf, n)],
+                self.ciudades_destinos[self._zipf(self.ciudades_cdf, n)],
+                self.rng.choice(MODALIDADES, size=n, p=[0.5, 0.2, 0.3]),
+                self._elegir(PROB_TIPO_CONTRATO, n),
+            ):
+                publicacion = self._hace(edad)
+                if estado == 'expirada':
+                    expiracion = publicacion + timedelta(seconds=int(vigencia))
+                    if expiracion > self.ahora:
+                        expiracion = self.ahora - timedelta(days=1)
+                elif estado == 'publicada' and not sin_fecha:
+                    expiracion = self.ahora + timedelta(seconds=int(vigencia))
+                else:
+                    expiracion = None
+                ofertas.append(OfertaEmpleo(
+                    empresa_id=int(empresa_id),
+                    categoria_id=int(categoria_id),
+                    ciudad_id=int(ciudad_id),
+                    titulo=f"{CARGOS[cargo]} #{i}",
+                    descripcion=f"Buscamos {CARGOS[cargo].lower()} para unirse a nuestro equipo.",
+                    tipo_contrato=contrato,
+                    modalidad=modalidad,
+                    salario_min=salario,
+                    salario_max=None if salario is None else Decimal(int(salario * Decimal(factor))),
+                    fecha_publicacion=publicacion,
+                    fecha_expiracion=expiracion,
+                    estado=estado,
+                ))
+            ids = self._crear(OfertaEmpleo, ofertas)
+            lotes_ids.append(ids)
+            lotes_edad.append(edades)
+            lotes_abiertas.append(estados != 'borrador')
+
+            duenios, habilidades = self._pares(
+                self._cantidades(n, escala.habilidades_por_oferta, minimo=1),
+                self.habilidades_cdf, self.habilidades_destinos,
+            )
+            m = len(duenios)
+            self._copiar(OfertaHabilidad, [
+                {'oferta_id': int(ids[d]), 'habilidad_id': int(h), 'nivel_requerido': nivel, 'es_obligatorio': bool(o)}
+                for d, h, nivel, o in zip(duenios, habilidades, self._elegir(PROB_NIVEL_HABILIDAD, m), self.rng.random(m) < 0.6)
+            ])
+
+        self.ofertas_ids = np.concatenate(lotes_ids)
+        abiertas = np.concatenate(lotes_abiertas)
+        # Solo se postula y se guardan ofertas que llegaron a publicarse
+        self.postulables_ids = self.ofertas_ids[abiertas]
+        self.postulables_edad = np.concatenate(lotes_edad)[abiertas]
+
+    def generar_postulaciones(self):
+        from jobs.models import Postulacion
+
+        if not len(self.postulables_ids):
+            return
+        promedio = self.escala.postulaciones / max(len(self.candidatos_ids), 1)
+        cdf = _distribucion(len(self.postulables_ids), self.escala.sesgo)
+        orden = self.rng.permutation(len(self.postulables_ids))
+        destinos, edades = self.postulables_ids[orden], self.postulables_edad[orden]
+        # Se trabaja con posiciones en `destinos` para recuperar la antigüedad de la oferta
+        # y acumular los contadores por estado sin volver a leer la tabla
+        posiciones = np.arange(len(destinos))
+        estados = list(PROB_ESTADO_POSTULACION)
+        contadores = np.zeros((len(destinos), len(estados)), dtype=np.int64)
+
+        for candidatos in self._lotes_candidatos(promedio):
+            duenios, elegidas = self._pares(self._cantidades(len(candidatos), promedio), cdf, posiciones)
+            n = len(duenios)
+            indices_estado = self._elegir_indices(PROB_ESTADO_POSTULACION, n)
+            np.add.at(contadores, (elegidas, indices_estado), 1)
+            # La postulación llega en los primeros 30 días de vida de la oferta
+            retrasos = self.rng.random(n) * np.minimum(edades[elegidas], 30 * DIA)
+            self._copiar(Postulacion, [
+                {
+                    'candidato_id': int(candidatos[d]),
+                    'oferta_id': int(destinos[p]),
+                    'fecha_postulacion': fecha,
+                    'estado': estados[e],
+                    'updated_at': fecha,
+                }
+                for d, p, e, fecha in zip(
+                    duenios, elegidas, indices_estado,
+                    (self._hace(edad - r) for edad, r in zip(edades[elegidas], retrasos)),
+                )
+            ])
+        self._escribir_contadores(destinos, estados, contadores)
+
+    def _escribir_contadores(self, ofertas_ids, estados, contadores):
+        """Counter cache de OfertaEmpleo (jobs.counters) a partir de lo generado."""
+        from .counters import CAMPO_TOTAL, campo_estado
+        from .models import OfertaEmpleo
+
+        qn = connection.ops.quote_name
+        campos = [CAMPO_TOTAL] + [campo_estado(estado) for estado in estados]
+        sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+            qn(OfertaEmpleo._meta.db_table),
+            ', '.join(f'{qn(campo)} = %s' for campo in campos),
+            qn(OfertaEmpleo._meta.pk.column),
+        )
+        con_postulaciones = np.flatnonzero(contadores.sum(axis=1))
+        for desde, hasta in _tandas(len(con_postulaciones), self.tamanio_lote):
+            filas = con_postulaciones[desde:hasta]
+            with self._transaccion_lote(), connection.cursor() as cursor:
+                cursor.executemany(sql, [
+                    [int(contadores[i].sum())] + contadores[i].tolist() + [int(ofertas_ids[i])] for i in filas
+                ])
+
+    def generar_guardadas(self):
+        from jobs.models import OfertasGuardadas
+
+        if not len(self.postulables_ids):
+            return
+        cdf, destinos = self._por_ranking(self.postulables_ids, self.escala.sesgo)
+        for candidatos in self._lotes_candidatos(self.escala.guardadas_por_candidato):
+            duenios, ofertas = self._pares(
+                self._cantidades(len(candidatos), self.escala.guardadas_por_candidato), cdf, destinos,
+            )
+            creadas = self._hace(0)
+            self._copiar(OfertasGuardadas, [
+                {'candidato_id': int(candidatos[d]), 'oferta_id': int(o), 'created_at': creadas}
+                for d, o in zip(duenios, ofertas)
+            ])
+
+    def reconstruir_derivados(self):
+        """
+        Lo que normalmente mantienen las señales: facetas, vectores de búsqueda (ofertas y
+        candidatos) y caché de páginas (los contadores de postulaciones ya se escribieron
+        al generarlas).
+        """
+        from accounts.search import actualizar_vectores as actualizar_vectores_candidatos
+        from .caching import invalidar_empresas
+        from .facets import recalcular_facetas
+        from .search import actualizar_vectores
+
+        ids = self.ofertas_ids.tolist()
+        recalcular_facetas()
+        for desde, hasta in _tandas(len(ids), self.tamanio_lote):
+            actualizar_vectores(oferta_ids=ids[desde:hasta])
+        ids = self.candidatos_ids.tolist()
+        for desde, hasta in _tandas(len(ids), self.tamanio_lote):
+            actualizar_vectores_candidatos(candidato_ids=ids[desde:hasta])
+        # Las empresas son nuevas: basta con invalidar los listados
+        invalidar_empresas()
@@ -1,3 +1,737 @@
-from django.test import TestCase
+import csv
+import io
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from functools import partial
 
-# Create your tests here.
+import numpy as np
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import (
+    Candidato, CandidatoHabilidad, CandidatoIdioma, Documento, ExperienciaLaboral, ExtraccionCV, Habilidad,
+)
+from accounts.search import contar
+from config.testing import Caso, PresupuestoConsultasMixin, sembrar_datos
+
+from . import caching, counters, matching, ranking, search, urls
+from .expiration import expirar_vencidas
+from .facets import recalcular_facetas
+from .importer import ImportadorOfertas, leer_csv
+from .models import (
+    Categoria, EstadoPostulacion, FacetaConteo, OfertaEmpleo, OfertaHabilidad, OfertasGuardadas, Postulacion,
+)
+
+
+def oferta_temporal(datos):
+    """Oferta propia para los casos que la borran o la modifican."""
+    oferta = OfertaEmpleo.objects.create(
+        empresa=datos.empresa, ciudad=datos.ciudades[0], titulo='Temporal', descripcion='Temporal', estado='publicada'
+    )
+    for habilidad in datos.habilidades[:3]:
+        OfertaHabilidad.objects.create(oferta=oferta, habilidad=habilidad)
+    return oferta
+
+
+def requisito_temporal(datos):
+    return OfertaHabilidad.objects.create(oferta=oferta_temporal(datos), habilidad=datos.habilidades[5])
+
+
+def postulacion(datos):
+    return Postulacion.objects.filter(oferta=datos.oferta).first()
+
+
+class PresupuestoVistasJobsTests(PresupuestoConsultasMixin, TestCase):
+    URLCONF = urls
+    NAMESPACE = 'jobs'
+
+    CASOS = [
+        # Panel de empresa
+        Caso('jobs:dashboard_empresa', 3, usuario='empresa'),
+        Caso('jobs:editar_perfil_empresa', 3, usuario='empresa'),
+        Caso('jobs:perfil_publico_empresa', 2, kwargs=lambda d: {'empresa_id': d.empresa.pk}),
+
+        # Gestión de ofertas
+        Caso('jobs:crear_oferta', 3, usuario='empresa'),
+        Caso('jobs:importar_ofertas', 2, usuario='empresa'),
+        Caso('jobs:editar_oferta', 5, usuario='empresa', kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+        Caso('jobs:eliminar_oferta', 15, usuario='empresa', metodo='post', estado=302, extra_postgresql=3,
+             kwargs=lambda d: {'oferta_id': oferta_temporal(d).pk}),
+        Caso('jobs:gestionar_habilidades', 5, usuario='empresa', kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+        Caso('jobs:eliminar_habilidad', 4, usuario='empresa', estado=302, extra_postgresql=1,
+             kwargs=lambda d: {'habilidad_id': requisito_temporal(d).pk}),
+
+        # Listado y detalle públicos
+        Caso('jobs:lista_ofertas', 2),
+        Caso('jobs:lista_ofertas', 3, query='q=Oferta'),
+        Caso('jobs:lista_ofertas', 2, query='modalidad=remoto&rango_salario=1000-2000'),
+        # +1 en frío: la empresa de la oferta, para la versión de la caché de páginas (jobs.caching)
+        Caso('jobs:detallar_oferta', 3, kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+        Caso('jobs:detallar_oferta', 5, usuario='candidato', nombre='jobs:detallar_oferta (candidato)',
+             kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+
+        # Candidato
+        Caso('jobs:postularse', 9, usuario='candidato', metodo='post', estado=302,
+             kwargs=lambda d: {'oferta_id': d.ofertas[20].pk}),
+        Caso('jobs:guardar_oferta', 8, usuario='candidato', metodo='post', estado=302,
+             kwargs=lambda d: {'oferta_id': d.ofertas[21].pk}),
+        Caso('jobs:mis_postulaciones', 3, usuario='candidato'),
+
+        # Postulantes
+        Caso('jobs:ver_postulantes', 5, usuario='empresa', kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+        # Ajuste: la lista de postulantes sale de la BD y los puntajes de la caché (jobs.ranking)
+        Caso('jobs:ver_postulantes', 8, usuario='empresa', query='orden=ajuste',
+             kwargs=lambda d: {'oferta_id': d.oferta.pk}),
+        Caso('jobs:cambiar_estado_postulacion', 6, usuario='empresa', metodo='post', estado=302,
+             kwargs=lambda d: {'postulacion_id': postulacion(d).pk}, datos=lambda d: {'estado': 'visto'}),
+
+        # Búsqueda de talento: catálogos de habilidades e idiomas, conteo, página y sus habilidades
+        Caso('jobs:buscar_talento', 7, usuario='empresa'),
+        Caso('jobs:buscar_talento', 7, usuario='empresa', nombre='jobs:buscar_talento (filtros)',
+             query=lambda d: f'habilidad_1={d.habilidades[0].pk}&anios_1=2&salario_min=900&q=Desarrollador'),
+    ]
+
+
+@override_settings(SQL_MUESTREO=0)
+class CachePaginasPublicasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        cache.clear()
+        caching.limpiar()
+
+    def test_segunda_visita_anonima_no_consulta_la_bd(self):
+        for url in (
+            reverse('jobs:lista_ofertas'),
+            reverse('jobs:detallar_oferta', args=[self.datos.oferta.pk]),
+            reverse('jobs:perfil_publico_empresa', args=[self.datos.empresa.pk]),
+        ):
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url)[caching.CABECERA], 'miss')
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.client.get(url)[caching.CABECERA], 'hit')
+
+    def test_cambio_en_la_oferta_invalida_sus_paginas(self):
+        detalle = reverse('jobs:detallar_oferta', args=[self.datos.oferta.pk])
+        listado = reverse('jobs:lista_ofertas')
+        self.client.get(detalle)
+        self.client.get(listado)
+
+        self.datos.oferta.titulo = 'Título nuevo'
+        self.datos.oferta.save()
+
+        for url in (detalle, listado):
+            response = self.client.get(url)
+            self.assertEqual(response[caching.CABECERA], 'miss')
+            self.assertContains(response, 'Título nuevo')
+
+    def test_usuarios_con_sesion_no_usan_la_cache(self):
+        self.client.force_login(self.datos.usuario_candidato)
+        response = self.client.get(reverse('jobs:detallar_oferta', args=[self.datos.oferta.pk]))
+        self.assertNotIn(caching.CABECERA, response)
+
+
+@override_settings(SQL_MUESTREO=0)
+class BusquedaPorRadioTests(TestCase):
+    # Quito, Guayaquil (~270 km), Cuenca (~300 km) y Sangolquí (~17 km); las dos últimas sin coordenadas
+    COORDENADAS = [(-0.18, -78.47), (-2.19, -79.89), (-2.90, -79.00), (-0.33, -78.45)]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        for ciudad, (lat, lon) in zip(cls.datos.ciudades, cls.COORDENADAS):
+            ciudad.latitud, ciudad.longitud = lat, lon
+            ciudad.save()
+        cls.cercanas = {cls.datos.ciudades[0].pk, cls.datos.ciudades[3].pk}
+
+    def setUp(self):
+        cache.clear()
+        caching.limpiar()
+
+    def test_lista_ofertas_por_radio(self):
+        response = self.client.get(reverse('jobs:lista_ofertas'), {'cerca': self.datos.ciudades[0].pk, 'radio': 30})
+        ofertas = list(response.context['ofertas'])
+        self.assertTrue(ofertas)
+        self.assertEqual({o.ciudad_id for o in ofertas}, self.cercanas)
+        self.assertEqual(
+            len(ofertas),
+            OfertaEmpleo.objects.filter(estado='publicada', ciudad_id__in=self.cercanas).count(),
+        )
+        self.assertLess(max(o.distancia_km for o in ofertas), 30)
+
+        # Ciudad sin coordenadas: ningún resultado y un aviso
+        response = self.client.get(reverse('jobs:lista_ofertas'), {'cerca': self.datos.ciudades[4].pk})
+        self.assertEqual(list(response.context['ofertas']), [])
+        self.assertContains(response, 'no tiene coordenadas')
+
+    def test_postulantes_por_radio_desde_la_ciudad_de_la_oferta(self):
+        self.client.force_login(self.datos.usuario_empresa)
+        url = reverse('jobs:ver_postulantes', args=[self.datos.oferta.pk])
+        todos = self.client.get(url).context['pagina'].paginator.count
+        for orden in ('fecha', 'ajuste'):
+            with self.subTest(orden):
+                response = self.client.get(url, {'orden': orden, 'radio': 30})
+                postulaciones = list(response.context['postulaciones'])
+                self.assertTrue(0 < len(postulaciones) < todos)
+                self.assertEqual({p.candidato.ciudad_id for p in postulaciones} - self.cercanas, set())
+
+
+class BusquedaTalentoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        cls.url = reverse('jobs:buscar_talento')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.datos.usuario_empresa)
+
+    def _ids(self, **filtros):
+        """Ids de todas las páginas, siguiendo el cursor."""
+        ids, cursor = [], None
+        while True:
+            response = self.client.get(self.url, dict(filtros, **({'cursor': cursor} if cursor else {})))
+            self.assertEqual(response.status_code, 200)
+            ids += [c.pk for c in response.context['candidatos']]
+            cursor = response.context['siguiente_cursor']
+            if not cursor:
+                return ids
+
+    def test_habilidad_con_nivel_y_anios_minimos(self):
+        # En los datos sembrados cada habilidad tiene un solo nivel: la 3 es experto, la 1 intermedio
+        habilidad = self.datos.habilidades[3]
+        esperados = set(CandidatoHabilidad.objects.filter(
+            habilidad=habilidad, nivel__in=['avanzado', 'experto'], anios_experiencia__gte=2,
+        ).values_list('candidato_id', flat=True))
+        ids = self._ids(habilidad_1=habilidad.pk, nivel_1='avanzado', anios_1=2)
+        self.assertTrue(esperados)
+        self.assertEqual(set(ids), esperados)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(self._ids(habilidad_1=self.datos.habilidades[1].pk, nivel_1='avanzado'), [])
+
+        # Dos habilidades: ambas deben cumplirse
+        otra = self.datos.habilidades[4]
+        con_otra = set(CandidatoHabilidad.objects.filter(habilidad=otra).values_list('candidato_id', flat=True))
+        ids = self._ids(habilidad_1=habilidad.pk, nivel_1='avanzado', anios_1=2, habilidad_2=otra.pk)
+        self.assertEqual(set(ids), esperados & con_otra)
+
+    def test_idioma_salario_y_radio(self):
+        idioma = CandidatoIdioma.objects.first().idioma
+        CandidatoIdioma.objects.filter(candidato__in=self.datos.candidatos[:3], idioma=idioma).update(nivel='C1')
+        esperados = set(CandidatoIdioma.objects.filter(idioma=idioma, nivel='C1').values_list('candidato_id', flat=True))
+        self.assertEqual(set(self._ids(idioma=idioma.pk, nivel_idioma='B2')),
+                         set(CandidatoIdioma.objects.filter(idioma=idioma).values_list('candidato_id', flat=True)))
+        self.assertEqual(set(self._ids(idioma=idioma.pk, nivel_idioma='C1')), esperados)
+
+        esperados = set(Candidato.objects.filter(
+            salario_esperado__gte=1000, salario_esperado__lte=1500).values_list('pk', flat=True))
+        self.assertEqual(set(self._ids(salario_min=1000, salario_max=1500)), esperados)
+        response = self.client.get(self.url, {'salario_min': 2000, 'salario_max': 1000})
+        self.assertIn('salario_max', response.context['form'].errors)
+        self.assertEqual(response.context['candidatos'], [])
+
+        quito, sangolqui = self.datos.ciudades[0], self.datos.ciudades[3]
+        for ciudad, (lat, lon) in ((quito, (-0.18, -78.47)), (sangolqui, (-0.33, -78.45))):
+            ciudad.latitud, ciudad.longitud = lat, lon
+            ciudad.save()
+        response = self.client.get(self.url, {'cerca': quito.pk, 'radio': 30})
+        self.assertEqual({c.ciudad_id for c in response.context['candidatos']}, {quito.pk, sangolqui.pk})
+        self.assertLess(max(c.distancia_km for c in response.context['candidatos']), 30)
+
+    def test_texto_en_titulo_experiencia_y_cv(self):
+        candidatos = self.datos.candidatos
+        ExperienciaLaboral.objects.create(
+            candidato=candidatos[4], empresa='Banco', cargo='Auditor interno', fecha_inicio='2020-01-01',
+        )
+        extraccion = ExtraccionCV.objects.create(sha256='a' * 64, estado='ok', texto='Auditor con NIIF', duracion_ms=1)
+        documento = Documento.objects.create(
+            candidato=candidatos[5], nombre_archivo='cv.pdf', url_archivo='cvs/cv.pdf', tipo_documento='CV',
+            sha256='a' * 64, extraccion=extraccion,
+        )
+        Candidato.objects.filter(pk=candidatos[5].pk).update(cv_actual=documento)
+
+        self.assertEqual(set(self._ids(q='auditor')), {candidatos[4].pk, candidatos[5].pk})
+        self.assertEqual(self._ids(q='auditor niif'), [candidatos[5].pk])
+        self.assertEqual(len(self._ids(q='desarrollador')), len(candidatos))
+
+    def test_conteo_acotado_y_solo_empresas(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['total'], len(self.datos.candidatos))
+        self.assertTrue(response.context['total_exacto'])
+        self.assertEqual(contar(Candidato.objects.all(), limite=5), (5, False))
+
+        self.client.force_login(self.datos.usuario_candidato)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class RankingPostulantesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        ciudades = cls.datos.ciudades
+        # Oferta sin habilidades: el componente de habilidades vale 1 para todos
+        cls.oferta = OfertaEmpleo.objects.create(
+            empresa=cls.datos.empresa, ciudad=ciudades[0], titulo='Ranking', descripcion='-',
+            modalidad='Presencial', salario_min=1000, salario_max=2000, estado='publicada',
+        )
+        cls.candidatos = cls.datos.candidatos[20:24]
+        # Misma ciudad y salario en rango; misma provincia y el doble y medio del máximo;
+        # otra provincia sin salario; sin ciudad y el doble del máximo
+        for candidato, ciudad, salario in zip(
+            cls.candidatos, (ciudades[0], ciudades[3], ciudades[1], None), (1500, 3000, None, 4000),
+        ):
+            Candidato.objects.filter(pk=candidato.pk).update(ciudad=ciudad, salario_esperado=salario)
+
+    def setUp(self):
+        cache.clear()
+
+    def _postular(self, candidato):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Postulacion.objects.create(oferta=self.oferta, candidato=candidato)
+
+    def test_calcular_ajuste(self):
+        ajustes = ranking.calcular_ajuste(self.oferta, Candidato.objects.filter(pk__in=[c.pk for c in self.candidatos]))
+        # 70 habilidades + 15 × salario + 15 × ubicación
+        self.assertEqual([ajustes[c.pk] for c in self.candidatos], [100.0, 70 + 7.5 + 7.5, 70 + 7.5, 70.0])
+
+        self.oferta.modalidad = 'Remoto'
+        ajustes = ranking.calcular_ajuste(self.oferta, Candidato.objects.filter(pk=self.candidatos[3].pk))
+        self.assertEqual(ajustes[self.candidatos[3].pk], 85.0)
+
+    def test_postulaciones_nuevas_deshechas_y_cambios_del_candidato(self):
+        primero, segundo, tercero = self.candidatos[:3]
+        self._postular(primero)
+        self.assertEqual(ranking.ajuste_postulantes(self.oferta), {primero.pk: 100.0})
+
+        # La nueva postulación se calcula al confirmarse; la lectura siguiente no recalcula nada
+        self._postular(segundo)
+        with self.assertNumQueries(1):
+            self.assertEqual(ranking.ajuste_postulantes(self.oferta), {primero.pk: 100.0, segundo.pk: 85.0})
+
+        # Una postulación deshecha no deja puntaje
+        try:
+            with transaction.atomic():
+                self._postular(tercero)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(set(ranking.ajuste_postulantes(self.oferta)), {primero.pk, segundo.pk})
+
+        # Cambia el salario del candidato: su puntaje se recalcula
+        with self.captureOnCommitCallbacks(execute=True):
+            segundo.salario_esperado = 1500
+            segundo.save()
+        self.assertEqual(ranking.ajuste_postulantes(self.oferta)[segundo.pk], 92.5)
+
+        # Y sus habilidades: la oferta ahora pide una que solo tiene el primero
+        habilidad = CandidatoHabilidad.objects.filter(candidato=primero).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            OfertaHabilidad.objects.create(oferta=self.oferta, habilidad=habilidad.habilidad, nivel_requerido='basico')
+        ajustes = ranking.ajuste_postulantes(self.oferta)
+        self.assertEqual(ranking.ordenar_por_ajuste(ajustes), [primero.pk, segundo.pk])
+        antes = ajustes[primero.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            habilidad.delete()
+        ajustes = ranking.ajuste_postulantes(self.oferta)
+        self.assertLess(ajustes[primero.pk], antes)
+        self.assertEqual(ajustes, ranking.calcular_ajuste(
+            self.oferta, Candidato.objects.filter(pk__in=[primero.pk, segundo.pk])))
+
+
+class ImportadorOfertasTests(TestCase):
+    ENCABEZADO = 'titulo,descripcion,categoria,ciudad,salario_min,salario_max,estado,habilidades\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def _importar(self, texto, **opciones):
+        importador = ImportadorOfertas(self.datos.empresa, **opciones)
+        return importador.importar(leer_csv(io.StringIO(texto, newline='')))
+
+    def test_filas_validas_y_reporte_por_fila(self):
+        texto = self.ENCABEZADO + (
+            'Analista,Datos,Tecnología,"Ciudad 0, Pichincha",1000,2000,publicada,Habilidad 1:avanzado; Rust:basico:no\n'
+            ',Sin título,,,,,,\n'
+            'Vendedor,Ventas,Ventas,Ciudad 1,3000,2000,,\n'
+            'Chofer,Rutas,Logística,,,,,\n'
+            'Enfermera,Turnos,Salud,999999,,,,\n'
+        )
+        resultado = self._importar(texto)
+        self.assertEqual((resultado.filas, resultado.creadas, resultado.habilidades_creadas), (5, 1, 1))
+        self.assertEqual(resultado.errores, [
+            (3, 'Falta el título.'),
+            (4, 'salario_min es mayor que salario_max.'),
+            (5, 'Categoría desconocida: Logística.'),
+            (6, 'No existe la ciudad con id 999999.'),
+        ])
+        oferta = OfertaEmpleo.objects.get(titulo='Analista')
+        self.assertEqual((oferta.estado, oferta.ciudad, oferta.salario_max), ('publicada', self.datos.ciudades[0], 2000))
+        self.assertEqual(
+            sorted(oferta.habilidades_requeridas.values_list('habilidad__nombre', 'nivel_requerido', 'es_obligatorio')),
+            [('Habilidad 1', 'avanzado', True), ('Rust', 'basico', False)],
+        )
+
+    def test_linea_que_csv_rechaza_no_detiene_la_importacion(self):
+        limite = csv.field_size_limit()
+        self.addCleanup(csv.field_size_limit, limite)
+        csv.field_size_limit(1000)
+        texto = self.ENCABEZADO + 'Uno,D,,,,,,\n' + f'Dos,{"x" * 2000},,,,,,\n' + 'Tres,D,,,,,,\n'
+        resultado = self._importar(texto, tamanio_lote=1)
+        self.assertEqual((resultado.filas, resultado.creadas), (3, 2))
+        self.assertEqual(resultado.errores, [(3, 'CSV inválido: field larger than field limit (1000)')])
+
+    def test_archivo_no_utf8_conserva_lo_importado(self):
+        # El texto se decodifica por bloques: las filas de los bloques anteriores al byte inválido se leen
+        filas = ''.join(f'Importada {i},D,,,,,,\n' for i in range(2000))
+        contenido = (self.ENCABEZADO + filas).encode() + 'Otra,Descripción,,,,,,\n'.encode('latin-1')
+        self.client.force_login(self.datos.usuario_empresa)
+        response = self.client.post(reverse('jobs:importar_ofertas'), {
+            'archivo': SimpleUploadedFile('ofertas.csv', contenido), 'estado': 'borrador',
+        })
+        self.assertEqual(response.status_code, 200)
+        resultado = response.context['resultado']
+        self.assertGreater(resultado.creadas, 0)
+        self.assertEqual(resultado.creadas, resultado.filas)
+        self.assertEqual(OfertaEmpleo.objects.filter(titulo__startswith='Importada ').count(), resultado.creadas)
+        self.assertEqual(resultado.errores, [
+            (resultado.filas + 2, 'Se detuvo la lectura: El archivo debe estar codificado en UTF-8.'),
+        ])
+
+    def test_comando_escribe_el_reporte(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(lambda: [os.remove(os.path.join(directorio, n)) for n in os.listdir(directorio)]
+                        and os.rmdir(directorio))
+        archivo, reporte = os.path.join(directorio, 'ofertas.csv'), os.path.join(directorio, 'reporte.csv')
+        with open(archivo, 'w', encoding='utf-8') as f:
+            f.write(self.ENCABEZADO + 'Uno,D,,,,,,\n' + 'Dos,,,,,,,\n')
+        call_command('importar_ofertas', archivo, empresa=self.datos.empresa.pk, reporte=reporte,
+                     stdout=io.StringIO())
+        with open(reporte, encoding='utf-8') as f:
+            self.assertEqual(list(csv.reader(f)), [['fila', 'error'], ['3', 'Falta la descripción.']])
+        self.assertTrue(OfertaEmpleo.objects.filter(empresa=self.datos.empresa, titulo='Uno').exists())
+
+
+def puntaje_fuerza_bruta(habilidades, requisitos):
+    """Puntaje de jobs/matching.py calculado par a par; None si el par queda descartado."""
+    total = cobertura = experiencia = 0.0
+    for habilidad, requerido, obligatorio in requisitos:
+        peso = matching.PESO_OBLIGATORIO if obligatorio else matching.PESO_OPCIONAL
+        total += peso
+        if habilidad not in habilidades:
+            if obligatorio:
+                return None
+            continue
+        nivel, anios = habilidades[habilidad]
+        cobertura += peso * min(nivel, requerido) / requerido
+        experiencia += peso * min(anios, matching.TOPE_ANIOS) / matching.TOPE_ANIOS
+    if not cobertura:
+        return None     # sin habilidades en común
+    return 100 * (cobertura + matching.PESO_EXPERIENCIA * experiencia) / ((1 + matching.PESO_EXPERIENCIA) * total)
+
+
+class MotorCoincidenciasTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = np.random.default_rng(4)
+        # Habilidades con popularidad tipo Zipf, como en el corpus sintético
+        popularidad = 1 / np.arange(1, 41)
+        popularidad /= popularidad.sum()
+
+        def elegir(cantidad):
+            return rng.choice(40, size=cantidad, replace=False, p=popularidad).tolist()
+
+        cls.candidatos = {
+            c: {h: (int(rng.integers(1, 5)), int(rng.integers(0, 15))) for h in elegir(rng.integers(1, 8))}
+            for c in range(1, 301)
+        }
+        cls.ofertas = {
+            o: [(h, int(rng.integers(1, 5)), bool(rng.random() < 0.3)) for h in elegir(rng.integers(1, 6))]
+            for o in range(1001, 1201)
+        }
+        cls.motor = matching.MotorCoincidencias(
+            [(c, h, n, a) for c, habs in cls.candidatos.items() for h, (n, a) in habs.items()],
+            [(o, h, r, obl) for o, reqs in cls.ofertas.items() for h, r, obl in reqs],
+        )
+
+    def _comparar(self, obtenido, esperado, k):
+        esperado = {i: round(p, 2) for i, p in esperado.items() if p is not None}
+        mejores = sorted(esperado.items(), key=lambda par: (-par[1], par[0]))[:k]
+        self.assertEqual([p for _, p in obtenido], [p for _, p in mejores])
+        for id_, puntaje in obtenido:
+            self.assertEqual(esperado[id_], puntaje)
+
+    def test_top_ofertas_candidato_contra_fuerza_bruta(self):
+        for candidato_id, habilidades in self.candidatos.items():
+            esperado = {o: puntaje_fuerza_bruta(habilidades, reqs) for o, reqs in self.ofertas.items()}
+            with self.subTest(candidato=candidato_id):
+                self._comparar(self.motor.top_ofertas_candidato(candidato_id, k=5), esperado, 5)
+
+    def test_top_candidatos_oferta_contra_fuerza_bruta(self):
+        for oferta_id, requisitos in self.ofertas.items():
+            esperado = {c: puntaje_fuerza_bruta(habs, requisitos) for c, habs in self.candidatos.items()}
+            with self.subTest(oferta=oferta_id):
+                self._comparar(self.motor.top_candidatos_oferta(oferta_id, k=5), esperado, 5)
+                # k mayor que las coincidencias: todas, ordenadas; coincide con puntajes_oferta
+                todos = self.motor.top_candidatos_oferta(oferta_id, k=1000)
+                self._comparar(todos, esperado, 1000)
+                self.assertEqual(dict(todos), self.motor.puntajes_oferta(oferta_id))
+
+    def test_ids_desconocidos_y_k_cero(self):
+        self.assertEqual(self.motor.top_ofertas_candidato(999999), [])
+        self.assertEqual(self.motor.top_candidatos_oferta(1), [])
+        self.assertEqual(self.motor.top_candidatos_oferta(1001, k=0), [])
+
+
+class ContadoresPostulacionesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        cls.oferta = OfertaEmpleo.objects.create(
+            empresa=cls.datos.empresa, titulo='Contadores', descripcion='-', estado='publicada',
+        )
+
+    def _contadores(self, *campos):
+        return tuple(OfertaEmpleo.objects.values_list(*campos).get(pk=self.oferta.pk))
+
+    def test_altas_cambios_de_estado_y_bajas(self):
+        primera, segunda = (
+            Postulacion.objects.create(oferta=self.oferta, candidato=c) for c in self.datos.candidatos[:2]
+        )
+        campos = ('num_postulaciones', 'num_pendiente', 'num_visto', 'num_entrevista')
+        self.assertEqual(self._contadores(*campos), (2, 2, 0, 0))
+
+        primera.estado = 'visto'
+        primera.save()
+        self.assertEqual(self._contadores(*campos), (2, 1, 1, 0))
+        # Otra instancia leída antes del cambio resta del estado con que se leyó
+        primera = Postulacion.objects.get(pk=primera.pk)
+        primera.estado = 'entrevista'
+        primera.save()
+        primera.save()      # sin cambio de estado no se toca nada
+        self.assertEqual(self._contadores(*campos), (2, 1, 0, 1))
+
+        segunda.delete()
+        primera.delete()
+        self.assertEqual(self._contadores(*campos), (0, 0, 0, 0))
+
+    def test_resta_de_un_contador_desviado_se_queda_en_cero(self):
+        postulacion = Postulacion.objects.create(oferta=self.oferta, candidato=self.datos.candidato)
+        OfertaEmpleo.objects.filter(pk=self.oferta.pk).update(num_postulaciones=0, num_pendiente=0)
+        postulacion.delete()
+        self.assertEqual(self._contadores('num_postulaciones', 'num_pendiente'), (0, 0))
+
+        counters.ajustar(self.oferta.pk, delta_total=2, pendiente=3)
+        counters.recalcular_contadores([self.oferta.pk])
+        self.assertEqual(self._contadores('num_postulaciones', 'num_pendiente'), (0, 0))
+
+    def test_editar_la_oferta_no_pisa_los_contadores(self):
+        oferta = OfertaEmpleo.objects.get(pk=self.oferta.pk)
+        Postulacion.objects.create(oferta=self.oferta, candidato=self.datos.candidato)
+        self.assertEqual(oferta.num_postulaciones, 0)     # valor en memoria desactualizado
+
+        oferta.titulo = 'Contadores editada'
+        oferta.save()
+        self.assertEqual(self._contadores('titulo', 'num_postulaciones', 'num_pendiente'),
+                         ('Contadores editada', 1, 1))
+
+        # update_fields explícito se respeta tal cual
+        oferta.num_postulaciones = 7
+        oferta.save(update_fields=['num_postulaciones'])
+        self.assertEqual(self._contadores('num_postulaciones'), (7,))
+
+    def test_cada_estado_tiene_su_contador(self):
+        columnas = {f.name for f in OfertaEmpleo._meta.concrete_fields}
+        self.assertLessEqual(counters.campos_contadores(), columnas)
+        self.assertEqual(len(counters.campos_contadores()), len(EstadoPostulacion.values) + 1)
+
+    def test_borrar_una_oferta_no_consulta_por_cada_postulacion(self):
+        def consultas_al_borrar(postulantes):
+            oferta = OfertaEmpleo.objects.create(empresa=self.datos.empresa, titulo='Se borra',
+                                                 descripcion='-', estado='publicada')
+            Postulacion.objects.bulk_create([Postulacion(oferta=oferta, candidato=c) for c in postulantes])
+            OfertasGuardadas.objects.bulk_create([OfertasGuardadas(oferta=oferta, candidato=c) for c in postulantes])
+            with CaptureQueriesContext(connection) as consultas:
+                oferta.delete()
+            self.assertFalse(Postulacion.objects.filter(oferta_id=oferta.pk).exists())
+            return len(consultas)
+
+        self.assertEqual(consultas_al_borrar(self.datos.candidatos[:2]), consultas_al_borrar(self.datos.candidatos))
+
+
+class BusquedaOfertasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        crear = partial(OfertaEmpleo.objects.create, empresa=cls.datos.empresa, estado='publicada')
+        cls.por_titulo = crear(titulo='Desarrollador Kotlin senior', descripcion='Equipo móvil')
+        cls.por_habilidad = crear(titulo='Ingeniero móvil', descripcion='Apps Android')
+        OfertaHabilidad.objects.create(oferta=cls.por_habilidad, habilidad=Habilidad.objects.create(nombre='Kotlin'))
+        cls.por_descripcion = crear(titulo='Analista QA', descripcion='Pruebas automatizadas en kotlin')
+        crear(titulo='Kotlin en borrador', descripcion='-', estado='borrador')
+
+    def setUp(self):
+        cache.clear()
+        caching.limpiar()
+
+    def _buscar(self, q):
+        return list(self.client.get(reverse('jobs:lista_ofertas'), {'q': q}).context['ofertas'])
+
+    @override_settings(JOBS_BUSQUEDA_BACKEND='jobs.search.BusquedaSimple')
+    def test_backend_simple_pondera_titulo_habilidad_y_descripcion(self):
+        self.assertEqual(self._buscar('KOTLIN'), [self.por_titulo, self.por_habilidad, self.por_descripcion])
+        # Cada término debe aparecer en algún campo
+        self.assertEqual(self._buscar('kotlin senior'), [self.por_titulo])
+        self.assertEqual(self._buscar('kotlin automatizadas'), [self.por_descripcion])
+        self.assertEqual(self._buscar('cobol'), [])
+
+    def test_eleccion_del_backend(self):
+        with override_settings(JOBS_BUSQUEDA_BACKEND='jobs.search.BusquedaPostgres'):
+            self.assertIsInstance(search.get_backend(), search.BusquedaPostgres)
+        with override_settings(JOBS_BUSQUEDA_BACKEND=None):
+            esperado = search.BusquedaPostgres if connection.vendor == 'postgresql' else search.BusquedaSimple
+            self.assertIsInstance(search.get_backend(), esperado)
+
+
+class FacetasIncrementalesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def _conteos(self):
+        filas = FacetaConteo.objects.filter(total__gt=0).values_list('faceta', 'valor', 'total')
+        return {(faceta, valor): total for faceta, valor, total in filas}
+
+    def assertIgualAlRecalculo(self):
+        incrementales = self._conteos()
+        recalcular_facetas()
+        self.assertEqual(incrementales, self._conteos())
+
+    def test_las_senales_mantienen_los_conteos(self):
+        recalcular_facetas()
+        oferta = self.datos.ofertas[0]
+        ciudades, categorias = self.datos.ciudades, self.datos.categorias
+
+        oferta.categoria = categorias[2] if oferta.categoria != categorias[2] else categorias[1]
+        oferta.ciudad = ciudades[4]
+        oferta.save()
+        self.assertIgualAlRecalculo()
+
+        oferta.estado = 'borrador'
+        oferta.save()
+        self.assertIgualAlRecalculo()
+
+        oferta.estado = 'publicada'
+        oferta.salario_min, oferta.salario_max = 2500, 2800
+        oferta.save()
+        self.assertIgualAlRecalculo()
+
+        # update_fields: cuenta lo que quedó en la BD, no lo que hay en memoria sin guardar
+        oferta.modalidad = 'Remoto'
+        oferta.categoria = categorias[0]
+        oferta.save(update_fields=['modalidad'])
+        self.assertIgualAlRecalculo()
+        self.assertEqual(self._conteos()[('modalidad', 'remoto')],
+                         OfertaEmpleo.objects.filter(estado='publicada', modalidad__iexact='remoto').count())
+
+        nueva = OfertaEmpleo.objects.create(empresa=self.datos.empresa, categoria=categorias[1], ciudad=ciudades[2],
+                                            titulo='Nueva', descripcion='-', estado='publicada')
+        self.assertIgualAlRecalculo()
+        nueva.delete()
+        oferta.delete()
+        self.assertIgualAlRecalculo()
+
+
+class ExpiracionOfertasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+        # Categoría propia: su faceta solo cuenta las ofertas de esta prueba
+        cls.categoria = Categoria.objects.create(nombre='Temporal')
+        ahora = timezone.now()
+        cls.vencidas = [cls._oferta(f'Vencida {i}', ahora - timedelta(days=i + 1)) for i in range(3)]
+        cls.vigente = cls._oferta('Vigente', ahora + timedelta(days=1))
+        cls.sin_fecha = cls._oferta('Sin fecha', None)
+        cls.borrador = cls._oferta('Borrador vencido', ahora - timedelta(days=1), estado='borrador')
+
+    @classmethod
+    def _oferta(cls, titulo, expiracion, estado='publicada'):
+        return OfertaEmpleo.objects.create(
+            empresa=cls.datos.empresa, categoria=cls.categoria, titulo=titulo, descripcion='-',
+            fecha_expiracion=expiracion, estado=estado,
+        )
+
+    def _total_faceta(self):
+        return FacetaConteo.objects.get(faceta='categoria', valor=str(self.categoria.pk)).total
+
+    def _estados(self):
+        return dict(OfertaEmpleo.objects.filter(categoria=self.categoria).values_list('titulo', 'estado'))
+
+    def test_expira_las_vencidas_por_lotes_y_descuenta_facetas(self):
+        self.assertEqual(self._total_faceta(), 5)
+        self.assertEqual(expirar_vencidas(tamanio_lote=2), (3, 2))
+        self.assertEqual(self._estados(), {
+            'Vencida 0': 'expirada', 'Vencida 1': 'expirada', 'Vencida 2': 'expirada',
+            'Vigente': 'publicada', 'Sin fecha': 'publicada', 'Borrador vencido': 'borrador',
+        })
+        self.assertEqual(self._total_faceta(), 2)
+        # Idempotente: nada más que expirar
+        self.assertEqual(expirar_vencidas(), (0, 0))
+        self.assertEqual(self._total_faceta(), 2)
+
+    def test_max_lotes_y_fecha_de_corte(self):
+        self.assertEqual(expirar_vencidas(tamanio_lote=1, max_lotes=1), (1, 1))
+        # Se expiran primero las más antiguas
+        self.assertEqual(self._estados()['Vencida 2'], 'expirada')
+        self.assertEqual(self._total_faceta(), 4)
+
+        # Con un corte en el futuro también vence la vigente, nunca la que no tiene fecha
+        self.assertEqual(expirar_vencidas(ahora=timezone.now() + timedelta(days=2)), (3, 1))
+        self.assertEqual(self._estados()['Vigente'], 'expirada')
+        self.assertEqual(self._estados()['Sin fecha'], 'publicada')
+        self.assertEqual(self._total_faceta(), 1)
+
+
+class CacheLRUTests(SimpleTestCase):
+    def test_una_sola_regeneracion_con_peticiones_simultaneas(self):
+        almacen = caching.CacheLRU()
+        llamadas = []
+
+        def calcular():
+            llamadas.append(1)
+            time.sleep(0.1)
+            return 'pagina', 6
+
+        resultados = []
+        hilos = [
+            threading.Thread(target=lambda: resultados.append(almacen.obtener_o_calcular('clave', calcular, 60)))
+            for _ in range(20)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual({valor for valor, _ in resultados}, {'pagina'})
+
+    def test_desaloja_las_menos_usadas_al_pasar_el_limite(self):
+        almacen = caching.CacheLRU(max_bytes=250)
+        for clave in ('a', 'b', 'c'):
+            almacen.set(clave, clave, 60, 100)
+        self.assertIsNone(almacen.get('a'))
+        self.assertEqual(almacen.get('b'), 'b')
+        self.assertLessEqual(almacen.bytes, 250)
@@ -11,6 +11,7 @@ urlpatterns = [
 
     # --- GESTIÓN DE OFERTAS ---
     path('ofertas/crear/', views.crear_oferta, name='crear_oferta'),
+    path('ofertas/importar/', views.importar_ofertas, name='importar_ofertas'),
     path('ofertas/editar/<int:oferta_id>/', views.editar_oferta, name='editar_oferta'),
     path('ofertas/eliminar/<int:oferta_id>/', views.eliminar_oferta, name='eliminar_oferta'),
 
@@ -26,6 +27,7 @@ urlpatterns = [
     # --- GESTIÓN DE POSTULANTES ---
     path('empresa/oferta/<int:oferta_id>/postulantes/', views.ver_postulantes, name='ver_postulantes'),
     path('postulacion/<int:postulacion_id>/estado/', views.cambiar_estado_postulacion, name='cambiar_estado_postulacion'),
+    path('empresa/talento/', views.buscar_talento, name='buscar_talento'),
 
     # --- OTRAS FUNCIONES (Sincronización manual del usuario) ---
     path('ofertas/<int:oferta_id>/guardar/', views.guardar_oferta, name='guardar_oferta'),
@@ -1,32 +1,55 @@
+import io
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.db.models import Prefetch
 from .models import Empresa, OfertaEmpleo, OfertaHabilidad, Postulacion, EstadoPostulacion, OfertasGuardadas
-from .forms import EmpresaForm, OfertaEmpleoForm, OfertaHabilidadForm
-from accounts.models import Candidato
+from .forms import (
+    BusquedaRadioForm, BusquedaTalentoForm, EmpresaForm, ImportarOfertasForm, OfertaEmpleoForm, OfertaHabilidadForm,
+)
+from accounts.models import Candidato, CandidatoHabilidad
+from accounts.search import contar, filtrar_candidatos
+from .pagination import paginar_por_cursor, paginar_por_id
+from .search import buscar_ofertas
+from . import ranking
+from .caching import ambitos_empresa, ambitos_listado, ambitos_oferta, cache_publica
+from .importer import LECTORES, ImportadorOfertas, detectar_formato
+from .facets import enlazar_facetas, filtrar_por_facetas, leer_facetas, leer_seleccion
+
+OFERTAS_POR_PAGINA = 20
+POSTULANTES_POR_PAGINA = 50
+TALENTO_POR_PAGINA = 20
 
 # --- GESTIÓN DE EMPRESA ---
 
+def _empresa_o_404(usuario):
+    # perfil_empresa ya viene cargado con el usuario (accounts/backends.py): sin consulta
+    try:
+        return usuario.perfil_empresa
+    except Empresa.DoesNotExist:
+        raise Http404("El usuario no tiene perfil de empresa.")
+
 @login_required
 def dashboard_empresa(request):
     """Panel principal de la empresa con sus ofertas."""
     try:
-        empresa = Empresa.objects.get(usuario=request.user)
+        empresa = request.user.perfil_empresa
     except Empresa.DoesNotExist:
         return redirect('jobs:editar_perfil_empresa')
 
+    # Los conteos de postulantes vienen de los contadores de OfertaEmpleo (jobs.counters)
     ofertas = OfertaEmpleo.objects.filter(empresa=empresa).order_by('-fecha_publicacion')
-    # Añadimos el conteo de postulantes
-    for oferta in ofertas:
-        oferta.num_postulantes = oferta.postulaciones.count()
-        
+
     return render(request, 'jobs/dashboard_empresa.html', {'ofertas': ofertas, 'empresa': empresa})
 
 @login_required
 def editar_perfil_empresa(request):
     """Permite a la empresa editar sus datos públicos."""
     try:
-        empresa = Empresa.objects.get(usuario=request.user)
+        empresa = request.user.perfil_empresa
     except Empresa.DoesNotExist:
         empresa = None # Caso nuevo usuario empresa
 
@@ -43,10 +66,11 @@ def editar_perfil_empresa(request):
 
     return render(request, 'jobs/editar_empresa.html', {'form': form})
 
+@cache_publica(ambitos_empresa)
 def perfil_publico_empresa(request, empresa_id):
     """Vista pública para que los candidatos vean la info de la empresa."""
-    empresa = get_object_or_404(Empresa, id=empresa_id)
-    ofertas_activas = OfertaEmpleo.objects.filter(empresa=empresa, estado='publicada')
+    empresa = get_object_or_404(Empresa.objects.select_related('ciudad__provincia'), id=empresa_id)
+    ofertas_activas = OfertaEmpleo.objects.filter(empresa=empresa, estado='publicada').select_related('ciudad__provincia')
     return render(request, 'jobs/perfil_publico.html', {'empresa': empresa, 'ofertas': ofertas_activas})
 
 # --- GESTIÓN DE OFERTAS ---
@@ -54,7 +78,7 @@ def perfil_publico_empresa(request, empresa_id):
 @login_required
 def crear_oferta(request):
     try:
-        empresa = Empresa.objects.get(usuario=request.user)
+        empresa = request.user.perfil_empresa
     except Empresa.DoesNotExist:
         messages.error(request, 'Debes completar tu perfil de empresa antes de publicar ofertas.')
         return redirect('jobs:editar_perfil_empresa')
@@ -72,9 +96,35 @@ def crear_oferta(request):
 
     return render(request, 'jobs/crear_oferta.html', {'form': form, 'titulo': 'Crear Nueva Oferta'})
 
+@login_required
+def importar_ofertas(request):
+    """Carga masiva de ofertas desde un archivo CSV o JSONL (ver jobs/importer.py)."""
+    try:
+        empresa = request.user.perfil_empresa
+    except Empresa.DoesNotExist:
+        messages.error(request, 'Debes completar tu perfil de empresa antes de publicar ofertas.')
+        return redirect('jobs:editar_perfil_empresa')
+
+    resultado = None
+    if request.method == 'POST':
+        form = ImportarOfertasForm(request.POST, request.FILES)
+        if form.is_valid():
+            subido = form.cleaned_data['archivo']
+            leer = LECTORES[detectar_formato(subido.name)]
+            # El archivo subido se recorre como texto línea a línea, sin leerlo entero
+            archivo = io.TextIOWrapper(subido.file, encoding='utf-8-sig', newline='')
+            importador = ImportadorOfertas(empresa, estado_por_defecto=form.cleaned_data['estado'])
+            # Los errores de lectura (CSV inválido, no UTF-8) vienen en el resultado
+            resultado = importador.importar(leer(archivo))
+            messages.success(request, f'{resultado.creadas} ofertas importadas de {resultado.filas} filas.')
+    else:
+        form = ImportarOfertasForm()
+
+    return render(request, 'jobs/importar_ofertas.html', {'form': form, 'resultado': resultado})
+
 @login_required
 def editar_oferta(request, oferta_id):
-    empresa = get_object_or_404(Empresa, usuario=request.user)
+    empresa = _empresa_o_404(request.user)
     oferta = get_object_or_404(OfertaEmpleo, id=oferta_id, empresa=empresa)
 
     if request.method == 'POST':
@@ -90,7 +140,7 @@ def editar_oferta(request, oferta_id):
 
 @login_required
 def eliminar_oferta(request, oferta_id):
-    empresa = get_object_or_404(Empresa, usuario=request.user)
+    empresa = _empresa_o_404(request.user)
     oferta = get_object_or_404(OfertaEmpleo, id=oferta_id, empresa=empresa)
     
     if request.method == 'POST':
@@ -103,9 +153,9 @@ def eliminar_oferta(request, oferta_id):
 
 @login_required
 def gestionar_habilidades(request, oferta_id):
-    empresa = get_object_or_404(Empresa, usuario=request.user)
+    empresa = _empresa_o_404(request.user)
     oferta = get_object_or_404(OfertaEmpleo, id=oferta_id, empresa=empresa)
-    habilidades_asignadas = oferta.habilidades_requeridas.all()
+    habilidades_asignadas = oferta.habilidades_requeridas.select_related('habilidad')
 
     if request.method == 'POST':
         form = OfertaHabilidadForm(request.POST)
@@ -130,8 +180,8 @@ def gestionar_habilidades(request, oferta_id):
 
 @login_required
 def eliminar_habilidad(request, habilidad_id):
-    habilidad_rel = get_object_or_404(OfertaHabilidad, id=habilidad_id)
-    if habilidad_rel.oferta.empresa.usuario != request.user:
+    habilidad_rel = get_object_or_404(OfertaHabilidad.objects.select_related('oferta__empresa'), id=habilidad_id)
+    if habilidad_rel.oferta.empresa.usuario_id != request.user.id:
         messages.error(request, "No tienes permiso para realizar esta acción.")
         return redirect('jobs:dashboard_empresa')
     
@@ -142,14 +192,66 @@ def eliminar_habilidad(request, habilidad_id):
 
 # --- FLUJO DE CANDIDATO ---
 
+@cache_publica(ambitos_listado)
 def lista_ofertas(request):
-    """Listado público de ofertas."""
-    ofertas = OfertaEmpleo.objects.filter(estado='publicada').order_by('-fecha_publicacion')
-    return render(request, 'jobs/lista_ofertas.html', {'ofertas': ofertas})
+    """
+    Listado público de ofertas.
+
+    Sin búsqueda se pagina por cursor sobre (fecha_publicacion, id). Con `q` se
+    muestran los resultados ordenados por relevancia, paginados por número.
+    Los filtros de faceta se aplican en ambos modos; sus conteos salen de FacetaConteo.
+    Con `cerca=<ciudad>` (y `radio` en km) solo quedan las ofertas de las ciudades
+    dentro del radio (locations.geo).
+    """
+    ofertas = OfertaEmpleo.objects.filter(estado='publicada').select_related(
+        'empresa', 'ciudad', 'ciudad__provincia'
+    )
+    q = request.GET.get('q', '').strip()
+    seleccion = leer_seleccion(request.GET)
+    ofertas = filtrar_por_facetas(ofertas, seleccion)
+    radio_form = BusquedaRadioForm(request.GET)
+    distancias = radio_form.distancias()
+    if distancias is not None:
+        ofertas = ofertas.filter(ciudad_id__in=list(distancias))
+
+    # Querystring de los filtros activos, para conservarlos al paginar
+    filtros = request.GET.copy()
+    for param in ('cursor', 'page'):
+        filtros.pop(param, None)
+
+    contexto = {
+        'q': q,
+        'facetas': enlazar_facetas(leer_facetas(seleccion), request.GET),
+        'seleccion': seleccion,
+        'filtros_qs': filtros.urlencode(),
+        'radio_form': radio_form,
+    }
+
+    if q:
+        paginator = Paginator(buscar_ofertas(ofertas, q), OFERTAS_POR_PAGINA)
+        pagina = paginator.get_page(request.GET.get('page'))
+        contexto.update({'ofertas': pagina.object_list, 'pagina': pagina})
+    else:
+        ofertas, siguiente_cursor = paginar_por_cursor(
+            ofertas, request.GET.get('cursor'), por_pagina=OFERTAS_POR_PAGINA
+        )
+        contexto.update({'ofertas': ofertas, 'siguiente_cursor': siguiente_cursor})
+
+    if distancias:
+        for oferta in contexto['ofertas']:
+            oferta.distancia_km = distancias.get(oferta.ciudad_id)
 
+    return render(request, 'jobs/lista_ofertas.html', contexto)
+
+@cache_publica(ambitos_oferta)
 def detallar_oferta(request, oferta_id):
     """Detalle de la oferta y botón de postulación."""
-    oferta = get_object_or_404(OfertaEmpleo, id=oferta_id)
+    oferta = get_object_or_404(
+        OfertaEmpleo.objects.select_related('empresa', 'ciudad__provincia').prefetch_related(
+            Prefetch('habilidades_requeridas', OfertaHabilidad.objects.select_related('habilidad'))
+        ),
+        id=oferta_id,
+    )
     ya_postulado = False
     
     if request.user.is_authenticated and request.user.tipo_usuario == 'candidato':
@@ -205,20 +307,95 @@ def mis_postulaciones(request):
 
 @login_required
 def ver_postulantes(request, oferta_id):
-    empresa = get_object_or_404(Empresa, usuario=request.user)
-    oferta = get_object_or_404(OfertaEmpleo, id=oferta_id, empresa=empresa)
-    postulaciones = oferta.postulaciones.select_related('candidato', 'candidato__usuario').order_by('-fecha_postulacion')
-    
+    """
+    Postulantes de una oferta, paginados. Con `orden=ajuste` se ordenan por el ajuste
+    calculado en jobs.ranking (en caché por oferta) en lugar de por fecha.
+    Con `radio` (km) solo se muestran los candidatos que viven a esa distancia de la
+    ciudad de la oferta, o de `cerca=<ciudad>` si se indica.
+    """
+    empresa = _empresa_o_404(request.user)
+    oferta = get_object_or_404(OfertaEmpleo.objects.select_related('ciudad__provincia'), id=oferta_id, empresa=empresa)
+    postulaciones = oferta.postulaciones.select_related('candidato', 'candidato__usuario')
+    orden = 'ajuste' if request.GET.get('orden') == 'ajuste' else 'fecha'
+    radio_form = BusquedaRadioForm(request.GET)
+    distancias = radio_form.distancias(ciudad_defecto=oferta.ciudad_id)
+    if distancias is not None:
+        postulaciones = postulaciones.filter(candidato__ciudad_id__in=list(distancias))
+
+    if orden == 'ajuste':
+        puntajes = ranking.ajuste_postulantes(oferta)
+        if distancias is not None:
+            cercanos = set(postulaciones.values_list('candidato_id', flat=True))
+            puntajes = {candidato_id: p for candidato_id, p in puntajes.items() if candidato_id in cercanos}
+        pagina = Paginator(ranking.ordenar_por_ajuste(puntajes), POSTULANTES_POR_PAGINA).get_page(request.GET.get('page'))
+        por_candidato = {p.candidato_id: p for p in postulaciones.filter(candidato_id__in=pagina.object_list)}
+        lista = []
+        for candidato_id in pagina.object_list:
+            postulacion = por_candidato.get(candidato_id)
+            if postulacion:
+                postulacion.ajuste = puntajes[candidato_id]
+                lista.append(postulacion)
+    else:
+        pagina = Paginator(postulaciones.order_by('-fecha_postulacion', '-id'), POSTULANTES_POR_PAGINA).get_page(request.GET.get('page'))
+        lista = pagina.object_list
+
+    if distancias:
+        for postulacion in lista:
+            postulacion.distancia_km = distancias.get(postulacion.candidato.ciudad_id)
+
+    # Querystring del filtro por radio, para conservarlo al cambiar de orden o de página
+    filtros = request.GET.copy()
+    for param in ('orden', 'page'):
+        filtros.pop(param, None)
+
     return render(request, 'jobs/ver_postulantes.html', {
         'oferta': oferta,
-        'postulaciones': postulaciones,
+        'postulaciones': lista,
+        'pagina': pagina,
+        'orden': orden,
+        'radio_form': radio_form,
+        'filtros_qs': filtros.urlencode(),
         'estados': EstadoPostulacion.choices
     })
 
+@login_required
+def buscar_talento(request):
+    """
+    Búsqueda de candidatos para empresas (accounts.search): habilidades con nivel y
+    años mínimos, idioma, radio alrededor de una ciudad, salario esperado y texto libre.
+    Paginada por cursor (id descendente) y con el total contado hasta un límite.
+    """
+    _empresa_o_404(request.user)
+    form = BusquedaTalentoForm(request.GET)
+    filtros = form.filtros()
+
+    contexto = {'form': form, 'candidatos': [], 'total': 0, 'total_exacto': True}
+    if filtros is not None:
+        candidatos = filtrar_candidatos(Candidato.objects.all(), filtros)
+        total, exacto = contar(candidatos)
+        pagina, siguiente_cursor = paginar_por_id(
+            candidatos.select_related('ciudad__provincia').prefetch_related(
+                Prefetch('habilidades', CandidatoHabilidad.objects.select_related('habilidad').order_by('-anios_experiencia'))
+            ),
+            request.GET.get('cursor'), por_pagina=TALENTO_POR_PAGINA,
+        )
+        if filtros.distancias:
+            for candidato in pagina:
+                candidato.distancia_km = filtros.distancias.get(candidato.ciudad_id)
+        contexto.update({
+            'candidatos': pagina, 'siguiente_cursor': siguiente_cursor, 'total': total, 'total_exacto': exacto,
+        })
+
+    # Querystring de los filtros activos, para conservarlos al paginar
+    filtros_qs = request.GET.copy()
+    filtros_qs.pop('cursor', None)
+    contexto['filtros_qs'] = filtros_qs.urlencode()
+    return render(request, 'jobs/buscar_talento.html', contexto)
+
 @login_required
 def cambiar_estado_postulacion(request, postulacion_id):
-    postulacion = get_object_or_404(Postulacion, id=postulacion_id)
-    if postulacion.oferta.empresa.usuario != request.user:
+    postulacion = get_object_or_404(Postulacion.objects.select_related('oferta__empresa'), id=postulacion_id)
+    if postulacion.oferta.empresa.usuario_id != request.user.id:
         messages.error(request, 'No tienes permiso para gestionar esta postulación.')
         return redirect('jobs:dashboard_empresa')
         
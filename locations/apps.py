@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class LocationsConfig(AppConfig):
     name = 'locations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
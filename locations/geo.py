@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from . import hierarchy
+
+"""
+Búsqueda por radio ("ofertas a menos de 30 km") sobre las coordenadas de Ciudad.
+
+Las ciudades con coordenadas se cargan una vez en un árbol k-d (scipy) sobre sus
+vectores unitarios en 3D: la distancia en línea recta (cuerda) crece con la distancia
+sobre la esfera, así que "a menos de R km" es una consulta de bola con la cuerda
+equivalente, sin problemas en el antimeridiano ni cerca de los polos. Los candidatos
+del árbol se refinan con haversine vectorizado (numpy), que da la distancia exacta.
+
+El resultado es {ciudad_id: km}; las vistas filtran con ciudad_id IN (...), que usa
+el índice de la clave foránea. El árbol sigue la generación de locations.hierarchy:
+cualquier cambio en las ubicaciones (señales de locations/signals.py) lo reconstruye.
+"""
+
+RADIO_TIERRA_KM = 6371.0088
+RADIOS_KM = (10, 30, 50, 100, 250)
+RADIO_POR_DEFECTO_KM = 30
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Distancia en km desde (lat, lon) a cada punto de los arreglos lats/lons (grados)."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _vectores(lats, lons):
+    lats, lons = np.radians(lats), np.radians(lons)
+    return np.column_stack((np.cos(lats) * np.cos(lons), np.cos(lats) * np.sin(lons), np.sin(lats)))
+
+
+class IndiceCiudades:
+    """Coordenadas de todas las ciudades y su árbol k-d. Inmutable una vez construido."""
+
+    def __init__(self, filas):
+        filas = list(filas)
+        self.ids = np.array([f[0] for f in filas], dtype=np.int64)
+        self.lats = np.array([f[1] for f in filas], dtype=np.float64)
+        self.lons = np.array([f[2] for f in filas], dtype=np.float64)
+        self.posiciones = {int(ciudad_id): i for i, ciudad_id in enumerate(self.ids)}
+        self.arbol = cKDTree(_vectores(self.lats, self.lons)) if filas else None
+
+    def coordenadas(self, ciudad_id):
+        i = self.posiciones.get(ciudad_id)
+        return None if i is None else (self.lats[i], self.lons[i])
+
+    def en_radio(self, lat, lon, radio_km):
+        """{ciudad_id: km} de las ciudades a `radio_km` o menos de (lat, lon), por distancia."""
+        if self.arbol is None or radio_km < 0:
+            return {}
+        cuerda = 2 * np.sin(min(radio_km / RADIO_TIERRA_KM, np.pi) / 2)
+        # Margen mínimo para no perder por redondeo las que están justo en el borde
+        candidatas = np.array(self.arbol.query_ball_point(_vectores([lat], [lon])[0], cuerda * (1 + 1e-9)), dtype=np.int64)
+        if not len(candidatas):
+            return {}
+        distancias = haversine_km(lat, lon, self.lats[candidatas], self.lons[candidatas])
+        dentro = distancias <= radio_km
+        candidatas, distancias = candidatas[dentro], distancias[dentro]
+        orden = np.argsort(distancias, kind='stable')
+        return {int(self.ids[i]): float(d) for i, d in zip(candidatas[orden], distancias[orden])}
+
+
+_indice = None
+_generacion = None
+_lock = threading.Lock()
+
+
+def indice():
+    """Índice vigente; se reconstruye (una consulta) si cambió la generación de las ubicaciones."""
+    global _indice, _generacion
+    from .models import Ciudad
+
+    with _lock:
+        generacion = hierarchy.generacion_actual()
+        if _indice is None or generacion != _generacion:
+            _indice = IndiceCiudades(
+                Ciudad.objects.filter(latitud__isnull=False, longitud__isnull=False)
+                .order_by('id').values_list('id', 'latitud', 'longitud')
+            )
+            _generacion = generacion
+        return _indice
+
+
+def ciudades_cerca_de(ciudad_id, radio_km):
+    """{ciudad_id: km} alrededor de una ciudad, o None si esa ciudad no tiene coordenadas."""
+    actual = indice()
+    centro = actual.coordenadas(ciudad_id)
+    if centro is None:
+        return None
+    return actual.en_radio(*centro, radio_km)
+
@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import json
+import secrets
+import threading
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+"""
+Árbol País > Provincia > Ciudad precalculado en memoria del proceso.
+
+El catálogo de ubicaciones casi nunca cambia, así que se arma una sola vez (tres
+consultas) y se guarda ya serializado: el JSON, su versión comprimida con gzip y un
+ETag fuerte (hash del contenido). Los endpoints lo sirven sin tocar la BD y los
+selectores de ciudad (static/js/locations.js) lo reutilizan sin volver a pedirlo.
+
+Hay un documento con todos los países y, bajo demanda, uno por país (código ISO).
+
+Invalidación: las señales de locations/signals.py descartan la copia local y suben
+un número de generación en la caché por defecto; los demás procesos comparan esa
+generación en cada petición (una lectura de caché) y reconstruyen si cambió.
+"""
+
+CLAVE_GENERACION = 'locations:jerarquia:generacion'
+NIVEL_GZIP = 9
+
+
+@dataclass(frozen=True)
+class Documento:
+    contenido: bytes
+    comprimido: bytes
+    etag: str
+
+    @property
+    def version(self):
+        return self.etag.strip('"')
+
+
+_documentos = {}        # codigo_iso (o None para todos) -> Documento (None si el país no existe)
+_arbol = None
+_ciudades_por_provincia = {}
+_generacion = None
+_lock = threading.RLock()
+
+
+def generacion_actual():
+    """Generación compartida del catálogo; cambia con cada invalidar() de cualquier proceso."""
+    generacion = cache.get(CLAVE_GENERACION)
+    if generacion is None:
+        # Perdida (caché reiniciada): se publica la local para no reconstruir en todos los procesos
+        cache.add(CLAVE_GENERACION, _generacion if _generacion is not None else secrets.randbits(48), None)
+        generacion = cache.get(CLAVE_GENERACION)
+    return generacion
+
+
+def construir_arbol():
+    """[{id, nombre, iso, provincias: [{id, nombre, ciudades: [[id, nombre], ...]}]}] ordenado por nombre."""
+    from .models import Ciudad, Pais, Provincia
+
+    ciudades = {}
+    for ciudad_id, nombre, provincia_id in Ciudad.objects.order_by('nombre', 'id').values_list('id', 'nombre', 'provincia_id'):
+        ciudades.setdefault(provincia_id, []).append([ciudad_id, nombre])
+    provincias = {}
+    for provincia_id, nombre, pais_id in Provincia.objects.order_by('nombre', 'id').values_list('id', 'nombre', 'pais_id'):
+        provincias.setdefault(pais_id, []).append({
+            'id': provincia_id, 'nombre': nombre, 'ciudades': ciudades.get(provincia_id, []),
+        })
+    return [
+        {'id': pais_id, 'nombre': nombre, 'iso': iso, 'provincias': provincias.get(pais_id, [])}
+        for pais_id, nombre, iso in Pais.objects.order_by('nombre', 'id').values_list('id', 'nombre', 'codigo_iso')
+    ]
+
+
+def _serializar(paises):
+    contenido = json.dumps({'paises': paises}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = '"%s"' % hashlib.sha256(contenido).hexdigest()[:32]
+    # mtime=0: mismo contenido, mismos bytes comprimidos en todos los procesos
+    return Documento(contenido, gzip.compress(contenido, NIVEL_GZIP, mtime=0), etag)
+
+
+def _vigente():
+    """Árbol en memoria, reconstruido si otro proceso cambió la generación. Con el lock tomado."""
+    global _arbol, _ciudades_por_provincia, _generacion
+
+    generacion = generacion_actual()
+    if generacion != _generacion or _arbol is None:
+        _documentos.clear()
+        _arbol = construir_arbol()
+        _ciudades_por_provincia = {
+            provincia['id']: provincia['ciudades'] for pais in _arbol for provincia in pais['provincias']
+        }
+        _generacion = generacion
+    return _arbol
+
+
+def documento(codigo_iso=None):
+    """Documento de todo el árbol o de un país; None si el país no existe."""
+    clave = codigo_iso.upper() if codigo_iso else None
+    with _lock:
+        arbol = _vigente()
+        if clave not in _documentos:
+            paises = arbol if clave is None else [p for p in arbol if p['iso'].upper() == clave]
+            _documentos[clave] = _serializar(paises) if paises or clave is None else None
+        return _documentos[clave]
+
+
+def ciudades_de_provincia(provincia_id):
+    """[{id, nombre}] de una provincia desde el árbol en memoria (sin consultas)."""
+    with _lock:
+        _vigente()
+        ciudades = _ciudades_por_provincia.get(provincia_id, [])
+    return [{'id': ciudad_id, 'nombre': nombre} for ciudad_id, nombre in ciudades]
+
+
+def invalidar():
+    """Descarta la copia local y avisa a los demás procesos."""
+    global _arbol, _generacion
+    with _lock:
+        _documentos.clear()
+        _arbol = None
+        _generacion = None
+    try:
+        cache.incr(CLAVE_GENERACION)
+    except ValueError:
+        cache.add(CLAVE_GENERACION, secrets.randbits(48), None)
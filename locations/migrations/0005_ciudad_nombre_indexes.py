@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:40
+
+from django.db import migrations
+
+# Índices del autocompletado de ciudades (locations/search.py): prefijo sin
+# distinguir mayúsculas (UPPER(nombre) LIKE 'X%', el mismo SQL que genera
+# nombre__istartswith) y trigramas para la búsqueda aproximada.
+INDICES = (
+    ('ciudad_nombre_prefijo', "(UPPER(nombre::text) text_pattern_ops)"),
+    ('ciudad_nombre_trgm', "USING gin (nombre gin_trgm_ops)"),
+)
+
+
+def crear_indices(apps, schema_editor):
+    # text_pattern_ops, pg_trgm y los índices GIN solo existen en PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for nombre, definicion in INDICES:
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON locations_ciudad {definicion}")
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre, _ in INDICES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_alter_ciudad_id_alter_pais_id_alter_provincia_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0005_ciudad_nombre_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ciudad',
+            name='latitud',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ciudad',
+            name='longitud',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
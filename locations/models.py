@@ -34,6 +34,9 @@ class Provincia(models.Model):
 class Ciudad(models.Model):
     provincia = models.ForeignKey(Provincia, on_delete=models.CASCADE, related_name='ciudades')
     nombre = models.CharField(max_length=100)
+    # Grados decimales (WGS84); sin coordenadas la ciudad no entra en las búsquedas por radio
+    latitud = models.FloatField(null=True, blank=True)
+    longitud = models.FloatField(null=True, blank=True)
 
     class Meta:
         verbose_name_plural = "Ciudades"
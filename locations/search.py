@@ -0,0 +1,65 @@
+from django.db import connection
+
+from .models import Ciudad
+
+"""
+Búsqueda de ciudades para el autocompletado (locations.widgets.CiudadAutocomplete).
+
+Cada resultado es (id, "Ciudad, Provincia, ISO") y sale de una sola consulta con los
+JOIN a provincia y país, sin instanciar modelos ni pasar por Ciudad.__str__.
+
+- Prefijo: UPPER(nombre) LIKE 'TEXTO%', con el índice text_pattern_ops de la
+  migración locations 0005 (en PostgreSQL).
+- Trigramas (PostgreSQL, desde MIN_CARACTERES_TRIGRAMA): también encuentra nombres con
+  errores de tipeo o palabras intermedias ("Domingo" -> "Santo Domingo") con el
+  índice GIN de la misma migración. Los aciertos por prefijo van primero.
+"""
+
+MAX_RESULTADOS = 20
+MIN_CARACTERES_TRIGRAMA = 3
+
+COLUMNAS = ('id', 'nombre', 'provincia__nombre', 'provincia__pais__codigo_iso')
+
+SQL_BUSCAR = """
+    SELECT c.id, c.nombre, p.nombre, pa.codigo_iso
+    FROM locations_ciudad c
+    JOIN locations_provincia p ON p.id = c.provincia_id
+    JOIN locations_pais pa ON pa.id = p.pais_id
+    WHERE UPPER(c.nombre::text) LIKE UPPER(%(prefijo)s) OR %(texto)s <%% c.nombre
+    ORDER BY UPPER(c.nombre::text) LIKE UPPER(%(prefijo)s) DESC,
+             word_similarity(%(texto)s, c.nombre) DESC, c.nombre, c.id
+    LIMIT %(limite)s
+"""
+
+
+def etiqueta(nombre, provincia, codigo_iso):
+    return f"{nombre}, {provincia}, {codigo_iso}"
+
+
+def _resultados(filas):
+    return [(ciudad_id, etiqueta(nombre, provincia, iso)) for ciudad_id, nombre, provincia, iso in filas]
+
+
+def _escapar_like(texto):
+    return texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def buscar(texto, limite=MAX_RESULTADOS):
+    """[(id, etiqueta)] de las ciudades cuyo nombre empieza por (o se parece a) `texto`."""
+    texto = ' '.join(texto.split())
+    if not texto:
+        return []
+    if connection.vendor == 'postgresql' and len(texto) >= MIN_CARACTERES_TRIGRAMA:
+        with connection.cursor() as cursor:
+            cursor.execute(SQL_BUSCAR, {'texto': texto, 'prefijo': _escapar_like(texto) + '%', 'limite': limite})
+            return _resultados(cursor.fetchall())
+    filas = Ciudad.objects.filter(nombre__istartswith=texto).order_by('nombre', 'id').values_list(*COLUMNAS)
+    return _resultados(filas[:limite])
+
+
+def etiquetas(ids):
+    """{id: etiqueta} de las ciudades indicadas, en una consulta."""
+    ids = [int(i) for i in ids if str(i).isdigit()]
+    if not ids:
+        return {}
+    return dict(_resultados(Ciudad.objects.filter(pk__in=ids).values_list(*COLUMNAS)))
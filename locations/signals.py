@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Pais, Provincia, Ciudad
+from . import hierarchy
+
+"""
+Señales del módulo LOCATIONS.
+
+Cualquier cambio en el catálogo de ubicaciones invalida el árbol precalculado
+(locations.hierarchy) en este proceso y en los demás. Se invalida al confirmar la
+transacción: si se hiciera antes, una petición que reconstruya el árbol mientras tanto
+guardaría las filas viejas con la generación nueva, sin vencimiento.
+"""
+
+
+@receiver([post_save, post_delete], sender=Pais)
+@receiver([post_save, post_delete], sender=Provincia)
+@receiver([post_save, post_delete], sender=Ciudad)
+def ubicacion_cambiada_jerarquia(sender, instance, raw=False, **kwargs):
+    transaction.on_commit(hierarchy.invalidar)
@@ -1,3 +1,125 @@
-from django.test import TestCase
+import gzip
+import json
 
-# Create your tests here.
+import numpy as np
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from config.testing import Caso, PresupuestoConsultasMixin, sembrar_datos
+
+from . import geo, hierarchy, urls
+from .models import Ciudad
+from .widgets import CiudadAutocomplete
+
+
+class PresupuestoVistasLocationsTests(PresupuestoConsultasMixin, TestCase):
+    URLCONF = urls
+
+    CASOS = [
+        # En frío se arma el árbol completo (países, provincias y ciudades); después, 0 consultas
+        Caso('ajax_load_cities', 3, query=lambda d: f'provincia_id={d.provincias[0].pk}',
+             nombre='ajax_load_cities'),
+        Caso('ajax_buscar_ciudades', 1, query='q=ciu'),
+        Caso('ajax_jerarquia', 3),
+        Caso('ajax_jerarquia_pais', 3, kwargs=lambda d: {'codigo_iso': d.pais.codigo_iso}),
+    ]
+
+
+@override_settings(SQL_MUESTREO=0)
+class JerarquiaUbicacionesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def setUp(self):
+        hierarchy.invalidar()
+        self.url = reverse('ajax_jerarquia')
+
+    def test_en_caliente_no_consulta_la_bd(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+            self.client.get(reverse('ajax_load_cities'), {'provincia_id': self.datos.provincias[0].pk})
+        paises = json.loads(response.content)['paises']
+        self.assertEqual([p['iso'] for p in paises], ['EC'])
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_etag_gzip_y_version(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        contenido = gzip.decompress(response.content)
+        self.assertEqual(contenido, self.client.get(self.url).content)
+
+        etag = response['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'W/"x", {etag}').status_code, 304)
+        versionada = self.client.get(self.url, {'v': etag.strip('"')})
+        self.assertIn('immutable', versionada['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('ajax_jerarquia_pais', args=['zz'])).status_code, 404)
+
+    def test_cambio_de_ciudad_invalida(self):
+        provincia = self.datos.provincias[0]
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Ciudad.objects.create(provincia=provincia, nombre='Aaa Nueva')
+            # Antes de confirmar se sigue sirviendo el árbol anterior
+            self.assertEqual(self.client.get(self.url)['ETag'], etag)
+        response = self.client.get(self.url)
+        self.assertNotEqual(response['ETag'], etag)
+        ciudades = self.client.get(reverse('ajax_load_cities'), {'provincia_id': provincia.pk}).json()
+        self.assertEqual(ciudades[0]['nombre'], 'Aaa Nueva')
+
+
+@override_settings(SQL_MUESTREO=0)
+class AutocompletadoCiudadesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def test_busqueda_por_prefijo(self):
+        response = self.client.get(reverse('ajax_buscar_ciudades'), {'q': '  ciudad 1 '})
+        self.assertEqual(response.json()['resultados'], [
+            {'id': self.datos.ciudades[1].pk, 'texto': 'Ciudad 1, Guayas, EC'},
+        ])
+        self.assertEqual(self.client.get(reverse('ajax_buscar_ciudades'), {'q': '%'}).json()['resultados'], [])
+
+    def test_formulario_solo_incluye_la_opcion_elegida(self):
+        from jobs.forms import EmpresaForm
+
+        Ciudad.objects.bulk_create([Ciudad(provincia=self.datos.provincias[0], nombre=f'Extra {i}') for i in range(50)])
+        ciudad = self.datos.ciudades[0]
+        self.datos.empresa.ciudad = ciudad
+        form = EmpresaForm(instance=self.datos.empresa)
+        with self.assertNumQueries(1):
+            html = str(form['ciudad'])
+        self.assertEqual(html.count('<option'), 2)
+        self.assertIn(f'<option value="{ciudad.pk}" selected>Ciudad 0, Pichincha, EC</option>', html)
+        self.assertIn('ciudad-autocomplete', html)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(EmpresaForm()['ciudad']).count('<option'), 1)
+
+    def test_valor_invalido_no_rompe_el_render(self):
+        self.assertEqual(CiudadAutocomplete().optgroups('ciudad', ['abc'])[0][1][0]['value'], '')
+
+
+class IndiceCiudadesTests(SimpleTestCase):
+
+    def test_coincide_con_haversine_de_fuerza_bruta(self):
+        rng = np.random.default_rng(0)
+        lats = np.degrees(np.arcsin(rng.uniform(-1, 1, 3000)))
+        lons = rng.uniform(-180, 180, 3000)
+        indice = geo.IndiceCiudades(zip(range(1, 3001), lats, lons))
+        # Incluye el antimeridiano y un polo
+        for lat, lon, radio in ((0, 0, 800), (10, 179.9, 1500), (89.5, 20, 600), (-33.4, -70.6, 5)):
+            with self.subTest(lat=lat, lon=lon):
+                distancias = geo.haversine_km(lat, lon, lats, lons)
+                esperadas = {i + 1 for i in np.flatnonzero(distancias <= radio)}
+                resultado = indice.en_radio(lat, lon, radio)
+                self.assertEqual(set(resultado), esperadas)
+                self.assertEqual(list(resultado.values()), sorted(resultado.values()))
+
+    def test_quito_guayaquil(self):
+        self.assertAlmostEqual(float(geo.haversine_km(-0.18, -78.47, -2.19, -79.89)), 273, delta=3)
@@ -3,4 +3,7 @@ from . import views
 
 urlpatterns = [
     path('ajax/load-cities/', views.load_cities, name='ajax_load_cities'),
+    path('ajax/ciudades/', views.buscar_ciudades, name='ajax_buscar_ciudades'),
+    path('ajax/jerarquia/', views.jerarquia, name='ajax_jerarquia'),
+    path('ajax/jerarquia/<str:codigo_iso>/', views.jerarquia, name='ajax_jerarquia_pais'),
 ]
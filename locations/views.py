@@ -1,12 +1,61 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
-from .models import Pais, Provincia, Ciudad
+from django.utils.cache import patch_vary_headers
+from .models import Pais, Provincia
+from . import hierarchy, search
+
+# Con ?v=<versión> la URL cambia con el contenido: el navegador puede guardarla un año
+CACHE_VERSIONADA = 'public, max-age=31536000, immutable'
+CACHE_SIN_VERSION = 'public, max-age=3600'
+
 
 def load_cities(request):
     """
     AJAX Endpoint: Retorna ciudades dado un provincia_id.
     """
-    provincia_id = request.GET.get('provincia_id')
-    cities = Ciudad.objects.filter(provincia_id=provincia_id).order_by('nombre')
-    return JsonResponse(list(cities.values('id', 'nombre')), safe=False)
+    try:
+        provincia_id = int(request.GET.get('provincia_id'))
+    except (TypeError, ValueError):
+        return JsonResponse([], safe=False)
+    # Sale del árbol en memoria (locations.hierarchy), sin consultar la BD
+    return JsonResponse(hierarchy.ciudades_de_provincia(provincia_id), safe=False)
+
+
+def buscar_ciudades(request):
+    """
+    AJAX Endpoint del autocompletado: ?q=<texto> -> {"resultados": [{id, texto}]}.
+    """
+    texto = request.GET.get('q', '')[:100]
+    resultados = [{'id': ciudad_id, 'texto': etiqueta} for ciudad_id, etiqueta in search.buscar(texto)]
+    return JsonResponse({'resultados': resultados})
+
+
+def _coincide_etag(request, etag):
+    enviados = request.headers.get('If-None-Match', '')
+    return enviados.strip() == '*' or etag in (e.strip().removeprefix('W/') for e in enviados.split(','))
+
+
+def jerarquia(request, codigo_iso=None):
+    """
+    Árbol País > Provincia > Ciudad en JSON (todo o un país), precalculado en memoria.
+
+    Responde 304 si el ETag coincide y envía la versión gzip ya comprimida cuando el
+    cliente la acepta.
+    """
+    documento = hierarchy.documento(codigo_iso)
+    if documento is None:
+        raise Http404("País no encontrado")
+
+    versionada = request.GET.get('v') == documento.version
+    if _coincide_etag(request, documento.etag):
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(documento.comprimido, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(documento.contenido, content_type='application/json')
+    response['ETag'] = documento.etag
+    response['Cache-Control'] = CACHE_VERSIONADA if versionada else CACHE_SIN_VERSION
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
@@ -0,0 +1,39 @@
+from django import forms
+from django.urls import reverse
+
+from . import search
+
+"""
+Widget de autocompletado para los campos ForeignKey a Ciudad.
+
+Un <select> normal lista todas las ciudades (y con Ciudad.__str__ consulta la
+provincia de cada una); este solo incluye la opción elegida, con su etiqueta
+"Ciudad, Provincia, ISO" obtenida en una consulta. static/js/ciudad_autocomplete.js
+añade un cuadro de texto que consulta ajax_buscar_ciudades y reemplaza la
+opción al elegir un resultado. Sin JavaScript el select sigue enviando el valor actual.
+"""
+
+
+class CiudadAutocomplete(forms.Select):
+
+    class Media:
+        js = ('js/ciudad_autocomplete.js',)
+
+    def __init__(self, attrs=None):
+        attrs = {'class': 'form-control', **(attrs or {})}
+        attrs['class'] += ' ciudad-autocomplete'
+        super().__init__(attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault('data-url', reverse('ajax_buscar_ciudades'))
+        attrs.setdefault('data-placeholder', 'Escriba una ciudad...')
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        # No se recorre self.choices: eso cargaría todas las ciudades
+        seleccionadas = search.etiquetas(value)
+        opciones = [self.create_option(name, '', '---------', not seleccionadas, 0)]
+        for indice, (ciudad_id, texto) in enumerate(seleccionadas.items(), start=1):
+            opciones.append(self.create_option(name, ciudad_id, texto, True, indice))
+        return [(None, opciones, 0)]
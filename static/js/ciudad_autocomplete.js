@@ -0,0 +1,99 @@
+/* Autocompletado de ciudades (locations/widgets.py: CiudadAutocomplete) */
+/*
+ * El <select> llega solo con la ciudad elegida. Se añade un cuadro de texto encima
+ * que consulta data-url?q=<texto> y, al elegir un resultado, deja esa única opción
+ * seleccionada en el select, que es lo que se envía con el formulario.
+ */
+(function () {
+    const ESPERA_TECLEO_MS = 250;
+    const MIN_CARACTERES = 2;
+
+    function iniciar(select) {
+        const contenedor = document.createElement('div');
+        contenedor.className = 'position-relative mb-1';
+        const entrada = document.createElement('input');
+        entrada.type = 'search';
+        entrada.className = 'form-control';
+        entrada.placeholder = select.dataset.placeholder || '';
+        entrada.autocomplete = 'off';
+        entrada.setAttribute('aria-label', entrada.placeholder);
+        const lista = document.createElement('div');
+        lista.className = 'list-group position-absolute w-100 shadow-sm';
+        lista.style.zIndex = 1000;
+        contenedor.append(entrada, lista);
+        select.parentNode.insertBefore(contenedor, select);
+
+        let temporizador = null;
+        let ultima = null;
+
+        function cerrar() {
+            lista.innerHTML = '';
+        }
+
+        function elegir(resultado) {
+            select.innerHTML = '<option value="">---------</option>';
+            const option = document.createElement('option');
+            option.value = resultado.id;
+            option.textContent = resultado.texto;
+            option.selected = true;
+            select.appendChild(option);
+            select.dispatchEvent(new Event('change', { bubbles: true }));
+            entrada.value = '';
+            cerrar();
+        }
+
+        function mostrar(resultados) {
+            cerrar();
+            resultados.forEach(resultado => {
+                const boton = document.createElement('button');
+                boton.type = 'button';
+                boton.className = 'list-group-item list-group-item-action';
+                boton.textContent = resultado.texto;
+                boton.addEventListener('click', () => elegir(resultado));
+                lista.appendChild(boton);
+            });
+        }
+
+        entrada.addEventListener('input', function () {
+            clearTimeout(temporizador);
+            const texto = this.value.trim();
+            if (texto.length < MIN_CARACTERES) {
+                cerrar();
+                return;
+            }
+            temporizador = setTimeout(() => {
+                if (ultima) {
+                    ultima.abort();
+                }
+                ultima = new AbortController();
+                fetch(`${select.dataset.url}?q=${encodeURIComponent(texto)}`, { signal: ultima.signal })
+                    .then(response => response.json())
+                    .then(data => mostrar(data.resultados))
+                    .catch(error => {
+                        if (error.name !== 'AbortError') {
+                            console.error('Error buscando ciudades:', error);
+                        }
+                    });
+            }, ESPERA_TECLEO_MS);
+        });
+
+        entrada.addEventListener('keydown', function (event) {
+            if (event.key === 'Escape') {
+                cerrar();
+            } else if (event.key === 'Enter' && lista.firstChild) {
+                // Enter elige el primer resultado en lugar de enviar el formulario
+                event.preventDefault();
+                lista.firstChild.click();
+            }
+        });
+        document.addEventListener('click', event => {
+            if (!contenedor.contains(event.target)) {
+                cerrar();
+            }
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select.ciudad-autocomplete').forEach(iniciar);
+    });
+})();
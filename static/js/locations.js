@@ -1,25 +1,98 @@
 /* Lógica para selectores de ubicación dinámicos */
-document.addEventListener('DOMContentLoaded', function () {
-    const provinciaSelect = document.getElementById('id_provincia');
-    const ciudadSelect = document.getElementById('id_ciudad');
-
-    if (provinciaSelect && ciudadSelect) {
-        provinciaSelect.addEventListener('change', function () {
-            const provinciaId = this.value;
-            const url = '/locations/ajax/load-cities/';  // URL hardcoded o usar data-attribute
-
-            fetch(`${url}?provincia_id=${provinciaId}`)
-                .then(response => response.json())
-                .then(data => {
-                    ciudadSelect.innerHTML = '<option value="">---------</option>';
-                    data.forEach(city => {
-                        const option = document.createElement('option');
-                        option.value = city.id;
-                        option.textContent = city.nombre;
-                        ciudadSelect.appendChild(option);
+/*
+ * El árbol País > Provincia > Ciudad se descarga una sola vez (JSON con ETag y
+ * Cache-Control largo, ver locations/views.py:jerarquia) y se guarda en memoria y en
+ * localStorage: cambiar de provincia llena las ciudades sin más peticiones.
+ * La URL puede venir en data-jerarquia-url del select de provincia (con ?v=<versión>
+ * si la plantilla la conoce).
+ */
+(function () {
+    const URL_POR_DEFECTO = '/locations/ajax/jerarquia/';
+    const CLAVE_LOCAL = 'locations:jerarquia';
+    let pendiente = null;
+
+    function indexar(documento) {
+        const ciudades = {};
+        documento.paises.forEach(pais => {
+            pais.provincias.forEach(provincia => {
+                ciudades[provincia.id] = provincia.ciudades;
+            });
+        });
+        return ciudades;
+    }
+
+    function leerLocal(url) {
+        try {
+            const guardado = JSON.parse(localStorage.getItem(CLAVE_LOCAL));
+            return guardado && guardado.url === url ? guardado : null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    function guardarLocal(url, etag, documento) {
+        try {
+            localStorage.setItem(CLAVE_LOCAL, JSON.stringify({ url, etag, documento }));
+        } catch (error) {
+            /* Sin espacio o modo privado: queda solo en memoria */
+        }
+    }
+
+    function cargarJerarquia(url) {
+        if (pendiente === null) {
+            const guardado = leerLocal(url);
+            const cabeceras = guardado && guardado.etag ? { 'If-None-Match': guardado.etag } : {};
+            pendiente = fetch(url, { headers: cabeceras })
+                .then(response => {
+                    if (response.status === 304 && guardado) {
+                        return guardado.documento;
+                    }
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json().then(documento => {
+                        guardarLocal(url, response.headers.get('ETag'), documento);
+                        return documento;
                     });
                 })
-                .catch(error => console.error('Error cargando ciudades:', error));
+                .catch(error => {
+                    if (guardado) {
+                        return guardado.documento;
+                    }
+                    pendiente = null;
+                    throw error;
+                })
+                .then(indexar);
+        }
+        return pendiente;
+    }
+
+    function llenarCiudades(ciudadSelect, ciudades) {
+        const seleccionada = ciudadSelect.value;
+        ciudadSelect.innerHTML = '<option value="">---------</option>';
+        (ciudades || []).forEach(([id, nombre]) => {
+            const option = document.createElement('option');
+            option.value = id;
+            option.textContent = nombre;
+            option.selected = String(id) === seleccionada;
+            ciudadSelect.appendChild(option);
         });
     }
-});
+
+    document.addEventListener('DOMContentLoaded', function () {
+        const provinciaSelect = document.getElementById('id_provincia');
+        const ciudadSelect = document.getElementById('id_ciudad');
+
+        if (provinciaSelect && ciudadSelect) {
+            const url = provinciaSelect.dataset.jerarquiaUrl || URL_POR_DEFECTO;
+            const cargada = cargarJerarquia(url);
+
+            provinciaSelect.addEventListener('change', function () {
+                const provinciaId = this.value;
+                cargada
+                    .then(ciudades => llenarCiudades(ciudadSelect, ciudades[provinciaId]))
+                    .catch(error => console.error('Error cargando ciudades:', error));
+            });
+        }
+    });
+})();